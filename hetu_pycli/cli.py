@@ -4,6 +4,7 @@ from hetu_pycli.src.commands.wallet import wallet_app
 from hetu_pycli.src.commands.tx import tx_app
 from hetu_pycli.src.commands.contract import contract_app
 from hetu_pycli.src.commands.config import config_app
+from hetu_pycli.src.commands.index import index_app
 from hetu_pycli.src.hetu.erc20 import erc20_app
 from hetu_pycli.src.hetu.whetu import whetu_app
 from hetu_pycli.src.hetu.staking import staking_app
@@ -78,6 +79,7 @@ app.add_typer(staking_app, name="stake", help="Global staking operations", no_ar
 app.add_typer(subnet_app, name="subnet", help="Subnet manager operations", no_args_is_help=True, epilog=_epilog)
 app.add_typer(amm_app, name="amm", help="Subnet AMM operations", no_args_is_help=True, epilog=_epilog)
 app.add_typer(neuron_app, name="neuron", help="Neuron manager operations", no_args_is_help=True, epilog=_epilog)
+app.add_typer(index_app, name="index", help="Local state index", no_args_is_help=True, epilog=_epilog)
 
 if __name__ == "__main__":
     app()
@@ -13,6 +13,8 @@ DEFAULT_CONFIG = {
     "wallet_hotkey": "hotkey-user1",
     "wallet_name": "coldkey-user1",
     "wallet_path": os.path.expanduser("~/.hetucli/wallets"),
+    "pending_tx_path": os.path.expanduser("~/.hetucli/pending_txs.json"),
+    "data_path": os.path.expanduser("~/.hetucli/data"),
     "whetu_address": "0x0000000000000000000000000000000000000000",
     "subnet_address": "0x0000000000000000000000000000000000000000",
     "staking_address": "0x0000000000000000000000000000000000000000",
@@ -52,6 +54,14 @@ def load_config(config_path: str = None, cli_args: dict = None):
     return config
 
 
+def get_data_path(config, *parts):
+    """Path under the local data directory (snapshots, indexes), creating parent dirs."""
+    raw_path = (config or {}).get("data_path", "~/.hetucli/data")
+    path = os.path.join(os.path.expanduser(raw_path), *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
 def ensure_config_file():
     path = Path(DEFAULT_CONFIG_PATH)
     if not path.exists():
@@ -0,0 +1,110 @@
+import typer
+from rich import print
+
+from hetu_pycli.src.hetu.logs import DEFAULT_LOG_CHUNK
+from hetu_pycli.src.hetu.neuron import load_neuron_mgr
+from hetu_pycli.src.hetu.stake_history import (
+    DEFAULT_CONFIRMATIONS,
+    DEFAULT_WINDOW,
+    StakeHistory,
+    get_stake_history_path,
+    sync_stake_history,
+)
+from hetu_pycli.src.hetu.staking import load_staking
+from hetu_pycli.src.hetu.state_index import (
+    StateIndex,
+    get_state_index_path,
+    sync_state_index,
+)
+from hetu_pycli.src.hetu.subnet import get_contract_address, load_subnet_mgr
+
+index_app = typer.Typer(help="Local indexed copy of subnet, neuron and stake state")
+
+
+@index_app.command()
+def sync(
+    ctx: typer.Context,
+    subnet_contract: str = typer.Option(None, help="Subnet manager contract address"),
+    neuron_contract: str = typer.Option(None, help="Neuron manager contract address"),
+    staking_contract: str = typer.Option(None, help="Staking contract address"),
+    batch_size: int = typer.Option(200, help="eth_call requests per JSON-RPC batch"),
+):
+    """Read all subnets, neurons and stakes at the latest block into the local index"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    subnet_contract = get_contract_address(ctx, "subnet_address", subnet_contract)
+    neuron_contract = get_contract_address(ctx, "neuron_address", neuron_contract)
+    staking_contract = get_contract_address(ctx, "staking_address", staking_contract)
+    index = StateIndex(get_state_index_path(ctx.obj))
+    try:
+        block, subnets, neurons, stakes = sync_state_index(
+            index,
+            load_subnet_mgr(subnet_contract, rpc),
+            load_neuron_mgr(neuron_contract, rpc),
+            load_staking(staking_contract, rpc),
+            batch_size=batch_size,
+        )
+    finally:
+        index.close()
+    print(f"[green]Indexed {subnets} subnets, {neurons} neurons, {stakes} stake accounts at block {block}")
+    print(f"[green]Index file: {index.path}")
+
+
+@index_app.command()
+def stake_history(
+    ctx: typer.Context,
+    staking_contract: str = typer.Option(None, help="Staking contract address"),
+    from_block: int = typer.Option(0, help="First block to scan on the first run (the staking contract's deployment block)"),
+    to_block: int = typer.Option(None, help="Last block to index (default: latest minus --confirmations)"),
+    confirmations: int = typer.Option(DEFAULT_CONFIRMATIONS, help="Blocks to stay behind the latest one when --to-block is not given"),
+    window: int = typer.Option(DEFAULT_WINDOW, help="Blocks committed per step; an interrupted sync resumes from the last one"),
+    log_chunk_size: int = typer.Option(DEFAULT_LOG_CHUNK, help="Block range per eth_getLogs request"),
+    workers: int = typer.Option(4, help="eth_getLogs batches in flight"),
+):
+    """Index GlobalStaking events for `stake leaderboard` and `stake history`, resuming from the last indexed block"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    staking_contract = get_contract_address(ctx, "staking_address", staking_contract)
+    staking = load_staking(staking_contract, rpc)
+    history = StakeHistory(get_stake_history_path(ctx.obj))
+    total = 0
+    try:
+        if history.block is not None:
+            print(f"[yellow]Resuming from block {history.block + 1}")
+        for block, count in sync_stake_history(
+            history, staking, from_block, to_block, window, log_chunk_size, workers, confirmations
+        ):
+            total += count
+            print(f"[cyan]Indexed to block {block} ({count} events)")
+        print(f"[green]Indexed {total} stake events, current to block {history.block}")
+    except ValueError as e:
+        print(f"[red]{e}")
+        raise typer.Exit(1)
+    finally:
+        history.close()
+    print(f"[green]Index file: {history.path}")
+
+
+@index_app.command()
+def status(ctx: typer.Context):
+    """Show the block the local index is current to"""
+    index = StateIndex(get_state_index_path(ctx.obj))
+    try:
+        block = index.block
+    finally:
+        index.close()
+    if block is None:
+        print("[yellow]Local index is empty. Run `hetucli index sync` first.")
+    else:
+        print(f"[green]Local index current to block {block} ({index.path})")
+    history = StakeHistory(get_stake_history_path(ctx.obj))
+    try:
+        history_block = history.block
+    finally:
+        history.close()
+    if history_block is not None:
+        print(f"[green]Stake history current to block {history_block} ({history.path})")
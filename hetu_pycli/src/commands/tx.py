@@ -1,12 +1,125 @@
 import typer
+from collections import deque
 from web3 import Web3
 from eth_account import Account
+from hexbytes import HexBytes
 from rich import print
 from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path
+from hetu_pycli.src.hetu.batch import batch_rpc
 import getpass
+import json
+import os
+import time
 
 tx_app = typer.Typer(help="Transfer and transaction commands")
 
+
+def get_pending_tx_path(config):
+    raw_path = (config or {}).get("pending_tx_path", "~/.hetucli/pending_txs.json")
+    return os.path.expanduser(raw_path)
+
+
+def load_pending_txs(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_pending_txs(path, entries):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def record_pending_tx(config, tx_hash, action: str, sender=None):
+    """Append a broadcasted tx to the pending journal instead of waiting for its receipt."""
+    record_pending_txs(config, [(tx_hash, action, sender)])
+
+
+def record_pending_txs(config, txs):
+    """Append many (tx_hash, action, sender) entries to the pending journal in one write."""
+    path = get_pending_tx_path(config)
+    entries = load_pending_txs(path)
+    now = int(time.time())
+    for tx_hash, action, sender in txs:
+        entries.append(
+            {
+                "hash": HexBytes(tx_hash).to_0x_hex(),
+                "action": action,
+                "from": sender,
+                "submitted_at": now,
+            }
+        )
+    save_pending_txs(path, entries)
+    what = "receipt" if len(txs) == 1 else f"{len(txs)} receipts"
+    print(f"[yellow]Not waiting for {what}, recorded in {path}. Check with `hetucli tx status`.")
+
+
+def broadcast_signed_txs(web3, signed, batch_size: int = 100):
+    """
+    Broadcast (sender, raw_tx) pairs, each sender's txs in nonce order, as
+    batched eth_sendRawTransaction calls. Every round carries at most one tx per
+    sender, so when a tx is rejected that sender's later nonces are held back
+    instead of being queued behind a gap. Returns (tx_hash, error) per entry.
+    """
+    queues = {}
+    for i, (sender, _) in enumerate(signed):
+        queues.setdefault(sender, deque()).append(i)
+    results = [(None, "not sent, an earlier nonce from this sender was rejected")] * len(signed)
+    while queues:
+        round_ids = [queue.popleft() for queue in queues.values()]
+        requests = [
+            ("eth_sendRawTransaction", [HexBytes(signed[i][1]).to_0x_hex()]) for i in round_ids
+        ]
+        for i, result in zip(round_ids, batch_rpc(web3, requests, batch_size, with_errors=True)):
+            results[i] = result
+        rejected = {signed[i][0] for i in round_ids if results[i][1] is not None}
+        queues = {s: q for s, q in queues.items() if q and s not in rejected}
+    return results
+
+
+def wait_for_receipts(
+    web3,
+    tx_hashes,
+    timeout: float = 300,
+    poll_interval: float = 2,
+    batch_size: int = 100,
+    with_errors: bool = False,
+):
+    """
+    Poll batched eth_getTransactionReceipt until every hash is mined or timeout;
+    unmined ones map to None. A lookup that fails is retried on the next round,
+    but when every lookup of a round fails the node is not answering and
+    polling stops early. with_errors returns (receipt, error) pairs, error
+    being the last failed lookup's message for hashes left without a receipt.
+    """
+    receipts = {}
+    errors = {}
+    deadline = time.time() + timeout
+    pending = list(tx_hashes)
+    while pending:
+        requests = [("eth_getTransactionReceipt", [h]) for h in pending]
+        results = batch_rpc(web3, requests, batch_size, with_errors=True)
+        for tx_hash, (receipt, error) in zip(pending, results):
+            if error is not None:
+                errors[tx_hash] = error
+            elif receipt is not None:
+                receipts[tx_hash] = receipt
+            else:
+                errors.pop(tx_hash, None)
+        all_failed = all(error is not None for _, error in results)
+        pending = [h for h in pending if h not in receipts]
+        if not pending or all_failed or time.time() >= deadline:
+            break
+        time.sleep(poll_interval)
+    if with_errors:
+        return [(receipts.get(h), None if h in receipts else errors.get(h)) for h in tx_hashes]
+    return [receipts.get(h) for h in tx_hashes]
+
+
 @tx_app.command()
 def send(
     ctx: typer.Context,
@@ -75,4 +188,57 @@ def send_by_direct_key(
     }
     signed = acct.sign_transaction(tx)
     tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    print(f"[green]Transaction sent: {tx_hash.hex()}")
\ No newline at end of file
+    print(f"[green]Transaction sent: {tx_hash.hex()}")
+
+
+@tx_app.command()
+def status(
+    ctx: typer.Context,
+    rpc: str = typer.Option(None, help="Ethereum node RPC URL"),
+    keep: bool = typer.Option(False, help="Keep resolved transactions in the journal"),
+    batch_size: int = typer.Option(100, help="Receipts fetched per JSON-RPC batch"),
+):
+    """Resolve every transaction in the pending journal with batched receipt lookups."""
+    config = getattr(ctx, "obj", None) or {}
+    rpc_url = rpc or config.get("json_rpc")
+    if not rpc_url:
+        print("[red]No RPC URL provided or found in config.")
+        raise typer.Exit(1)
+    path = get_pending_tx_path(config)
+    entries = load_pending_txs(path)
+    if not entries:
+        print("[yellow]No pending transactions.")
+        return
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    receipts = batch_rpc(
+        w3, [("eth_getTransactionReceipt", [entry["hash"]]) for entry in entries], batch_size, with_errors=True
+    )
+    remaining = []
+    counts = {"success": 0, "failed": 0, "pending": 0, "unknown": 0}
+    for entry, (receipt, error) in zip(entries, receipts):
+        label = f"{entry['hash']} ({entry.get('action', 'tx')})"
+        if error is not None:
+            # The lookup failed, which says nothing about the transaction; keep it for the next run.
+            counts["unknown"] += 1
+            remaining.append(entry)
+            print(f"[red]unknown  {label}: receipt lookup failed: {error}")
+            continue
+        if receipt is None:
+            counts["pending"] += 1
+            remaining.append(entry)
+            print(f"[yellow]pending  {label}")
+            continue
+        block = int(receipt["blockNumber"], 16)
+        if int(receipt["status"], 16) == 1:
+            counts["success"] += 1
+            print(f"[green]success  {label} in block {block}")
+        else:
+            counts["failed"] += 1
+            print(f"[red]failed   {label} in block {block}")
+        if keep:
+            remaining.append(entry)
+    save_pending_txs(path, remaining)
+    summary = f"{counts['success']} succeeded, {counts['failed']} failed, {counts['pending']} pending"
+    if counts["unknown"]:
+        summary += f", {counts['unknown']} could not be looked up"
+    print(f"[cyan]{summary}")
@@ -5,6 +5,7 @@ from rich import print
 import getpass
 import json
 from eth_account import Account
+from concurrent.futures import ProcessPoolExecutor
 
 wallet_app = typer.Typer(help="Wallet management commands")
 
@@ -32,6 +33,27 @@ def load_keystore(address_or_name, wallet_path):
     raise typer.Exit(1)
 
 
+def _decrypt_keystore(args):
+    keystore, password = args
+    try:
+        return Account.decrypt(keystore, password), None
+    except Exception as e:
+        return None, str(e)
+
+
+def unlock_keystores(keystores, passwords, max_workers=None):
+    """
+    Decrypt many keystores at once. The scrypt KDF is CPU bound, so the work
+    is spread over processes. Returns (private_key, error) per keystore.
+    """
+    # `list` is shadowed by the wallet list command in this module.
+    jobs = [*zip(keystores, passwords)]
+    if len(jobs) <= 1 or max_workers == 1:
+        return [_decrypt_keystore(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return [*pool.map(_decrypt_keystore, jobs)]
+
+
 @wallet_app.command()
 def create(
     ctx: typer.Context,
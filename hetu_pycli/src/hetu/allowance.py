@@ -0,0 +1,53 @@
+import json
+import os
+
+from hexbytes import HexBytes
+from rich import print
+from web3 import Web3
+
+from hetu_pycli.src.hetu.batch import batch_call
+from hetu_pycli.src.hetu.metagraph import WEI_PER_HETU
+from hetu_pycli.src.hetu.token_cache import ERC20_ABI_PATH
+
+APPROVE_GAS = 100000
+
+
+def approve_if_short(web3, private_key, owner: str, spender: str, needs, nonce: int, standing: int = 0):
+    """
+    Read allowance(owner, spender) for every (token, amount) in needs in one
+    batch and broadcast approve(spender, max(amount, standing)) only for the
+    tokens whose allowance is short, with consecutive nonces from nonce. The
+    approvals are not waited for: the caller sends its own tx with the returned
+    nonce, which the chain orders after them. Returns (next nonce, approve tx hashes).
+    """
+    owner = Web3.to_checksum_address(owner)
+    with open(os.path.abspath(ERC20_ABI_PATH), "r") as f:
+        abi = json.load(f)
+    tokens = [web3.eth.contract(address=token, abi=abi) for token, _ in needs]
+    allowances = batch_call(web3, [token.functions.allowance(owner, spender) for token in tokens])
+    tx_hashes = []
+    gas_price = None
+    for token, (_, amount), allowance in zip(tokens, needs, allowances):
+        if allowance is not None and allowance >= amount:
+            print(f"[green]Allowance {allowance / WEI_PER_HETU:,.4f} of {token.address} covers it, skipping approve")
+            continue
+        value = max(amount, standing or 0)
+        if gas_price is None:
+            gas_price = web3.eth.gas_price
+        tx = token.functions.approve(spender, value).build_transaction(
+            {
+                "from": owner,
+                "nonce": nonce,
+                "gas": APPROVE_GAS,
+                "gasPrice": gas_price,
+            }
+        )
+        signed = web3.eth.account.sign_transaction(tx, private_key)
+        tx_hash = web3.eth.send_raw_transaction(signed.raw_transaction)
+        print(
+            f"[green]Broadcasted approve {value / WEI_PER_HETU:,.4f} of {token.address} "
+            f"for {spender} tx hash: {HexBytes(tx_hash).to_0x_hex()}"
+        )
+        tx_hashes.append(tx_hash)
+        nonce += 1
+    return nonce, tx_hashes
@@ -1,12 +1,49 @@
 import typer
 from rich import print
+from typing import Annotated
 from web3 import Web3
+from web3.logs import DISCARD
 import json
 import os
 from hetu_pycli.src.hetu.wrapper.subnet_amm import SubnetAMM
 from eth_account import Account
 from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path
+from hetu_pycli.src.commands.tx import record_pending_tx, record_pending_txs
+from hetu_pycli.src.hetu.allowance import approve_if_short
+from hetu_pycli.src.hetu.amm_history import (
+    CANDLE_COLUMNS,
+    DEFAULT_WINDOW,
+    PriceIndex,
+    build_candles,
+    open_amm_history,
+    parse_interval,
+    sync_amm_history,
+)
+from hetu_pycli.src.hetu.amm_pools import POOL_SORT_KEYS, fetch_pools, fetch_user_stats, resolve_pools, sort_pools
+from hetu_pycli.src.hetu.amm_positions import open_liquidity_index, sync_liquidity, value_position
+from hetu_pycli.src.hetu.amm_quote import (
+    PRICE_SCALE,
+    checked_quote,
+    min_out_for_slippage,
+    quote_exact,
+    quote_curve,
+    read_pool_state,
+    verify_quotes,
+)
+from hetu_pycli.src.hetu.amm_split import plan_split
+from hetu_pycli.src.hetu.amm_watch import PoolMonitor, watch_pools
+from hetu_pycli.src.hetu.logs import DEFAULT_LOG_CHUNK
+from hetu_pycli.src.hetu.chunked import read_accounts_file
+from hetu_pycli.src.hetu.metagraph import WEI_PER_HETU
+from hetu_pycli.src.hetu.portfolio import list_netuids
+from hetu_pycli.src.hetu.subnet import load_subnet_mgr
+from hetu_pycli.src.hetu.token_cache import linked_token
+from rich.console import Console
+from rich.table import Table
+from datetime import UTC, datetime
+import numpy as np
 import getpass
+import time
 
 AMM_ABI_PATH = os.path.join(
     os.path.dirname(__file__), "../../../contracts/SubnetAMM.abi"
@@ -33,6 +70,18 @@ def get_contract_address(ctx, cli_contract_key: str, param_contract: str):
     print(f"[yellow]Using contract address: {contract_addr}")
     return contract_addr
 
+def resolve_pool(ctx, rpc: str, netuid, contract):
+    """AMM address of a subnet (via getSubnetInfo) when netuid is given, else --contract or amm_address."""
+    if netuid is None:
+        return get_contract_address(ctx, "amm_address", contract)
+    subnet_mgr = load_subnet_mgr(get_contract_address(ctx, "subnet_address", None), rpc)
+    pool = subnet_mgr.getSubnetInfo(netuid)[3]
+    if int(pool, 16) == 0:
+        print(f"[red]Subnet {netuid} has no AMM pool")
+        raise typer.Exit(1)
+    print(f"[yellow]Subnet {netuid} pool: {pool}")
+    return pool
+
 @amm_app.command()
 def alpha_price(
     ctx: typer.Context,
@@ -125,6 +174,493 @@ def sim_swap_hetu_for_alpha(
     hetu_amount_wei = amm.web3.to_wei(hetu_amount, "ether")
     print(f"[green]Simulated ALPHA Out: {amm.simSwapHETUForAlpha(hetu_amount_wei)}")
 
+@amm_app.command()
+def pools(
+    ctx: typer.Context,
+    subnet_contract: str = typer.Option(None, help="Subnet manager contract address, used to find every pool"),
+    netuids: str = typer.Option(None, help="Comma separated netuids (default: every subnet)"),
+    sort_by: str = typer.Option("liquidity", help=f"Sort by one of: {', '.join(POOL_SORT_KEYS)}"),
+    ascending: bool = typer.Option(False, help="Sort ascending instead of descending"),
+):
+    """Show price, liquidity, volume and health of every subnet pool from one batched read"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    if sort_by not in POOL_SORT_KEYS:
+        print(f"[red]Unknown sort key {sort_by}, expected one of: {', '.join(POOL_SORT_KEYS)}")
+        raise typer.Exit(1)
+    subnet_contract = get_contract_address(ctx, "subnet_address", subnet_contract)
+    subnet_mgr = load_subnet_mgr(subnet_contract, rpc)
+    block = subnet_mgr.web3.eth.block_number
+    if netuids:
+        netuid_list = [int(n) for n in netuids.split(",") if n.strip()]
+    else:
+        netuid_list = list_netuids(subnet_mgr, block)
+    with open(os.path.abspath(AMM_ABI_PATH), "r") as f:
+        amm_abi = json.load(f)
+    result = fetch_pools(subnet_mgr, amm_abi, netuid_list, block)
+
+    table = Table(title=f"Subnet pools @ block {block}")
+    for header in ("NETUID", "NAME", "POOL", "PRICE", "MOVING PRICE", "HETU RESERVE", "ALPHA RESERVE", "LIQUIDITY", "VOLUME", "HEALTH"):
+        table.add_column(header, justify="left" if header in ("NAME", "POOL", "HEALTH") else "right")
+    for row in sort_pools(result["pools"], sort_by, ascending):
+        if not row["ok"]:
+            table.add_row(str(row["netuid"]), row["name"], row["pool"], *([""] * 6), "[red]unreadable")
+            continue
+        color = "green" if row["healthy"] else "red"
+        table.add_row(
+            str(row["netuid"]),
+            row["name"],
+            row["pool"],
+            f"{row['price'] / PRICE_SCALE:.6f}",
+            f"{row['moving_price'] / PRICE_SCALE:.6f}",
+            *(f"{row[key] / WEI_PER_HETU:,.4f}" for key in ("hetu_reserve", "alpha_reserve", "liquidity", "volume")),
+            f"[{color}]{row['status']} ({row['liquidity_ratio']})",
+        )
+    Console().print(table)
+    print(f"[green]{len(result['pools'])} pools across {len(netuid_list)} subnets")
+
+@amm_app.command()
+def candles(
+    ctx: typer.Context,
+    netuid: int = typer.Option(None, help="Subnet netuid, resolved to its pool through the subnet manager"),
+    contract: str = typer.Option(None, help="AMM contract address (when --netuid is not given)"),
+    interval: str = typer.Option("1h", help="Bar length, e.g. 5m, 1h, 1d"),
+    from_block: int = typer.Option(0, help="First block to scan on the first run (the pool's deployment block)"),
+    to_block: int = typer.Option(None, help="Last block to sync (default: latest)"),
+    no_sync: bool = typer.Option(False, help="Only use events already stored locally"),
+    window: int = typer.Option(DEFAULT_WINDOW, help="Blocks committed per step; an interrupted sync resumes from the last one"),
+    log_chunk_size: int = typer.Option(DEFAULT_LOG_CHUNK, help="Block range per eth_getLogs request"),
+    workers: int = typer.Option(4, help="eth_getLogs batches in flight"),
+    rows: int = typer.Option(20, help="Most recent bars to print"),
+    output: str = typer.Option(None, help="Write every bar to a .csv or .npz file"),
+):
+    """OHLCV candles of a pool from its swap and price events, synced incrementally"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    try:
+        seconds = parse_interval(interval)
+    except ValueError as e:
+        print(f"[red]{e}")
+        raise typer.Exit(1)
+    pool = Web3.to_checksum_address(resolve_pool(ctx, rpc, netuid, contract))
+    history = open_amm_history(ctx)
+    try:
+        if not no_sync:
+            amm = load_amm(pool, rpc)
+            if history.block(pool) is not None:
+                print(f"[yellow]Resuming from block {history.block(pool) + 1}")
+            for block, count in sync_amm_history(history, amm, from_block, to_block, window, log_chunk_size, workers):
+                print(f"[cyan]Synced to block {block} ({count} events)")
+        synced = history.block(pool)
+        series = history.series(pool)
+    finally:
+        history.close()
+    if synced is None:
+        print(f"[red]No local history for pool {pool}. Run without --no-sync first.")
+        raise typer.Exit(1)
+    bars = build_candles(series, seconds)
+
+    table = Table(title=f"{pool} {interval} candles, current to block {synced}")
+    for header in ("TIME (UTC)", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME HETU", "VOLUME ALPHA", "TRADES"):
+        table.add_column(header, justify="right")
+    for i in range(max(len(bars["time"]) - rows, 0), len(bars["time"])):
+        table.add_row(
+            datetime.fromtimestamp(int(bars["time"][i]), UTC).strftime("%Y-%m-%d %H:%M"),
+            *(f"{bars[key][i]:.6f}" for key in ("open", "high", "low", "close")),
+            f"{bars['volume_hetu'][i]:,.4f}",
+            f"{bars['volume_alpha'][i]:,.4f}",
+            str(bars["trades"][i]),
+        )
+    Console().print(table)
+    print(f"[green]{len(bars['time'])} bars from {len(series['block'])} events")
+
+    if output:
+        if output.endswith(".npz"):
+            np.savez(output, **bars)
+        else:
+            np.savetxt(
+                output,
+                np.column_stack([bars[key].astype(np.float64) for key in CANDLE_COLUMNS]),
+                delimiter=",",
+                header=",".join(CANDLE_COLUMNS),
+                comments="",
+                fmt="%.18g",
+            )
+        print(f"[green]Candles written to {output}")
+
+@amm_app.command()
+def positions(
+    ctx: typer.Context,
+    user: str = typer.Option(..., help="Liquidity provider address"),
+    subnet_contract: str = typer.Option(None, help="Subnet manager contract address, used to find every pool"),
+    netuids: str = typer.Option(None, help="Comma separated netuids (default: every subnet)"),
+    from_block: int = typer.Option(0, help="First block to scan for a pool's first sync (the pools' deployment block)"),
+    no_sync: bool = typer.Option(False, help="Only use events already stored locally"),
+    window: int = typer.Option(DEFAULT_WINDOW, help="Blocks committed per step; an interrupted sync resumes from the last one"),
+    log_chunk_size: int = typer.Option(DEFAULT_LOG_CHUNK, help="Block range per eth_getLogs request"),
+    workers: int = typer.Option(4, help="eth_getLogs batches in flight"),
+):
+    """Net liquidity positions of a provider across pools, valued at the current reserves"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    user = Web3.to_checksum_address(user)
+    subnet_contract = get_contract_address(ctx, "subnet_address", subnet_contract)
+    subnet_mgr = load_subnet_mgr(subnet_contract, rpc)
+    block = subnet_mgr.web3.eth.block_number
+    if netuids:
+        netuid_list = [int(n) for n in netuids.split(",") if n.strip()]
+    else:
+        netuid_list = list_netuids(subnet_mgr, block)
+    with open(os.path.abspath(AMM_ABI_PATH), "r") as f:
+        amm_abi = json.load(f)
+    pool_rows = [row for row in fetch_pools(subnet_mgr, amm_abi, netuid_list, block)["pools"] if row["ok"]]
+    if not pool_rows:
+        print("[red]No readable pools found.")
+        raise typer.Exit(1)
+    index = open_liquidity_index(ctx)
+    try:
+        if not no_sync:
+            contract = subnet_mgr.web3.eth.contract(address=pool_rows[0]["pool"], abi=amm_abi)
+            pool_addresses = [row["pool"] for row in pool_rows]
+            for synced, count in sync_liquidity(index, contract, pool_addresses, from_block, block, window, log_chunk_size, workers):
+                print(f"[cyan]Synced to block {synced} ({count} liquidity events)")
+        held = index.positions(user)
+    finally:
+        index.close()
+
+    table = Table(title=f"Liquidity positions of {user} @ block {block}")
+    for header in ("NETUID", "NAME", "POOL", "NET HETU", "NET ALPHA", "VALUE (HETU)", "COST (HETU)", "PNL (HETU)", "POOL %", "EVENTS"):
+        table.add_column(header, justify="left" if header in ("NAME", "POOL") else "right")
+    total_value = total_pnl = 0
+    for row in pool_rows:
+        position = held.get(row["pool"])
+        if position is None:
+            continue
+        valued = value_position(position, row["price"], row["hetu_reserve"], row["alpha_reserve"])
+        total_value += valued["value"]
+        total_pnl += valued["pnl"] or 0
+        pnl = valued["pnl"]
+        table.add_row(
+            str(row["netuid"]),
+            row["name"],
+            row["pool"],
+            f"{position['net_hetu'] / WEI_PER_HETU:,.4f}",
+            f"{position['net_alpha'] / WEI_PER_HETU:,.4f}",
+            f"{valued['value'] / WEI_PER_HETU:,.4f}",
+            "?" if position["cost"] is None else f"{position['cost'] / WEI_PER_HETU:,.4f}",
+            "?" if pnl is None else f"[{'green' if pnl >= 0 else 'red'}]{pnl / WEI_PER_HETU:,.4f}",
+            f"{valued['share'] * 100:.2f}",
+            str(position["events"]),
+        )
+    if not table.rows:
+        print(f"[yellow]No liquidity events for {user} in {len(pool_rows)} pools")
+        return
+    Console().print(table)
+    print(f"[green]Total value {total_value / WEI_PER_HETU:,.4f} HETU, PnL {total_pnl / WEI_PER_HETU:,.4f} HETU")
+
+@amm_app.command()
+def user_stats(
+    ctx: typer.Context,
+    user: Annotated[list[str] | None, typer.Option(help="User address, repeatable")] = None,
+    users_file: str = typer.Option(None, help="File with one address per line (or CSV, first column)"),
+    all_pools: bool = typer.Option(False, help="Read every subnet pool instead of --contract"),
+    contract: str = typer.Option(None, help="AMM contract address (without --all-pools)"),
+    subnet_contract: str = typer.Option(None, help="Subnet manager contract address, used with --all-pools"),
+    netuids: str = typer.Option(None, help="Comma separated netuids with --all-pools (default: every subnet)"),
+    block: int = typer.Option(None, help="Block number to read at (default latest)"),
+    batch_size: int = typer.Option(200, help="eth_call requests per JSON-RPC batch"),
+    output: str = typer.Option(None, help="Write the volume and share matrix to this CSV file"),
+):
+    """Trading volume and volume share of many users on one or every pool"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    raw_users = read_accounts_file(users_file) if users_file else []
+    raw_users += list(user or [])
+    if not raw_users:
+        print("[red]No users given, use --user or --users-file.")
+        raise typer.Exit(1)
+    try:
+        users = [Web3.to_checksum_address(u) for u in raw_users]
+    except ValueError as e:
+        print(f"[red]Invalid address: {e}")
+        raise typer.Exit(1)
+    with open(os.path.abspath(AMM_ABI_PATH), "r") as f:
+        amm_abi = json.load(f)
+    if all_pools:
+        subnet_mgr = load_subnet_mgr(get_contract_address(ctx, "subnet_address", subnet_contract), rpc)
+        web3 = subnet_mgr.web3
+        if block is None:
+            block = web3.eth.block_number
+        if netuids:
+            netuid_list = [int(n) for n in netuids.split(",") if n.strip()]
+        else:
+            netuid_list = list_netuids(subnet_mgr, block)
+        subnets = resolve_pools(subnet_mgr, netuid_list, block, batch_size)
+        labels = [f"{netuid} {info[9]}".strip() for netuid, info in subnets]
+        pool_list = [info[3] for _, info in subnets]
+    else:
+        amm = load_amm(get_contract_address(ctx, "amm_address", contract), rpc)
+        web3 = amm.web3
+        labels = pool_list = [amm.contract.address]
+    if not pool_list:
+        print("[red]No subnet pools found.")
+        raise typer.Exit(1)
+    stats = fetch_user_stats(web3, amm_abi, pool_list, users, block, batch_size)
+
+    table = Table(title=f"User volume (share of pool volume) @ block {stats['block']}")
+    table.add_column("USER", justify="left")
+    for label in labels:
+        table.add_column(label, justify="right")
+    table.add_column("TOTAL", justify="right")
+    for u, volumes, shares in zip(users, stats["volume"], stats["share"]):
+        cells = [
+            "[red]failed" if v is None else f"{v / WEI_PER_HETU:,.4f} ({s / 100:.2f}%)" if v else "-"
+            for v, s in zip(volumes, shares)
+        ]
+        table.add_row(u, *cells, f"{sum(v or 0 for v in volumes) / WEI_PER_HETU:,.4f}")
+    Console().print(table)
+
+    if output:
+        with open(output, "w") as f:
+            f.write(",".join(["user"] + [f"volume:{p}" for p in pool_list] + [f"share_bps:{p}" for p in pool_list]) + "\n")
+            for u, volumes, shares in zip(users, stats["volume"], stats["share"]):
+                cells = ["" if v is None else str(v) for v in volumes + shares]
+                f.write(",".join([u] + cells) + "\n")
+        print(f"[green]Matrix written to {output}")
+    failed = sum(v is None for row in stats["volume"] for v in row)
+    print(f"[green]{len(users) * len(pool_list)} reads for {len(users)} users x {len(pool_list)} pools, {failed} failed")
+
+@amm_app.command()
+def watch(
+    ctx: typer.Context,
+    subnet_contract: str = typer.Option(None, help="Subnet manager contract address, used to find every pool"),
+    netuids: str = typer.Option(None, help="Comma separated netuids (default: every subnet)"),
+    price_move: float = typer.Option(2.0, help="Alert when a pool's price moves this many percent from the last alert"),
+    large_trade: float = typer.Option(5.0, help="Alert on a reserves change of this many percent of the HETU reserve"),
+    liquidity_drop: float = typer.Option(20.0, help="Alert when the HETU reserve falls this many percent below its level at start"),
+    min_hetu_reserve: float = typer.Option(0.0, help="Also alert when the HETU reserve falls below this (in HETU)"),
+    ndjson: bool = typer.Option(False, help="Print alerts as JSON lines instead of text"),
+    updates: bool = typer.Option(False, help="With --ndjson, also print every pool state update"),
+    no_ws: bool = typer.Option(False, help="Poll eth_getLogs per new block instead of subscribing over the chain websocket"),
+    poll_interval: float = typer.Option(2.0, help="Seconds between new-block checks when polling"),
+    duration: float = typer.Option(0, help="Stop after this many seconds (0 = run until interrupted)"),
+):
+    """Watch every pool's reserves and price from events and alert on thresholds"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    ws_url = None if no_ws else ctx.obj.get("chain")
+    if ws_url and not ws_url.startswith(("ws://", "wss://")):
+        ws_url = None
+    subnet_contract = get_contract_address(ctx, "subnet_address", subnet_contract)
+    subnet_mgr = load_subnet_mgr(subnet_contract, rpc)
+    web3 = subnet_mgr.web3
+    block = web3.eth.block_number
+    if netuids:
+        netuid_list = [int(n) for n in netuids.split(",") if n.strip()]
+    else:
+        netuid_list = list_netuids(subnet_mgr, block)
+    with open(os.path.abspath(AMM_ABI_PATH), "r") as f:
+        amm_abi = json.load(f)
+    pool_rows = [row for row in fetch_pools(subnet_mgr, amm_abi, netuid_list, block)["pools"] if row["ok"]]
+    if not pool_rows:
+        print("[red]No readable pools found.")
+        raise typer.Exit(1)
+    monitor = PoolMonitor(
+        web3.eth.contract(address=pool_rows[0]["pool"], abi=amm_abi),
+        pool_rows,
+        round(price_move * 100),
+        round(large_trade * 100),
+        round(liquidity_drop * 100),
+        web3.to_wei(min_hetu_reserve, "ether"),
+    )
+    console = Console(stderr=ndjson)
+    colors = {"price_move": "yellow", "large_trade": "magenta", "liquidity_change": "cyan", "low_liquidity": "red", "liquidity_recovered": "green"}
+
+    def on_log(log):
+        state, alerts = monitor.apply(log)
+        if ndjson:
+            for record in ([state] if updates and state else []) + alerts:
+                typer.echo(json.dumps(record))
+            return
+        for alert in alerts:
+            details = ", ".join(f"{k}={v:,.6g}" for k, v in alert.items() if isinstance(v, float))
+            console.print(f"[{colors[alert['type']]}]block {alert['block']} netuid {alert['netuid']} {alert['type']}: {details}")
+
+    console.print(
+        f"[green]Watching {len(pool_rows)} pools from block {block + 1} "
+        f"({'websocket ' + ws_url if ws_url else 'eth_getLogs polling'})"
+    )
+    deadline = time.time() + duration if duration else None
+    try:
+        watch_pools(
+            monitor, web3, ws_url, block + 1, on_log, poll_interval, deadline,
+            on_fallback=lambda e: console.print(f"[yellow]Websocket unavailable ({e}), polling eth_getLogs instead"),
+        )
+    except KeyboardInterrupt:
+        pass
+    console.print(f"[green]Stopped at block {monitor.block or block}")
+
+@amm_app.command()
+def twap(
+    ctx: typer.Context,
+    netuid: int = typer.Option(None, help="Subnet netuid, resolved to its pool through the subnet manager"),
+    contract: str = typer.Option(None, help="AMM contract address (when --netuid is not given)"),
+    window: Annotated[
+        list[int] | None, typer.Option(help="Window length in blocks ending at --to-block, repeatable (default 100, 1000, 10000)")
+    ] = None,
+    to_block: int = typer.Option(None, help="Last block of every window (default: latest synced)"),
+    from_block: int = typer.Option(0, help="First block to scan on the first run (the pool's deployment block)"),
+    no_sync: bool = typer.Option(False, help="Only use events already stored locally"),
+    sync_window: int = typer.Option(DEFAULT_WINDOW, help="Blocks committed per sync step; an interrupted sync resumes from the last one"),
+    log_chunk_size: int = typer.Option(DEFAULT_LOG_CHUNK, help="Block range per eth_getLogs request"),
+    workers: int = typer.Option(4, help="eth_getLogs batches in flight"),
+):
+    """TWAP and VWAP of a pool over block windows, from its locally indexed price and swap events"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    window = window or [100, 1000, 10000]
+    if any(w < 1 for w in window):
+        print("[red]--window must be at least 1 block.")
+        raise typer.Exit(1)
+    pool = Web3.to_checksum_address(resolve_pool(ctx, rpc, netuid, contract))
+    history = open_amm_history(ctx)
+    pool_info = None
+    try:
+        if not no_sync:
+            amm = load_amm(pool, rpc)
+            for block, count in sync_amm_history(history, amm, from_block, to_block, sync_window, log_chunk_size, workers):
+                print(f"[cyan]Synced to block {block} ({count} events)")
+            pool_info = amm.getPoolInfo()
+        synced = history.block(pool)
+        if synced is not None:
+            end = min(to_block, synced) if to_block is not None else synced
+            series = history.window_series(pool, end - max(window) + 1, end)
+    finally:
+        history.close()
+    if synced is None:
+        print(f"[red]No local history for pool {pool}. Run without --no-sync first.")
+        raise typer.Exit(1)
+    try:
+        index = PriceIndex(series, end - max(window) + 1, end)
+    except ValueError as e:
+        print(f"[red]{e}")
+        raise typer.Exit(1)
+    lengths = np.array(window)
+    stats = index.windows(end - lengths + 1, np.full(len(lengths), end))
+
+    table = Table(title=f"{pool} TWAP / VWAP, windows ending at block {end}")
+    for header in ("WINDOW", "FROM", "TO", "TWAP", "VWAP", "VOLUME HETU", "VOLUME ALPHA", "TRADES"):
+        table.add_column(header, justify="right")
+    for i, length in enumerate(window):
+        vwap = stats["vwap"][i]
+        table.add_row(
+            str(length),
+            str(stats["from_block"][i]),
+            str(stats["to_block"][i]),
+            f"{stats['twap'][i]:.6f}",
+            "-" if np.isnan(vwap) else f"{vwap:.6f}",
+            f"{stats['hetu_volume'][i]:,.4f}",
+            f"{stats['alpha_volume'][i]:,.4f}",
+            str(stats["trades"][i]),
+        )
+    Console().print(table)
+    if (stats["to_block"] - stats["from_block"] + 1 < lengths).any():
+        print(f"[yellow]Windows reaching before block {index.first_block} (first block with a known opening price) are shortened.")
+    if pool_info is not None:
+        print(f"[green]Spot price {pool_info[4] / PRICE_SCALE:.6f}, on-chain moving price {pool_info[5] / PRICE_SCALE:.6f}")
+
+@amm_app.command(name="quote-curve")
+def quote_curve_cmd(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="AMM contract address"),
+    max_amount: float = typer.Option(..., help="Largest input size (in HETU or ALPHA)"),
+    min_amount: float = typer.Option(None, help="Smallest input size (default max-amount / points)"),
+    points: int = typer.Option(100, help="Number of input sizes"),
+    geometric: bool = typer.Option(False, help="Space sizes geometrically instead of linearly"),
+    is_hetu_to_alpha: bool = typer.Option(True, help="True for HETU->ALPHA, False for ALPHA->HETU"),
+    verify: int = typer.Option(0, help="Check this many sample points against getSwapPreview on-chain"),
+    rows: int = typer.Option(20, help="Rows of the curve to print"),
+    output: str = typer.Option(None, help="Write the full curve to a .csv or .npz file"),
+):
+    """Quote many trade sizes locally from one getPoolInfo/getK snapshot"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    contract = get_contract_address(ctx, "amm_address", contract)
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    amm = load_amm(contract, rpc)
+    try:
+        state = read_pool_state(amm)
+    except ValueError as e:
+        print(f"[red]{e}")
+        raise typer.Exit(1)
+    start = min_amount if min_amount is not None else max_amount / points
+    spacing = np.geomspace if geometric else np.linspace
+    amounts = spacing(start, max_amount, points) * WEI_PER_HETU
+    curve = quote_curve(state, amounts, is_hetu_to_alpha)
+    token_in, token_out = ("HETU", "ALPHA") if is_hetu_to_alpha else ("ALPHA", "HETU")
+    print(
+        f"[yellow]Pool at block {state.block}: {state.hetu_reserve / WEI_PER_HETU:,.4f} HETU / "
+        f"{state.alpha_reserve / WEI_PER_HETU:,.4f} ALPHA, price {state.price / PRICE_SCALE:.6f}, mechanism {state.mechanism}"
+    )
+
+    table = Table(title=f"{token_in} -> {token_out} quotes ({points} sizes, one snapshot)")
+    for header in (f"{token_in} IN", f"{token_out} OUT", "AVG PRICE", "NEW PRICE", "IMPACT %", "LIQUIDITY"):
+        table.add_column(header, justify="right")
+    for i in np.unique(np.linspace(0, points - 1, min(rows, points)).astype(int)):
+        table.add_row(
+            f"{curve['amount_in'][i] / WEI_PER_HETU:,.4f}",
+            f"{curve['amount_out'][i] / WEI_PER_HETU:,.4f}",
+            f"{curve['average_price'][i] / PRICE_SCALE:.6f}",
+            f"{curve['new_price'][i] / PRICE_SCALE:.6f}",
+            f"{curve['price_impact'][i] / 100:.2f}",
+            "ok" if curve["sufficient"][i] else "insufficient",
+        )
+    Console().print(table)
+
+    if output:
+        columns = {
+            "amount_in": curve["amount_in"] / WEI_PER_HETU,
+            "amount_out": curve["amount_out"] / WEI_PER_HETU,
+            "average_price": curve["average_price"] / PRICE_SCALE,
+            "new_price": curve["new_price"] / PRICE_SCALE,
+            "price_impact_bps": curve["price_impact"],
+            "sufficient": curve["sufficient"],
+        }
+        if output.endswith(".npz"):
+            np.savez(output, **columns)
+        else:
+            names = list(columns)
+            np.savetxt(
+                output,
+                np.column_stack([columns[n].astype(np.float64) for n in names]),
+                delimiter=",",
+                header=",".join(names),
+                comments="",
+                fmt="%.18g",
+            )
+        print(f"[green]Curve written to {output}")
+
+    if verify:
+        samples = np.unique(np.linspace(0, points - 1, min(verify, points)).astype(int))
+        results = verify_quotes(amm, state, curve["amount_in"][samples], is_hetu_to_alpha)
+        mismatches = [(a, local, remote) for a, local, remote in results if local != remote]
+        for a, local, remote in mismatches:
+            print(f"[red]Mismatch at {a / WEI_PER_HETU:,.6f} {token_in}: local {local}, getSwapPreview {remote}")
+        print(f"[green]Verified {len(results) - len(mismatches)}/{len(results)} sample points against getSwapPreview at block {state.block}")
+
 @amm_app.command()
 def inject_liquidity(
     ctx: typer.Context,
@@ -134,6 +670,8 @@ def inject_liquidity(
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     hetu_amount: float = typer.Option(..., help="HETU amount to add (in HETU)"),
     alpha_amount: float = typer.Option(..., help="ALPHA amount to add (in ALPHA)"),
+    approve_amount: float = typer.Option(None, help="When the allowance is short, approve this standing amount instead of exactly what is needed"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Inject liquidity into the pool"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -156,6 +694,18 @@ def inject_liquidity(
     nonce = amm.web3.eth.get_transaction_count(from_address)
     hetu_amount_wei = amm.web3.to_wei(hetu_amount, "ether")
     alpha_amount_wei = amm.web3.to_wei(alpha_amount, "ether")
+    nonce, approvals = approve_if_short(
+        amm.web3,
+        private_key,
+        from_address,
+        amm.contract.address,
+        [
+            (linked_token(ctx.obj, amm, "hetuToken"), hetu_amount_wei),
+            (linked_token(ctx.obj, amm, "alphaToken"), alpha_amount_wei),
+        ],
+        nonce,
+        amm.web3.to_wei(approve_amount or 0, "ether"),
+    )
     tx = amm.contract.functions.injectLiquidity(hetu_amount_wei, alpha_amount_wei).build_transaction(
         {
             "from": from_address,
@@ -167,6 +717,11 @@ def inject_liquidity(
     signed = amm.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = amm.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted inject liquidity tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_txs(
+            config, [(h, "approve", from_address) for h in approvals] + [(tx_hash, "inject liquidity", from_address)]
+        )
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = amm.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -184,6 +739,7 @@ def withdraw_liquidity(
     hetu_amount: float = typer.Option(..., help="HETU amount to withdraw (in HETU)"),
     alpha_amount: float = typer.Option(..., help="ALPHA amount to withdraw (in ALPHA)"),
     to: str = typer.Option(..., help="Recipient address"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Withdraw liquidity from the pool"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -217,6 +773,9 @@ def withdraw_liquidity(
     signed = amm.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = amm.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted withdraw liquidity tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "withdraw liquidity", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = amm.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -224,6 +783,74 @@ def withdraw_liquidity(
     else:
         print(f"[red]Withdraw liquidity failed in block {receipt.blockNumber}")
 
+def _send_swap(
+    config,
+    amm,
+    private_key,
+    from_address: str,
+    nonce: int,
+    approvals,
+    amount_in: int,
+    hetu_to_alpha: bool,
+    to: str,
+    min_out,
+    max_slippage,
+    retries: int,
+    no_wait: bool,
+):
+    """
+    Send a swap with a fixed min-out, or with max_slippage derive the min-out
+    from a local quote of the current reserves. A slippage-protected swap that
+    reverts because the pool moved past the tolerance before inclusion is
+    re-quoted and resent, up to retries times. Returns the receipt of the
+    swap that succeeded, or None.
+    """
+    label = "HETU for ALPHA" if hetu_to_alpha else "ALPHA for HETU"
+    token_out = "ALPHA" if hetu_to_alpha else "HETU"
+    swap = amm.contract.functions.swapHETUForAlpha if hetu_to_alpha else amm.contract.functions.swapAlphaForHETU
+    for attempt in range(retries + 1):
+        if max_slippage is not None:
+            try:
+                state = read_pool_state(amm)
+                expected = checked_quote(state, amount_in, hetu_to_alpha)[0]
+                min_out = min_out_for_slippage(expected, max_slippage)
+            except ValueError as e:
+                print(f"[red]{e}")
+                raise typer.Exit(1)
+            print(
+                f"[yellow]Quote at block {state.block}: {expected / WEI_PER_HETU:,.6f} {token_out}, "
+                f"minimum {min_out / WEI_PER_HETU:,.6f} at {max_slippage}% slippage"
+            )
+        tx = swap(amount_in, min_out, to).build_transaction(
+            {
+                "from": from_address,
+                "nonce": nonce,
+                "gas": 300000,
+                "gasPrice": amm.web3.eth.gas_price,
+            }
+        )
+        signed = amm.web3.eth.account.sign_transaction(tx, private_key)
+        tx_hash = amm.web3.eth.send_raw_transaction(signed.raw_transaction)
+        print(f"[green]Broadcasted swap {label} tx hash: {tx_hash.hex()}")
+        if no_wait:
+            record_pending_txs(
+                config, [(h, "approve", from_address) for h in approvals] + [(tx_hash, f"swap {label}", from_address)]
+            )
+            return
+        print("[yellow]Waiting for transaction receipt...")
+        receipt = amm.web3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt.status == 1:
+            print(f"[green]Swap {label} succeeded in block {receipt.blockNumber}")
+            return receipt
+        print(f"[red]Swap {label} failed in block {receipt.blockNumber}")
+        if max_slippage is None or attempt == retries:
+            return
+        moved = quote_exact(read_pool_state(amm, receipt.blockNumber), amount_in, hetu_to_alpha)[0]
+        if moved >= min_out:
+            return  # the pool did not move past the tolerance, so a resend would fail the same way
+        print(f"[yellow]Pool moved to {moved / WEI_PER_HETU:,.6f} {token_out} before inclusion, re-quoting")
+        nonce += 1
+
 @amm_app.command()
 def swap_alpha_for_hetu(
     ctx: typer.Context,
@@ -232,8 +859,12 @@ def swap_alpha_for_hetu(
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     alpha_amount_in: float = typer.Option(..., help="Alpha amount in (in ALPHA)"),
-    hetu_amount_out_min: float = typer.Option(..., help="Minimum HETU out (in HETU)"),
+    hetu_amount_out_min: float = typer.Option(None, help="Minimum HETU out (in HETU)"),
+    max_slippage: float = typer.Option(None, help="Derive the minimum out from a local quote, allowing this much slippage in percent"),
+    retries: int = typer.Option(1, help="With --max-slippage, times to re-quote and resend if the pool moved past the tolerance"),
     to: str = typer.Option(..., help="Recipient address"),
+    approve_amount: float = typer.Option(None, help="When the allowance is short, approve this standing amount instead of exactly what is needed"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Swap ALPHA for HETU"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -241,6 +872,9 @@ def swap_alpha_for_hetu(
     if not rpc:
         print("[red]No RPC URL found in config or CLI.")
         raise typer.Exit(1)
+    if (hetu_amount_out_min is None) == (max_slippage is None):
+        print("[red]Pass either --hetu-amount-out-min or --max-slippage.")
+        raise typer.Exit(1)
     config = ctx.obj
     wallet_path = wallet_path or get_wallet_path(config)
     keystore = load_keystore(sender, wallet_path)
@@ -255,24 +889,31 @@ def swap_alpha_for_hetu(
     from_address = keystore["address"]
     nonce = amm.web3.eth.get_transaction_count(from_address)
     alpha_amount_in_wei = amm.web3.to_wei(alpha_amount_in, "ether")
-    hetu_amount_out_min_wei = amm.web3.to_wei(hetu_amount_out_min, "ether")
-    tx = amm.contract.functions.swapAlphaForHETU(alpha_amount_in_wei, hetu_amount_out_min_wei, to).build_transaction(
-        {
-            "from": from_address,
-            "nonce": nonce,
-            "gas": 300000,
-            "gasPrice": amm.web3.eth.gas_price,
-        }
+    hetu_amount_out_min_wei = None if hetu_amount_out_min is None else amm.web3.to_wei(hetu_amount_out_min, "ether")
+    nonce, approvals = approve_if_short(
+        amm.web3,
+        private_key,
+        from_address,
+        amm.contract.address,
+        [(linked_token(ctx.obj, amm, "alphaToken"), alpha_amount_in_wei)],
+        nonce,
+        amm.web3.to_wei(approve_amount or 0, "ether"),
+    )
+    _send_swap(
+        config,
+        amm,
+        private_key,
+        from_address,
+        nonce,
+        approvals,
+        alpha_amount_in_wei,
+        False,
+        to,
+        hetu_amount_out_min_wei,
+        max_slippage,
+        retries,
+        no_wait,
     )
-    signed = amm.web3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = amm.web3.eth.send_raw_transaction(signed.raw_transaction)
-    print(f"[green]Broadcasted swap ALPHA for HETU tx hash: {tx_hash.hex()}")
-    print("[yellow]Waiting for transaction receipt...")
-    receipt = amm.web3.eth.wait_for_transaction_receipt(tx_hash)
-    if receipt.status == 1:
-        print(f"[green]Swap ALPHA for HETU succeeded in block {receipt.blockNumber}")
-    else:
-        print(f"[red]Swap ALPHA for HETU failed in block {receipt.blockNumber}")
 
 @amm_app.command()
 def swap_hetu_for_alpha(
@@ -282,8 +923,12 @@ def swap_hetu_for_alpha(
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     hetu_amount_in: float = typer.Option(..., help="HETU amount in (in HETU)"),
-    alpha_amount_out_min: float = typer.Option(..., help="Minimum ALPHA out (in ALPHA)"),
+    alpha_amount_out_min: float = typer.Option(None, help="Minimum ALPHA out (in ALPHA)"),
+    max_slippage: float = typer.Option(None, help="Derive the minimum out from a local quote, allowing this much slippage in percent"),
+    retries: int = typer.Option(1, help="With --max-slippage, times to re-quote and resend if the pool moved past the tolerance"),
     to: str = typer.Option(..., help="Recipient address"),
+    approve_amount: float = typer.Option(None, help="When the allowance is short, approve this standing amount instead of exactly what is needed"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Swap HETU for ALPHA"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -291,6 +936,9 @@ def swap_hetu_for_alpha(
     if not rpc:
         print("[red]No RPC URL found in config or CLI.")
         raise typer.Exit(1)
+    if (alpha_amount_out_min is None) == (max_slippage is None):
+        print("[red]Pass either --alpha-amount-out-min or --max-slippage.")
+        raise typer.Exit(1)
     config = ctx.obj
     wallet_path = wallet_path or get_wallet_path(config)
     keystore = load_keystore(sender, wallet_path)
@@ -305,21 +953,179 @@ def swap_hetu_for_alpha(
     from_address = keystore["address"]
     nonce = amm.web3.eth.get_transaction_count(from_address)
     hetu_amount_in_wei = amm.web3.to_wei(hetu_amount_in, "ether")
-    alpha_amount_out_min_wei = amm.web3.to_wei(alpha_amount_out_min, "ether")
-    tx = amm.contract.functions.swapHETUForAlpha(hetu_amount_in_wei, alpha_amount_out_min_wei, to).build_transaction(
-        {
-            "from": from_address,
-            "nonce": nonce,
-            "gas": 300000,
-            "gasPrice": amm.web3.eth.gas_price,
-        }
+    alpha_amount_out_min_wei = None if alpha_amount_out_min is None else amm.web3.to_wei(alpha_amount_out_min, "ether")
+    nonce, approvals = approve_if_short(
+        amm.web3,
+        private_key,
+        from_address,
+        amm.contract.address,
+        [(linked_token(ctx.obj, amm, "hetuToken"), hetu_amount_in_wei)],
+        nonce,
+        amm.web3.to_wei(approve_amount or 0, "ether"),
     )
-    signed = amm.web3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = amm.web3.eth.send_raw_transaction(signed.raw_transaction)
-    print(f"[green]Broadcasted swap HETU for ALPHA tx hash: {tx_hash.hex()}")
-    print("[yellow]Waiting for transaction receipt...")
-    receipt = amm.web3.eth.wait_for_transaction_receipt(tx_hash)
-    if receipt.status == 1:
-        print(f"[green]Swap HETU for ALPHA succeeded in block {receipt.blockNumber}")
+    _send_swap(
+        config,
+        amm,
+        private_key,
+        from_address,
+        nonce,
+        approvals,
+        hetu_amount_in_wei,
+        True,
+        to,
+        alpha_amount_out_min_wei,
+        max_slippage,
+        retries,
+        no_wait,
+    )
+
+@amm_app.command(name="split-swap")
+def split_swap(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="AMM contract address"),
+    netuid: int = typer.Option(None, help="Swap on this subnet's pool instead of --contract"),
+    route_to_netuid: int = typer.Option(None, help="Route ALPHA -> HETU -> ALPHA into this subnet's pool"),
+    amount_in: float = typer.Option(..., help="Total input (in HETU or ALPHA)"),
+    is_hetu_to_alpha: bool = typer.Option(True, help="True for HETU->ALPHA, False for ALPHA->HETU (routes are always ALPHA first)"),
+    max_impact: float = typer.Option(1.0, help="Largest price impact of any chunk on any pool, in percent"),
+    max_chunks: int = typer.Option(20, help="Most chunks (one per block) to consider"),
+    resilience: float = typer.Option(0.0, help="Fraction of a chunk's price move the pool recovers before the next block (0 = none)"),
+    max_slippage: float = typer.Option(0.5, help="Slippage allowed on each chunk against its own fresh quote, in percent"),
+    retries: int = typer.Option(1, help="Times to re-quote and resend a chunk if the pool moved past the tolerance"),
+    dry_run: bool = typer.Option(False, help="Only print the schedule"),
+    sender: str = typer.Option(None, help="Sender address (must match keystore address or wallet name)"),
+    wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
+    password: str = typer.Option(None, hide_input=True, help="Keystore password"),
+    to: str = typer.Option(None, help="Recipient address (default sender)"),
+    approve_amount: float = typer.Option(None, help="When the allowance is short, approve this standing amount instead of exactly what is needed"),
+):
+    """Split a large swap into chunks over several blocks to cap price impact"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    if route_to_netuid is not None and is_hetu_to_alpha:
+        print("[red]A route sells ALPHA first; pass --no-is-hetu-to-alpha with --route-to-netuid.")
+        raise typer.Exit(1)
+    if not dry_run and not sender:
+        print("[red]--sender is required unless --dry-run is set.")
+        raise typer.Exit(1)
+    amms = [load_amm(resolve_pool(ctx, rpc, netuid, contract), rpc)]
+    directions = [is_hetu_to_alpha]
+    if route_to_netuid is not None:
+        amms.append(load_amm(resolve_pool(ctx, rpc, route_to_netuid, None), rpc))
+        directions.append(True)
+    amount_in_wei = amms[0].web3.to_wei(amount_in, "ether")
+    try:
+        states = [read_pool_state(amm) for amm in amms]
+        if not is_hetu_to_alpha and amount_in_wei > states[0].alpha_out:
+            raise ValueError(
+                f"{amount_in:,.6f} ALPHA exceeds the {states[0].alpha_out / WEI_PER_HETU:,.6f} ALPHA "
+                "the pool has paid out, the most swapAlphaForHETU accepts"
+            )
+        plan = plan_split(states, directions, amount_in_wei, max_chunks, max_impact * 100, resilience)
+    except ValueError as e:
+        print(f"[red]{e}")
+        raise typer.Exit(1)
+
+    token_in = "HETU" if is_hetu_to_alpha else "ALPHA"
+    token_out = "HETU" if directions[-1] is False else "ALPHA"
+    sizes = [amount_in_wei // plan.chunks] * plan.chunks
+    sizes[-1] += amount_in_wei - sum(sizes)
+    if route_to_netuid is None:
+        # HETU per ALPHA, whichever way the swap goes.
+        spot = states[0].price / PRICE_SCALE
+        rate_label = "AVG PRICE"
+        def rate(amount, out):
+            return amount / out if is_hetu_to_alpha else out / amount
     else:
-        print(f"[red]Swap HETU for ALPHA failed in block {receipt.blockNumber}") 
\ No newline at end of file
+        spot = states[0].price / states[1].price
+        rate_label = f"{token_out} PER {token_in}"
+        def rate(amount, out):
+            return out / amount
+    path = f"{token_in} -> HETU -> {token_out}" if len(amms) > 1 else f"{token_in} -> {token_out}"
+    table = Table(title=f"{path} in {plan.chunks} chunk(s), one per block")
+    for header in ("CHUNK", "BLOCK", f"{token_in} IN", f"{token_out} OUT", rate_label, "IMPACT %", "POOL %"):
+        table.add_column(header, justify="right")
+    for i, (size, out) in enumerate(zip(sizes, plan.chunk_out)):
+        table.add_row(
+            str(i + 1),
+            f"+{i + 1}",
+            f"{size / WEI_PER_HETU:,.4f}",
+            f"{out / WEI_PER_HETU:,.4f}",
+            f"{rate(size, out):.6f}" if out else "-",
+            " / ".join(f"{v / 100:.2f}" for v in plan.impact[i]),
+            " / ".join(f"{v / 100:.2f}" for v in plan.pool_share[i]),
+        )
+    Console().print(table)
+    total = plan.total_out
+    print(
+        f"[green]Expected {total / WEI_PER_HETU:,.6f} {token_out} for {amount_in:,.6f} {token_in}, "
+        f"{rate_label.lower()} {rate(amount_in_wei, total):.6f} (spot {spot:.6f}); "
+        f"one trade: {plan.single_trade_out / WEI_PER_HETU:,.6f} {token_out}"
+    )
+    if resilience == 0:
+        print("[yellow]Without recovery between blocks a constant-product pool pays the same in total for any split; chunks only cap each trade's impact and slippage exposure.")
+    if not plan.feasible:
+        print(f"[red]No split into at most {max_chunks} chunks keeps every chunk within {max_impact}% impact and above minimum liquidity.")
+        if not dry_run:
+            raise typer.Exit(1)
+    if dry_run:
+        return
+
+    config = ctx.obj
+    wallet_path = wallet_path or get_wallet_path(config)
+    keystore = load_keystore(sender, wallet_path)
+    if not password:
+        password = getpass.getpass("Keystore password: ")
+    try:
+        private_key = Account.decrypt(keystore, password)
+    except Exception as e:
+        print(f"[red]Failed to decrypt keystore: {e}")
+        raise typer.Exit(1)
+    from_address = keystore["address"]
+    to = to or from_address
+    web3 = amms[0].web3
+    standing = web3.to_wei(approve_amount or 0, "ether")
+    nonce, approvals = approve_if_short(
+        web3,
+        private_key,
+        from_address,
+        amms[0].contract.address,
+        [(linked_token(ctx.obj, amms[0], "hetuToken" if is_hetu_to_alpha else "alphaToken"), amount_in_wei)],
+        web3.eth.get_transaction_count(from_address),
+        standing,
+    )
+    if len(amms) > 1:
+        hetu_token = linked_token(ctx.obj, amms[1], "hetuToken")
+        # 1% headroom over one-trade HETU out covers per-chunk rounding and small favorable moves.
+        hetu_standing = max(standing, quote_exact(states[0], amount_in_wei, False)[0] * 101 // 100)
+    received = 0
+    for i, size in enumerate(sizes):
+        print(f"[yellow]Chunk {i + 1}/{plan.chunks}")
+        receipt = _send_swap(
+            config, amms[0], private_key, from_address, nonce, approvals, size, is_hetu_to_alpha,
+            to if len(amms) == 1 else from_address, None, max_slippage, retries, False,
+        )
+        if receipt is not None and len(amms) > 1:
+            swapped = amms[0].contract.events.SwapAlphaForHETU().process_receipt(receipt, errors=DISCARD)
+            nonce, leg_approvals = approve_if_short(
+                web3, private_key, from_address, amms[1].contract.address,
+                [(hetu_token, swapped[0]["args"]["hetuAmountOut"])],
+                web3.eth.get_transaction_count(from_address), hetu_standing,
+            )
+            receipt = _send_swap(
+                config, amms[1], private_key, from_address, nonce, leg_approvals,
+                swapped[0]["args"]["hetuAmountOut"], True, to, None, max_slippage, retries, False,
+            )
+        if receipt is None:
+            print(f"[red]Stopped after {i} of {plan.chunks} chunks.")
+            raise typer.Exit(1)
+        received += amms[-1].contract.events[
+            "SwapHETUForAlpha" if directions[-1] else "SwapAlphaForHETU"
+        ]().process_receipt(receipt, errors=DISCARD)[0]["args"]["alphaAmountOut" if directions[-1] else "hetuAmountOut"]
+        nonce = web3.eth.get_transaction_count(from_address)
+    print(
+        f"[green]Received {received / WEI_PER_HETU:,.6f} {token_out} in {plan.chunks} chunk(s), "
+        f"{rate_label.lower()} {rate(amount_in_wei, received):.6f}"
+    )
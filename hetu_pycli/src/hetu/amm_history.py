@@ -0,0 +1,323 @@
+import re
+import sqlite3
+
+import numpy as np
+
+from hetu_pycli.config import get_data_path
+from hetu_pycli.src.hetu.amm_quote import PRICE_SCALE
+from hetu_pycli.src.hetu.batch import batch_rpc
+from hetu_pycli.src.hetu.logs import DEFAULT_LOG_CHUNK, fetch_events
+from hetu_pycli.src.hetu.metagraph import WEI_PER_HETU
+
+POOL_EVENTS = ["SwapHETUForAlpha", "SwapAlphaForHETU", "PriceUpdated", "ReservesUpdated"]
+SWAP_EVENTS = ("SwapHETUForAlpha", "SwapAlphaForHETU")
+
+# Blocks fetched and committed per step, so an interrupted sync loses at most one window.
+DEFAULT_WINDOW = 100_000
+
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+# One row per pool event. Amounts are wei and prices 1e18-scaled, stored as
+# decimal TEXT; columns an event does not carry are NULL (price, reserves) or
+# "0" (swap amounts).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    pool TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pool_events (
+    pool TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    tx_hash TEXT,
+    event TEXT NOT NULL,
+    user TEXT,
+    price TEXT,
+    hetu_amount TEXT NOT NULL,
+    alpha_amount TEXT NOT NULL,
+    hetu_reserve TEXT,
+    alpha_reserve TEXT,
+    PRIMARY KEY (pool, block, log_index)
+);
+"""
+
+
+def get_amm_history_path(config):
+    return get_data_path(config, "amm_history.sqlite")
+
+
+def parse_interval(text: str) -> int:
+    """'90s', '5m', '1h', '1d', '1w' or plain seconds -> seconds."""
+    match = re.fullmatch(r"\s*(\d+)\s*([smhdw]?)\s*", text or "")
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"invalid interval {text!r}, expected e.g. 5m, 1h or 1d")
+    return int(match.group(1)) * INTERVAL_UNITS[match.group(2) or "s"]
+
+
+def _event_row(pool: str, event, timestamp: int):
+    args = event["args"]
+    name = event["event"]
+    price = hetu_amount = alpha_amount = hetu_reserve = alpha_reserve = None
+    if name == "SwapHETUForAlpha":
+        hetu_amount, alpha_amount, price = args["hetuAmountIn"], args["alphaAmountOut"], args["newPrice"]
+    elif name == "SwapAlphaForHETU":
+        hetu_amount, alpha_amount, price = args["hetuAmountOut"], args["alphaAmountIn"], args["newPrice"]
+    elif name == "PriceUpdated":
+        price = args["currentPrice"]
+    elif name == "ReservesUpdated":
+        hetu_reserve, alpha_reserve = args["subnetTAO"], args["subnetAlphaIn"]
+    return (
+        pool,
+        event["blockNumber"],
+        event["logIndex"],
+        timestamp,
+        event["transactionHash"],
+        name,
+        args.get("user"),
+        None if price is None else str(price),
+        str(hetu_amount or 0),
+        str(alpha_amount or 0),
+        None if hetu_reserve is None else str(hetu_reserve),
+        None if alpha_reserve is None else str(alpha_reserve),
+    )
+
+
+class AmmHistory:
+    """Local store of SubnetAMM events per pool, with one checkpoint block per pool."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def block(self, pool: str):
+        row = self.conn.execute("SELECT block FROM checkpoints WHERE pool = ?", (pool,)).fetchone()
+        return row[0] if row else None
+
+    def apply(self, pool: str, events, timestamps, to_block: int):
+        """Store decoded events with their block timestamps and move the pool's checkpoint, in one transaction."""
+        rows = [_event_row(pool, event, timestamps[event["blockNumber"]]) for event in events]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pool_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.conn.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", (pool, to_block))
+        return len(rows)
+
+    def series(self, pool: str, from_block: int = 0, to_block=None):
+        """
+        The pool's events in chain order as NumPy columns: block, timestamp,
+        price (NaN where the event has none), hetu_volume and alpha_volume
+        (swaps only, 0 elsewhere), trade (bool), hetu_reserve and alpha_reserve
+        (NaN where absent). Amounts are in HETU/ALPHA and prices unscaled.
+        """
+        query = (
+            "SELECT block, timestamp, event, price, hetu_amount, alpha_amount, hetu_reserve, alpha_reserve "
+            "FROM pool_events WHERE pool = ? AND block >= ?"
+        )
+        params = [pool, from_block]
+        if to_block is not None:
+            query += " AND block <= ?"
+            params.append(to_block)
+        rows = self.conn.execute(query + " ORDER BY block, log_index", params).fetchall()
+        n = len(rows)
+        columns = {
+            "block": np.fromiter((r[0] for r in rows), dtype=np.int64, count=n),
+            "timestamp": np.fromiter((r[1] for r in rows), dtype=np.int64, count=n),
+            "trade": np.fromiter((r[2] in SWAP_EVENTS for r in rows), dtype=bool, count=n),
+        }
+        nan = float("nan")
+        for key, i, scale in (
+            ("price", 3, PRICE_SCALE),
+            ("hetu_volume", 4, WEI_PER_HETU),
+            ("alpha_volume", 5, WEI_PER_HETU),
+            ("hetu_reserve", 6, WEI_PER_HETU),
+            ("alpha_reserve", 7, WEI_PER_HETU),
+        ):
+            columns[key] = np.fromiter(
+                (nan if r[i] is None else int(r[i]) / scale for r in rows), dtype=np.float64, count=n
+            )
+        return columns
+
+    def window_series(self, pool: str, first_block: int, last_block: int):
+        """
+        series() for a PriceIndex over first_block..last_block: it starts at the
+        last price event before first_block, which gives the window its opening
+        price, instead of at the pool's first event.
+        """
+        row = self.conn.execute(
+            "SELECT block FROM pool_events WHERE pool = ? AND block < ? AND price IS NOT NULL "
+            "ORDER BY block DESC LIMIT 1",
+            (pool, first_block),
+        ).fetchone()
+        return self.series(pool, row[0] if row else first_block, last_block)
+
+
+CANDLE_COLUMNS = (
+    "time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume_hetu",
+    "volume_alpha",
+    "trades",
+    "hetu_reserve",
+    "alpha_reserve",
+)
+
+
+def build_candles(series, interval: int):
+    """
+    Fold a series() into OHLCV bars of interval seconds, keyed by bar open
+    time. Only bars with at least one event are returned. A bar without a
+    price event opens and closes at the previous close; reserves are the last
+    values seen up to the bar's end.
+    """
+    ts = series["timestamp"]
+    if not len(ts):
+        return {key: np.array([]) for key in CANDLE_COLUMNS}
+    bucket = ts // interval * interval
+    times, starts = np.unique(bucket, return_index=True)
+    candles = {"time": times}
+    candles["trades"] = np.add.reduceat(series["trade"].astype(np.int64), starts)
+    candles["volume_hetu"] = np.add.reduceat(series["hetu_volume"], starts)
+    candles["volume_alpha"] = np.add.reduceat(series["alpha_volume"], starts)
+
+    # OHLC over price events only, placed into their bar slots.
+    price = series["price"]
+    has_price = ~np.isnan(price)
+    p, slot = price[has_price], np.searchsorted(times, bucket[has_price])
+    for key in ("open", "high", "low", "close"):
+        candles[key] = np.full(len(times), np.nan)
+    if len(p):
+        p_slots, p_starts = np.unique(slot, return_index=True)
+        p_ends = np.append(p_starts[1:], len(p)) - 1
+        candles["open"][p_slots] = p[p_starts]
+        candles["close"][p_slots] = p[p_ends]
+        candles["high"][p_slots] = np.maximum.reduceat(p, p_starts)
+        candles["low"][p_slots] = np.minimum.reduceat(p, p_starts)
+    close = _forward_fill(candles["close"])
+    previous_close = np.append(np.nan, close[:-1])
+    for key in ("open", "high", "low"):
+        candles[key] = np.where(np.isnan(candles[key]), previous_close, candles[key])
+    candles["close"] = close
+
+    ends = np.append(starts[1:], len(ts)) - 1
+    for key in ("hetu_reserve", "alpha_reserve"):
+        candles[key] = _forward_fill(series[key])[ends]
+    return {key: candles[key] for key in CANDLE_COLUMNS}
+
+
+def _forward_fill(values):
+    """Replace each NaN with the last non-NaN value before it (leading NaNs stay)."""
+    index = np.where(np.isnan(values), -1, np.arange(len(values)))
+    np.maximum.accumulate(index, out=index)
+    return np.where(index >= 0, values[np.maximum(index, 0)], np.nan)
+
+
+class PriceIndex:
+    """
+    Block-indexed prefix sums over a series(): each block's opening price
+    (the last price before the block, so a trade only counts from the next
+    block on) and its swap volumes and count. Built once in O(blocks + events);
+    every window after that costs O(1).
+    """
+
+    def __init__(self, series, first_block=None, last_block=None):
+        blocks, price = series["block"], series["price"]
+        priced = ~np.isnan(price)
+        if not priced.any():
+            raise ValueError("no price events to index")
+        priced_blocks, prices = blocks[priced], price[priced]
+        self.first_block = max(int(priced_blocks[0]) + 1, first_block or 0)
+        self.last_block = int(last_block if last_block is not None else blocks[-1])
+        if self.last_block < self.first_block:
+            raise ValueError(f"nothing to index between blocks {self.first_block} and {self.last_block}")
+        n = self.last_block - self.first_block + 1
+
+        # Closing price of blocks first_block - 1 .. last_block - 1 is the opening price of the next one.
+        closing = np.full(n, np.nan)
+        closing[0] = prices[np.searchsorted(priced_blocks, self.first_block - 1, side="right") - 1]
+        inside = (priced_blocks >= self.first_block) & (priced_blocks < self.last_block)
+        offsets = (priced_blocks[inside] - (self.first_block - 1))[::-1]
+        slots, last = np.unique(offsets, return_index=True)
+        closing[slots] = prices[inside][::-1][last]
+        self._price = np.concatenate(([0.0], np.cumsum(_forward_fill(closing))))
+
+        trade = series["trade"] & (blocks >= self.first_block) & (blocks <= self.last_block)
+        trade_offsets = blocks[trade] - self.first_block
+        self._hetu = np.concatenate(([0.0], np.cumsum(np.bincount(trade_offsets, series["hetu_volume"][trade], n))))
+        self._alpha = np.concatenate(([0.0], np.cumsum(np.bincount(trade_offsets, series["alpha_volume"][trade], n))))
+        self._trades = np.concatenate(([0], np.cumsum(np.bincount(trade_offsets, minlength=n))))
+
+    def windows(self, from_blocks, to_blocks):
+        """
+        TWAP (mean opening price per block), VWAP (HETU / ALPHA swapped),
+        volumes and trade count of each inclusive [from, to] block window,
+        clamped to the indexed range. Accepts scalars or arrays.
+        """
+        start = np.clip(np.asarray(from_blocks), self.first_block, self.last_block)
+        end = np.clip(np.asarray(to_blocks), start, self.last_block)
+        i, j = start - self.first_block, end - self.first_block + 1
+        hetu, alpha = self._hetu[j] - self._hetu[i], self._alpha[j] - self._alpha[i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = np.where(alpha > 0, hetu / alpha, np.nan)
+        return {
+            "from_block": start,
+            "to_block": end,
+            "twap": (self._price[j] - self._price[i]) / (j - i),
+            "vwap": vwap,
+            "hetu_volume": hetu,
+            "alpha_volume": alpha,
+            "trades": self._trades[j] - self._trades[i],
+        }
+
+
+def fetch_block_timestamps(web3, blocks, batch_size: int = 200, max_workers: int = 4):
+    """{block: timestamp} for the given block numbers via batched eth_getBlockByNumber."""
+    blocks = sorted(set(blocks))
+    headers = batch_rpc(
+        web3, [("eth_getBlockByNumber", [hex(b), False]) for b in blocks], batch_size, max_workers
+    )
+    timestamps = {}
+    for block, header in zip(blocks, headers):
+        if header is None:
+            raise ValueError(f"could not read block {block}")
+        timestamp = header["timestamp"]
+        timestamps[block] = int(timestamp, 16) if isinstance(timestamp, str) else int(timestamp)
+    return timestamps
+
+
+def sync_amm_history(
+    history: AmmHistory,
+    amm,
+    from_block: int = 0,
+    to_block=None,
+    window: int = DEFAULT_WINDOW,
+    chunk_size: int = DEFAULT_LOG_CHUNK,
+    max_workers: int = 4,
+):
+    """
+    Store a pool's SubnetAMM events from its checkpoint (or from_block on the
+    first run) up to to_block, one window at a time. Yields (window end, event
+    count) after each committed window.
+    """
+    pool = amm.contract.address
+    checkpoint = history.block(pool)
+    start = checkpoint + 1 if checkpoint is not None else from_block
+    end = to_block if to_block is not None else amm.web3.eth.block_number
+    while start <= end:
+        stop = min(start + window - 1, end)
+        events = fetch_events(amm.contract, POOL_EVENTS, start, stop, chunk_size=chunk_size, max_workers=max_workers)
+        timestamps = fetch_block_timestamps(amm.web3, [e["blockNumber"] for e in events], max_workers=max_workers)
+        yield stop, history.apply(pool, events, timestamps, stop)
+        start = stop + 1
+
+
+def open_amm_history(ctx):
+    return AmmHistory(get_amm_history_path(ctx.obj))
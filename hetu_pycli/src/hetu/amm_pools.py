@@ -0,0 +1,96 @@
+from hetu_pycli.src.hetu.batch import batch_call
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Sort keys accepted by `amm pools --sort-by`, mapped to row fields.
+POOL_SORT_KEYS = {
+    "netuid": "netuid",
+    "price": "price",
+    "liquidity": "liquidity",
+    "volume": "volume",
+    "health": "liquidity_ratio",
+}
+
+
+def resolve_pools(subnet_mgr, netuids, block, batch_size: int = 200):
+    """(netuid, getSubnetInfo tuple) for each subnet that has an ammPool, from one batch of getSubnetInfo calls."""
+    mgr_fns = subnet_mgr.contract.functions
+    infos = batch_call(subnet_mgr.web3, [mgr_fns.getSubnetInfo(netuid) for netuid in netuids], block, batch_size)
+    return [(netuid, info) for netuid, info in zip(netuids, infos) if info and info[3] != ZERO_ADDRESS]
+
+
+def fetch_pools(subnet_mgr, amm_abi, netuids, block=None, batch_size: int = 200):
+    """
+    Resolve each subnet's ammPool with batched getSubnetInfo calls, then read
+    getPoolInfo, getStatistics and getPoolHealth of every pool in a second
+    batch, both pinned to one block. Subnets without a pool are left out; a
+    pool whose reads revert is kept with ok=False. Amounts stay in wei.
+    """
+    web3 = subnet_mgr.web3
+    if block is None:
+        block = web3.eth.block_number
+    subnets = resolve_pools(subnet_mgr, netuids, block, batch_size)
+    calls = []
+    for _, info in subnets:
+        fns = web3.eth.contract(address=info[3], abi=amm_abi).functions
+        calls += [fns.getPoolInfo(), fns.getStatistics(), fns.getPoolHealth()]
+    results = batch_call(web3, calls, block, batch_size)
+    pools = []
+    for i, (netuid, info) in enumerate(subnets):
+        pool_info, stats, health = results[i * 3 : i * 3 + 3]
+        ok = pool_info is not None and stats is not None and health is not None
+        pool_info = pool_info or (0,) * 8
+        stats = stats or (0,) * 5
+        health = health or (False, "unavailable", 0)
+        pools.append(
+            {
+                "netuid": netuid,
+                "name": info[9],
+                "pool": info[3],
+                "active": info[8],
+                "mechanism": pool_info[0],
+                "hetu_reserve": pool_info[1],
+                "alpha_reserve": pool_info[2],
+                "price": pool_info[4],
+                "moving_price": pool_info[5],
+                "volume": stats[0],
+                "liquidity": stats[4],
+                "price_update_block": stats[3],
+                "healthy": health[0],
+                "status": health[1],
+                "liquidity_ratio": health[2],
+                "ok": ok,
+            }
+        )
+    return {"block": block, "pools": pools}
+
+
+def sort_pools(pools, sort_by: str = "liquidity", ascending: bool = False):
+    """Order pool rows by one of POOL_SORT_KEYS; unreadable pools always go last."""
+    if sort_by not in POOL_SORT_KEYS:
+        raise ValueError(f"unknown sort key {sort_by!r}, expected one of {', '.join(POOL_SORT_KEYS)}")
+    field = POOL_SORT_KEYS[sort_by]
+    readable = sorted((p for p in pools if p["ok"]), key=lambda p: p["netuid"])
+    readable.sort(key=lambda p: p[field], reverse=not ascending)
+    return readable + [p for p in pools if not p["ok"]]
+
+
+def fetch_user_stats(web3, amm_abi, pools, users, block=None, batch_size: int = 200):
+    """
+    getUserStats(user) of every user on every pool, as one batch of eth_calls
+    pinned to one block. Returns users x pools lists of volume (wei) and
+    share; None where the call reverted. SubnetAMM computes the share as
+    userVolume * 10_000 / totalVolume (0 before the pool's first trade), so it
+    is in bps of the pool's traded volume, not of its liquidity: the pool has
+    no LP token to take a balance share of.
+    """
+    if block is None:
+        block = web3.eth.block_number
+    fns = [web3.eth.contract(address=pool, abi=amm_abi).functions for pool in pools]
+    results = batch_call(web3, [f.getUserStats(user) for user in users for f in fns], block, batch_size)
+    volume, share = [], []
+    for i in range(len(users)):
+        row = results[i * len(pools) : (i + 1) * len(pools)]
+        volume.append([None if r is None else r[0] for r in row])
+        share.append([None if r is None else r[1] for r in row])
+    return {"block": block, "volume": volume, "share": share}
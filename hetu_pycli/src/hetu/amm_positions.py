@@ -0,0 +1,181 @@
+import sqlite3
+
+from hetu_pycli.config import get_data_path
+from hetu_pycli.src.hetu.amm_history import DEFAULT_WINDOW
+from hetu_pycli.src.hetu.amm_quote import PRICE_SCALE
+from hetu_pycli.src.hetu.batch import batch_rpc
+from hetu_pycli.src.hetu.logs import DEFAULT_LOG_CHUNK, event_codecs, fetch_events
+
+LIQUIDITY_EVENTS = ["LiquidityInjected", "LiquidityWithdrawn"]
+
+# One row per liquidity event. Amounts are wei and price the pool's 1e18-scaled
+# price right after the event (from the PriceUpdated log of the same
+# transaction, NULL when the receipt had none), stored as decimal TEXT.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    pool TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS liquidity_events (
+    pool TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT,
+    event TEXT NOT NULL,
+    user TEXT NOT NULL,
+    hetu_amount TEXT NOT NULL,
+    alpha_amount TEXT NOT NULL,
+    price TEXT,
+    PRIMARY KEY (pool, block, log_index)
+);
+CREATE INDEX IF NOT EXISTS liquidity_events_user ON liquidity_events (user);
+"""
+
+
+def get_amm_liquidity_path(config):
+    return get_data_path(config, "amm_liquidity.sqlite")
+
+
+class LiquidityIndex:
+    """Local store of LiquidityInjected / LiquidityWithdrawn events, with one checkpoint block per pool."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def block(self, pool: str):
+        row = self.conn.execute("SELECT block FROM checkpoints WHERE pool = ?", (pool,)).fetchone()
+        return row[0] if row else None
+
+    def apply(self, pools, events, prices, to_block: int):
+        """Store decoded events with their prices and move every pool's checkpoint to to_block, in one transaction."""
+        rows = []
+        for event in events:
+            args = event["args"]
+            injected = event["event"] == "LiquidityInjected"
+            price = prices.get((event["transactionHash"], event["address"]))
+            rows.append(
+                (
+                    event["address"],
+                    event["blockNumber"],
+                    event["logIndex"],
+                    event["transactionHash"],
+                    event["event"],
+                    args["injector"] if injected else args["withdrawer"],
+                    str(args["hetuAmount"]),
+                    str(args["alphaAmount"]),
+                    None if price is None else str(price),
+                )
+            )
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO liquidity_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", [(pool, to_block) for pool in pools]
+            )
+        return len(rows)
+
+    def positions(self, user: str):
+        """
+        {pool: position} for a user: injected and withdrawn HETU/ALPHA, net
+        amounts, cost (net flows valued in HETU at the pool price of each
+        event, None when a price is missing) and event count. Amounts in wei.
+        """
+        rows = self.conn.execute(
+            "SELECT pool, event, hetu_amount, alpha_amount, price FROM liquidity_events "
+            "WHERE user = ? ORDER BY pool, block, log_index",
+            (user,),
+        ).fetchall()
+        positions = {}
+        for pool, event, hetu, alpha, price in rows:
+            p = positions.setdefault(
+                pool,
+                {"injected_hetu": 0, "injected_alpha": 0, "withdrawn_hetu": 0, "withdrawn_alpha": 0, "cost": 0, "events": 0},
+            )
+            hetu, alpha = int(hetu), int(alpha)
+            side = "injected" if event == "LiquidityInjected" else "withdrawn"
+            p[f"{side}_hetu"] += hetu
+            p[f"{side}_alpha"] += alpha
+            p["events"] += 1
+            if price is None or p["cost"] is None:
+                p["cost"] = None
+            else:
+                value = hetu + alpha * int(price) // PRICE_SCALE
+                p["cost"] += value if side == "injected" else -value
+        for p in positions.values():
+            p["net_hetu"] = p["injected_hetu"] - p["withdrawn_hetu"]
+            p["net_alpha"] = p["injected_alpha"] - p["withdrawn_alpha"]
+        return positions
+
+
+def value_position(position, price: int, hetu_reserve: int, alpha_reserve: int):
+    """
+    Value a positions() entry at the pool's current price: value and pnl
+    (against cost) in HETU wei, and share, the value as a fraction of the
+    pool's reserves valued the same way.
+    """
+    value = position["net_hetu"] + position["net_alpha"] * price // PRICE_SCALE
+    pool_value = hetu_reserve + alpha_reserve * price // PRICE_SCALE
+    return {
+        "value": value,
+        "pnl": None if position["cost"] is None else value - position["cost"],
+        "share": value / pool_value if pool_value else 0.0,
+    }
+
+
+def fetch_event_prices(contract, events, batch_size: int = 100, max_workers: int = 4):
+    """
+    {(tx hash, pool): price} for liquidity events, taken from the PriceUpdated
+    log each inject/withdraw transaction emits, with one batch of receipts.
+    """
+    hashes = sorted({event["transactionHash"] for event in events})
+    codecs = event_codecs(contract, ["PriceUpdated"])
+    receipts = batch_rpc(contract.w3, [("eth_getTransactionReceipt", [h]) for h in hashes], batch_size, max_workers)
+    prices = {}
+    for tx_hash, receipt in zip(hashes, receipts):
+        for log in (receipt or {}).get("logs") or []:
+            if log["topics"] and log["topics"][0] in codecs:
+                decoded = codecs[log["topics"][0]].decode(log)
+                prices[(tx_hash, decoded["address"])] = decoded["args"]["currentPrice"]
+    return prices
+
+
+def sync_liquidity(
+    index: LiquidityIndex,
+    contract,
+    pools,
+    from_block: int = 0,
+    to_block=None,
+    window: int = DEFAULT_WINDOW,
+    chunk_size: int = DEFAULT_LOG_CHUNK,
+    max_workers: int = 4,
+):
+    """
+    Store the liquidity events of many pools (contract supplies the ABI),
+    each from its own checkpoint (or from_block on its first run) up to
+    to_block. Every window is one set of eth_getLogs over all pools still
+    behind. Yields (window end, event count) after each committed window.
+    """
+    end = to_block if to_block is not None else contract.w3.eth.block_number
+    starts = {}
+    for pool in pools:
+        checkpoint = index.block(pool)
+        starts[pool] = checkpoint + 1 if checkpoint is not None else from_block
+    start = min(starts.values(), default=end + 1)
+    while start <= end:
+        stop = min(start + window - 1, end)
+        behind = [pool for pool in pools if starts[pool] <= stop]
+        events = fetch_events(
+            contract, LIQUIDITY_EVENTS, start, stop, address=behind, chunk_size=chunk_size, max_workers=max_workers
+        )
+        events = [e for e in events if e["blockNumber"] >= starts[e["address"]]]
+        prices = fetch_event_prices(contract, events, max_workers=max_workers)
+        yield stop, index.apply(behind, events, prices, stop)
+        start = stop + 1
+
+
+def open_liquidity_index(ctx):
+    return LiquidityIndex(get_amm_liquidity_path(ctx.obj))
@@ -0,0 +1,157 @@
+import numpy as np
+
+from hetu_pycli.src.hetu.batch import batch_call
+
+PRICE_SCALE = 10**18
+BPS = 10_000
+# SubnetAMM.MechanismType: 0 swaps 1:1 at no price impact, 1 is a constant-product pool.
+MECHANISM_STABLE = 0
+MECHANISM_DYNAMIC = 1
+
+
+class PoolState:
+    """One reserves snapshot of a SubnetAMM pool (all amounts in wei, prices scaled by 1e18)."""
+
+    def __init__(
+        self,
+        mechanism,
+        hetu_reserve,
+        alpha_reserve,
+        alpha_out,
+        price,
+        moving_price,
+        total_volume,
+        minimum_liquidity,
+        k,
+        block=None,
+    ):
+        self.mechanism = mechanism
+        self.hetu_reserve = hetu_reserve
+        self.alpha_reserve = alpha_reserve
+        self.alpha_out = alpha_out
+        self.price = price
+        self.moving_price = moving_price
+        self.total_volume = total_volume
+        self.minimum_liquidity = minimum_liquidity
+        self.k = k
+        self.block = block
+
+    @classmethod
+    def from_pool_info(cls, pool_info, k, block=None):
+        return cls(*pool_info, k, block=block)
+
+    def reserves(self, hetu_to_alpha: bool):
+        """(reserve_in, reserve_out) for a swap direction."""
+        if hetu_to_alpha:
+            return self.hetu_reserve, self.alpha_reserve
+        return self.alpha_reserve, self.hetu_reserve
+
+
+def read_pool_state(amm, block=None):
+    """getPoolInfo() and getK() in one batch, pinned to one block."""
+    if block is None:
+        block = amm.web3.eth.block_number
+    fns = amm.contract.functions
+    pool_info, k = batch_call(amm.web3, [fns.getPoolInfo(), fns.getK()], block)
+    if pool_info is None or k is None:
+        raise ValueError(f"failed to read pool state of {amm.contract.address}")
+    return PoolState.from_pool_info(pool_info, k, block)
+
+
+def quote_exact(state: PoolState, amount_in: int, hetu_to_alpha: bool):
+    """
+    Integer quote with the pool's rounding. Returns the same
+    (amountOut, priceImpact bps, newPrice, isLiquiditySufficient) tuple as
+    getSwapPreview.
+    """
+    reserve_in, reserve_out = state.reserves(hetu_to_alpha)
+    if state.mechanism == MECHANISM_STABLE:
+        sufficient = reserve_out - amount_in >= state.minimum_liquidity
+        return (amount_in if sufficient else 0), 0, state.price, sufficient
+    new_in = reserve_in + amount_in
+    new_out = state.k // new_in
+    sufficient = new_out >= state.minimum_liquidity
+    if not sufficient:
+        new_out = reserve_out
+    new_hetu, new_alpha = (new_in, new_out) if hetu_to_alpha else (new_out, new_in)
+    new_price = new_hetu * PRICE_SCALE // new_alpha
+    impact = abs(new_price - state.price) * BPS // state.price if state.price else 0
+    return reserve_out - new_out, impact, new_price, sufficient
+
+
+def checked_quote(state: PoolState, amount_in: int, hetu_to_alpha: bool):
+    """
+    quote_exact for a swap that is about to be sent, raising ValueError when
+    the pool would reject it: not enough liquidity left, or (ALPHA->HETU)
+    more ALPHA than the pool has paid out, which swapAlphaForHETU cannot take
+    back even though getSwapPreview quotes it.
+    """
+    if not hetu_to_alpha and amount_in > state.alpha_out:
+        raise ValueError(
+            f"the pool can take back at most {state.alpha_out / 10**18:,.6f} ALPHA (subnetAlphaOut) "
+            f"at block {state.block}"
+        )
+    quote = quote_exact(state, amount_in, hetu_to_alpha)
+    if not quote[3]:
+        raise ValueError(f"swap would take the pool below its minimum liquidity at block {state.block}")
+    return quote
+
+
+def min_out_for_slippage(amount_out: int, max_slippage: float) -> int:
+    """Smallest acceptable output when at most max_slippage percent of a quote may be lost."""
+    if not 0 <= max_slippage < 100:
+        raise ValueError(f"max slippage must be in [0, 100), got {max_slippage}")
+    return amount_out * (BPS - round(max_slippage * 100)) // BPS
+
+
+def quote_curve(state: PoolState, amounts_in, hetu_to_alpha: bool):
+    """
+    Vectorized float64 quotes for an array of input sizes (wei). Returns a dict
+    of arrays: amount_out, price_impact (bps), new_price (1e18 scaled),
+    sufficient, average_price (HETU per ALPHA paid or received, 1e18 scaled).
+    Values agree with quote_exact to float precision.
+    """
+    x = np.asarray(amounts_in, dtype=np.float64)
+    reserve_in, reserve_out = (float(r) for r in state.reserves(hetu_to_alpha))
+    price = float(state.price)
+    if state.mechanism == MECHANISM_STABLE:
+        out = x.copy()
+    else:
+        # Same invariant as quote_exact: getK(), which need not equal the reserve product.
+        out = reserve_out - float(state.k) / (reserve_in + x)
+    sufficient = reserve_out - out >= float(state.minimum_liquidity)
+    out = np.where(sufficient, out, 0.0)
+    if state.mechanism == MECHANISM_STABLE:
+        new_price = np.full_like(x, price)
+    else:
+        new_in, new_out = reserve_in + x, reserve_out - out
+        new_hetu, new_alpha = (new_in, new_out) if hetu_to_alpha else (new_out, new_in)
+        new_price = new_hetu * PRICE_SCALE / new_alpha
+    with np.errstate(divide="ignore", invalid="ignore"):
+        impact = np.abs(new_price - price) * BPS / price if price else np.zeros_like(x)
+        hetu, alpha = (x, out) if hetu_to_alpha else (out, x)
+        average_price = np.where(alpha > 0, hetu * PRICE_SCALE / alpha, np.nan)
+    return {
+        "amount_in": x,
+        "amount_out": out,
+        "price_impact": impact,
+        "new_price": new_price,
+        "sufficient": sufficient,
+        "average_price": average_price,
+    }
+
+
+def verify_quotes(amm, state: PoolState, amounts_in, hetu_to_alpha: bool, batch_size: int = 100):
+    """
+    Compare local quotes with getSwapPreview at the snapshot block, one batch.
+    Returns [(amount_in, local tuple, on-chain tuple)] for every sample point.
+    """
+    fns = amm.contract.functions
+    amounts_in = [int(a) for a in amounts_in]
+    remote = batch_call(
+        amm.web3, [fns.getSwapPreview(a, hetu_to_alpha) for a in amounts_in], state.block, batch_size
+    )
+    return [
+        (a, quote_exact(state, a, hetu_to_alpha), tuple(r) if r is not None else None)
+        for a, r in zip(amounts_in, remote)
+    ]
@@ -0,0 +1,116 @@
+import numpy as np
+
+from hetu_pycli.src.hetu.amm_quote import BPS, MECHANISM_STABLE
+
+
+class SplitPlan:
+    """The chosen split of an order and the expected per-chunk results (amounts in wei)."""
+
+    def __init__(self, amount_in, chunks, chunk_out, impact, pool_share, outputs, feasible):
+        self.amount_in = amount_in
+        self.chunks = chunks
+        # Per chunk of the chosen plan: expected output of the last leg, each leg's
+        # price impact in bps and share of the input reserve in bps.
+        self.chunk_out = chunk_out
+        self.impact = impact
+        self.pool_share = pool_share
+        # Expected total output for every chunk count 1..max_chunks.
+        self.outputs = outputs
+        self.feasible = feasible
+
+    @property
+    def total_out(self):
+        return float(self.chunk_out.sum())
+
+    @property
+    def single_trade_out(self):
+        return float(self.outputs[0])
+
+
+def _legs(states, directions):
+    if len(states) != len(directions):
+        raise ValueError("one swap direction per pool is needed")
+    legs = []
+    for state, hetu_to_alpha in zip(states, directions):
+        reserve_in, reserve_out = (float(r) for r in state.reserves(hetu_to_alpha))
+        legs.append((state, hetu_to_alpha, reserve_in, reserve_out))
+    return legs
+
+
+def simulate_splits(states, directions, amount_in: int, max_chunks: int, resilience: float = 0.0):
+    """
+    Run the order through the pools (one leg per pool, the output of a leg
+    feeding the next, e.g. ALPHA -> HETU -> ALPHA) as n equal chunks, one per
+    block, for every n in 1..max_chunks at once. Between blocks each pool's
+    reserves move back by the fraction resilience of the way to where they
+    started, a simple model of other traders restoring the price; 0 means
+    the pool does not recover. Returns arrays indexed [n - 1, chunk(, leg)]:
+    out (last leg output per chunk), impact (bps), share (chunk input as bps
+    of the input reserve) and ok (False where a chunk would breach a pool's
+    minimum liquidity).
+    """
+    if not 0 <= resilience <= 1:
+        raise ValueError(f"resilience must be in [0, 1], got {resilience}")
+    legs = _legs(states, directions)
+    counts = np.arange(1, max_chunks + 1)
+    size = float(amount_in) / counts
+    shape = (max_chunks, max_chunks)
+    out = np.zeros(shape)
+    impact = np.zeros(shape + (len(legs),))
+    share = np.zeros(shape + (len(legs),))
+    ok = np.ones(shape, dtype=bool)
+    reserves = [(np.full(max_chunks, r_in), np.full(max_chunks, r_out)) for _, _, r_in, r_out in legs]
+    for k in range(max_chunks):
+        active = counts > k
+        x = np.where(active, size, 0.0)
+        for leg, ((state, hetu_to_alpha, r_in0, r_out0), (r_in, r_out)) in enumerate(zip(legs, reserves)):
+            if state.mechanism == MECHANISM_STABLE:
+                y = x.copy()
+                impact[:, k, leg] = 0.0
+            else:
+                # Like quote_exact: the pool pays out down to its stored k, which
+                # can differ from the product of the reserves.
+                y = r_out - float(state.k) / (r_in + x)
+                price = r_in / r_out if hetu_to_alpha else r_out / r_in
+                new_in, new_out = r_in + x, r_out - y
+                new_price = new_in / new_out if hetu_to_alpha else new_out / new_in
+                impact[:, k, leg] = np.abs(new_price - price) * BPS / price
+            share[:, k, leg] = x * BPS / r_in
+            ok[:, k] &= ~active | (r_out - y >= float(state.minimum_liquidity))
+            r_in += x
+            r_out -= y
+            r_in += (r_in0 - r_in) * resilience
+            r_out += (r_out0 - r_out) * resilience
+            x = y
+        out[:, k] = x
+    return {"out": out, "impact": impact, "share": share, "ok": ok}
+
+
+def plan_split(states, directions, amount_in: int, max_chunks: int = 20, max_impact_bps: float = 100, resilience: float = 0.0):
+    """
+    Pick the chunk count with the largest expected output among those whose
+    every chunk stays within max_impact_bps on every leg and above minimum
+    liquidity; ties go to fewer chunks. Without resilience every split yields
+    the same output in a constant-product pool, so this is the fewest chunks
+    that respect the impact cap. When no count qualifies the largest one is
+    returned with feasible=False.
+    """
+    sim = simulate_splits(states, directions, amount_in, max_chunks, resilience)
+    outputs = sim["out"].sum(axis=1)
+    worst_impact = sim["impact"].max(axis=(1, 2))
+    feasible = sim["ok"].all(axis=1) & (worst_impact <= max_impact_bps)
+    if feasible.any():
+        candidates = np.where(feasible, outputs, -np.inf)
+        best = int(np.flatnonzero(candidates >= candidates.max() * (1 - 1e-12))[0])
+    else:
+        best = max_chunks - 1
+    n = best + 1
+    return SplitPlan(
+        amount_in,
+        n,
+        sim["out"][best, :n],
+        sim["impact"][best, :n],
+        sim["share"][best, :n],
+        outputs,
+        bool(feasible[best]),
+    )
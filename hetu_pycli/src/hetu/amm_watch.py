@@ -0,0 +1,211 @@
+import asyncio
+import time
+
+from hexbytes import HexBytes
+from web3.exceptions import (
+    PersistentConnectionClosedOK,
+    PersistentConnectionError,
+    ProviderConnectionError,
+)
+
+from hetu_pycli.src.hetu.amm_quote import BPS, PRICE_SCALE
+from hetu_pycli.src.hetu.logs import event_codecs, fetch_logs
+from hetu_pycli.src.hetu.metagraph import WEI_PER_HETU
+
+WATCH_EVENTS = ["ReservesUpdated", "PriceUpdated"]
+
+
+class PoolMonitor:
+    """
+    In-memory state of many pools, seeded from fetch_pools rows and kept
+    current from raw ReservesUpdated / PriceUpdated logs. Thresholds are bps:
+    price_move against the price of the last price alert, large_trade and
+    liquidity_drop against the HETU reserve (before the trade, and at start).
+    """
+
+    def __init__(self, contract, pool_rows, price_move: int, large_trade: int, liquidity_drop: int, min_hetu_reserve: int = 0):
+        self.codecs = event_codecs(contract, WATCH_EVENTS)
+        self.price_move = price_move
+        self.large_trade = large_trade
+        self.liquidity_drop = liquidity_drop
+        self.min_hetu_reserve = min_hetu_reserve
+        self.pools = {}
+        for row in pool_rows:
+            self.pools[row["pool"]] = {
+                "netuid": row["netuid"],
+                "hetu_reserve": row["hetu_reserve"],
+                "alpha_reserve": row["alpha_reserve"],
+                "price": row["price"],
+                "reference_price": row["price"],
+                "start_hetu_reserve": row["hetu_reserve"],
+                "low": False,
+            }
+            self.pools[row["pool"]]["low"] = self._is_low(self.pools[row["pool"]])
+        # (block, log index) of the last applied log; anything at or before it is a replay.
+        self.position = None
+
+    @property
+    def topics(self):
+        return list(self.codecs)
+
+    def _is_low(self, pool):
+        floor = max(self.min_hetu_reserve, pool["start_hetu_reserve"] * (BPS - self.liquidity_drop) // BPS)
+        return pool["hetu_reserve"] < floor
+
+    def _record(self, kind, pool_address, decoded, **fields):
+        return {
+            "type": kind,
+            "netuid": self.pools[pool_address]["netuid"],
+            "pool": pool_address,
+            "block": decoded["blockNumber"],
+            "tx": decoded["transactionHash"],
+            **fields,
+        }
+
+    @property
+    def block(self):
+        return None if self.position is None else self.position[0]
+
+    def apply(self, log):
+        """
+        Update the pool a raw log belongs to. Returns (state record or None,
+        alert records); logs already applied are skipped.
+        """
+        topic = log["topics"][0] if log["topics"] else None
+        codec = self.codecs.get(topic)
+        if codec is None:
+            return None, []
+        event = codec.decode(log)
+        pool_address = event["address"]
+        pool = self.pools.get(pool_address)
+        position = (event["blockNumber"], event["logIndex"])
+        if pool is None or (self.position is not None and position <= self.position):
+            return None, []
+        self.position = position
+        args = event["args"]
+        alerts = []
+        if event["event"] == "PriceUpdated":
+            pool["price"] = price = args["currentPrice"]
+            reference = pool["reference_price"]
+            move = abs(price - reference) * BPS // reference if reference else 0
+            if move >= self.price_move:
+                alerts.append(
+                    self._record(
+                        "price_move", pool_address, event,
+                        from_price=reference / PRICE_SCALE, price=price / PRICE_SCALE, move_pct=move / 100,
+                    )
+                )
+                pool["reference_price"] = price
+        else:
+            hetu, alpha = args["subnetTAO"], args["subnetAlphaIn"]
+            d_hetu, d_alpha = hetu - pool["hetu_reserve"], alpha - pool["alpha_reserve"]
+            size = abs(d_hetu) * BPS // pool["hetu_reserve"] if pool["hetu_reserve"] else 0
+            if size >= self.large_trade:
+                # A swap moves the reserves in opposite directions, adding or removing liquidity in the same one.
+                kind = "large_trade" if d_hetu * d_alpha < 0 else "liquidity_change"
+                alerts.append(
+                    self._record(
+                        kind, pool_address, event,
+                        hetu_delta=d_hetu / WEI_PER_HETU, alpha_delta=d_alpha / WEI_PER_HETU, pool_pct=size / 100,
+                    )
+                )
+            pool["hetu_reserve"], pool["alpha_reserve"] = hetu, alpha
+            low = self._is_low(pool)
+            if low != pool["low"]:
+                pool["low"] = low
+                alerts.append(
+                    self._record(
+                        "low_liquidity" if low else "liquidity_recovered", pool_address, event,
+                        hetu_reserve=hetu / WEI_PER_HETU, start_hetu_reserve=pool["start_hetu_reserve"] / WEI_PER_HETU,
+                    )
+                )
+        state = self._record(
+            "update", pool_address, event,
+            event=event["event"],
+            price=pool["price"] / PRICE_SCALE,
+            hetu_reserve=pool["hetu_reserve"] / WEI_PER_HETU,
+            alpha_reserve=pool["alpha_reserve"] / WEI_PER_HETU,
+        )
+        return state, alerts
+
+
+def raw_log(log):
+    """A web3-formatted log (HexBytes topics, int block numbers) back in eth_getLogs JSON form."""
+    def as_hex(value):
+        return hex(value) if isinstance(value, int) else value
+
+    def as_data(value):
+        return HexBytes(value).to_0x_hex() if not isinstance(value, str) else value
+
+    return {
+        "address": log["address"],
+        "topics": [as_data(t) for t in log["topics"]],
+        "data": as_data(log["data"]),
+        "blockNumber": as_hex(log["blockNumber"]),
+        "logIndex": as_hex(log["logIndex"]),
+        "transactionHash": as_data(log["transactionHash"]),
+    }
+
+
+def poll_logs(web3, pools, topics, from_block: int, on_log, poll_interval: float = 2.0, deadline=None):
+    """
+    Follow new blocks from from_block with one eth_getLogs over every pool per
+    new block range, until deadline (time.time() value, None for ever).
+    """
+    next_block = from_block
+    while deadline is None or time.time() < deadline:
+        head = web3.eth.block_number
+        if head < next_block:
+            time.sleep(poll_interval)
+            continue
+        for log in fetch_logs(web3, pools, [topics], next_block, head, max_workers=1):
+            on_log(log)
+        next_block = head + 1
+    return next_block
+
+
+async def subscribe_logs(url: str, pools, topics, on_log, deadline=None, on_subscribed=None):
+    """
+    Push every matching log from an eth_subscribe("logs") websocket
+    subscription, until deadline. on_subscribed runs once the subscription
+    is live, e.g. to catch up on blocks mined before it.
+    """
+    from web3 import AsyncWeb3, WebSocketProvider
+
+    async with AsyncWeb3(WebSocketProvider(url, max_connection_retries=1)) as w3:
+        await w3.eth.subscribe("logs", {"address": pools, "topics": [topics]})
+        if on_subscribed:
+            on_subscribed()
+        subscriptions = w3.socket.process_subscriptions()
+        while True:
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                return
+            try:
+                payload = await asyncio.wait_for(anext(subscriptions), remaining)
+            except TimeoutError:
+                return
+            on_log(raw_log(payload["result"]))
+
+
+def watch_pools(monitor: PoolMonitor, web3, ws_url, from_block: int, on_log, poll_interval: float = 2.0, deadline=None, on_fallback=None):
+    """
+    Stream pool logs into on_log over the websocket endpoint when one is
+    given, first catching up from from_block with eth_getLogs. If the
+    subscription cannot be opened or drops, fall back to eth_getLogs polling
+    from the last block seen; the monitor skips logs it already applied.
+    """
+    pools = list(monitor.pools)
+    if ws_url:
+        def catch_up():
+            for log in fetch_logs(web3, pools, [monitor.topics], from_block, web3.eth.block_number, max_workers=1):
+                on_log(log)
+
+        try:
+            asyncio.run(subscribe_logs(ws_url, pools, monitor.topics, on_log, deadline, catch_up))
+            return
+        except (OSError, ProviderConnectionError, PersistentConnectionError, PersistentConnectionClosedOK) as e:
+            if on_fallback:
+                on_fallback(e)
+    start = from_block if monitor.block is None else monitor.block
+    poll_logs(web3, pools, monitor.topics, start, on_log, poll_interval, deadline)
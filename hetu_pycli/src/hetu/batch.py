@@ -0,0 +1,155 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from eth_abi.grammar import parse
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+from eth_utils.abi import get_abi_input_types, get_abi_output_types
+from hexbytes import HexBytes
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def _block_param(block_identifier):
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    return block_identifier or "latest"
+
+
+def _send_batch(web3, chunk, with_errors=False):
+    responses = web3.provider.make_batch_request(chunk)
+    if not isinstance(responses, list):
+        error = responses.get("error") if isinstance(responses, dict) else responses
+        raise TypeError(f"Batch request rejected by node: {error}")
+    if with_errors:
+        return [
+            (None, response["error"].get("message", str(response["error"])))
+            if "error" in response
+            else (response.get("result"), None)
+            for response in responses
+        ]
+    return [None if "error" in response else response.get("result") for response in responses]
+
+
+def batch_rpc(
+    web3,
+    requests,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 1,
+    with_errors: bool = False,
+):
+    """
+    Send (method, params) pairs as JSON-RPC batches, one HTTP round trip per
+    batch_size requests, with up to max_workers batches in flight. Returns the
+    raw results in request order; entries that came back with an error are
+    returned as None, or as (result, error message) pairs with with_errors.
+    """
+    chunks = [requests[start : start + batch_size] for start in range(0, len(requests), batch_size)]
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            chunk_results = list(pool.map(lambda chunk: _send_batch(web3, chunk, with_errors), chunks))
+    else:
+        chunk_results = [_send_batch(web3, chunk, with_errors) for chunk in chunks]
+    return [result for chunk in chunk_results for result in chunk]
+
+
+class _CallCodec:
+    """Encoder/decoder for one function ABI, reused across every call in a batch."""
+
+    def __init__(self, web3, fn_abi):
+        self.web3 = web3
+        self.selector = function_abi_to_4byte_selector(fn_abi)
+        self.input_types = get_abi_input_types(fn_abi)
+        self.output_types = get_abi_output_types(fn_abi)
+        self.parsed_outputs = [parse(t) for t in self.output_types]
+
+    def encode(self, args):
+        return "0x" + (self.selector + self.web3.codec.encode(self.input_types, args)).hex()
+
+    def decode(self, data):
+        if data is None:
+            return None
+        data = HexBytes(data)
+        if not data:
+            return None
+        decoded = self.web3.codec.decode(self.output_types, data)
+        normalized = [checksum_addresses(t, v) for t, v in zip(self.parsed_outputs, decoded)]
+        if len(normalized) == 1:
+            return normalized[0]
+        return normalized
+
+
+def checksum_addresses(abi_type, value):
+    # Same result as web3's BASE_RETURN_NORMALIZERS, without its per-value overhead.
+    if abi_type.is_array:
+        return [checksum_addresses(abi_type.item_type, v) for v in value]
+    if getattr(abi_type, "components", None):
+        return tuple(checksum_addresses(t, v) for t, v in zip(abi_type.components, value))
+    if abi_type.base == "address":
+        return to_checksum_address(value)
+    return value
+
+
+def batch_call(
+    web3,
+    calls,
+    block_identifier="latest",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 1,
+):
+    """
+    Run many bound contract functions (e.g. mgr.contract.functions.isNeuron(1, addr))
+    as batched eth_call requests pinned to one block. Results are decoded like
+    .call(); calls that revert come back as None.
+    """
+    block = _block_param(block_identifier)
+    codecs = {}
+    call_codecs = []
+    for fn in calls:
+        key = (fn.address, fn.abi_element_identifier)
+        if key not in codecs:
+            codecs[key] = _CallCodec(web3, fn.abi)
+        call_codecs.append(codecs[key])
+    requests = [
+        ("eth_call", [{"to": fn.address, "data": codec.encode(fn.args)}, block])
+        for fn, codec in zip(calls, call_codecs)
+    ]
+    raw = batch_rpc(web3, requests, batch_size, max_workers)
+    return [codec.decode(data) for codec, data in zip(call_codecs, raw)]
+
+
+def batch_estimate_gas(web3, calls, sender: str, batch_size: int = DEFAULT_BATCH_SIZE):
+    """eth_estimateGas for many bound contract functions in batches; calls that would revert map to None."""
+    codecs = {}
+    requests = []
+    for fn in calls:
+        key = (fn.address, fn.abi_element_identifier)
+        if key not in codecs:
+            codecs[key] = _CallCodec(web3, fn.abi)
+        data = codecs[key].encode(fn.args)
+        requests.append(("eth_estimateGas", [{"from": sender, "to": fn.address, "data": data}]))
+    return [None if gas is None else int(gas, 16) for gas in batch_rpc(web3, requests, batch_size)]
+
+
+def iter_chunks(items, fetch_chunk, batch_size: int = DEFAULT_BATCH_SIZE, max_workers: int = 4):
+    """
+    Lazily cut items into batch_size chunks and run fetch_chunk(chunk) on up to
+    max_workers of them at once, yielding each chunk's results in order as soon
+    as it is done. At most max_workers chunks are held at any time, so memory
+    stays flat however many items there are.
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+
+        def submit():
+            chunk = list(islice(items, batch_size))
+            if chunk:
+                pending.append(pool.submit(fetch_chunk, chunk))
+
+        for _ in range(max_workers):
+            submit()
+        while pending:
+            results = pending.popleft().result()
+            submit()
+            yield from results
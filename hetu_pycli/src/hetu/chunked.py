@@ -0,0 +1,174 @@
+import csv
+import hashlib
+import json
+import os
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+from web3 import Web3
+
+from hetu_pycli.src.hetu.batch import batch_rpc
+from hetu_pycli.src.hetu.metagraph import WEI_PER_HETU
+
+# Gas headroom over eth_estimateGas, and the item counts used to fit the gas model.
+GAS_MARGIN = 1.2
+PROBE_SIZES = (8, 32)
+
+
+def _to_wei(value, wei: bool):
+    try:
+        amount = int(Decimal(str(value))) if wei else int(Decimal(str(value)) * WEI_PER_HETU)
+    except InvalidOperation:
+        raise ValueError(f"invalid amount {value!r}")
+    if amount < 0:
+        raise ValueError(f"negative amount {value!r}")
+    return amount
+
+
+def read_accounts_file(path: str):
+    """Addresses from a text or CSV file: first column of each line, blank lines and # comments skipped."""
+    accounts = []
+    with open(path, "r") as f:
+        for line in f:
+            value = line.split(",")[0].strip()
+            if value and not value.startswith("#") and value.lower() not in ("account", "address", "hotkey", "user"):
+                accounts.append(value)
+    return accounts
+
+
+def load_account_amounts(path: str, wei: bool = False):
+    """
+    Read (accounts, amounts) from a CSV (account,amount per line), a .npz with
+    `accounts` and `amounts` arrays, or a structured .npy with `account` and
+    `amount` fields. Amounts are HETU unless wei is set; returned in wei.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npz":
+        with np.load(path, allow_pickle=False) as data:
+            accounts, amounts = data["accounts"].tolist(), data["amounts"].tolist()
+    elif ext == ".npy":
+        data = np.load(path, allow_pickle=False)
+        if not data.dtype.names or not {"account", "amount"} <= set(data.dtype.names):
+            raise ValueError(".npy input needs a structured array with account and amount fields")
+        accounts, amounts = data["account"].tolist(), data["amount"].tolist()
+    else:
+        accounts, amounts = [], []
+        with open(path, "r", newline="") as f:
+            for row in csv.reader(f):
+                if not row or not row[0].strip() or row[0].strip().startswith("#"):
+                    continue
+                if not accounts and not row[0].strip().lower().startswith("0x"):
+                    continue  # header
+                accounts.append(row[0].strip())
+                amounts.append(row[1].strip())
+    if len(accounts) != len(amounts):
+        raise ValueError("accounts and amounts have different lengths")
+    return [Web3.to_checksum_address(a) for a in accounts], [_to_wei(v, wei) for v in amounts]
+
+
+def input_digest(action: str, netuid: int, accounts, amounts):
+    payload = json.dumps([action, netuid, accounts, [str(a) for a in amounts]])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def fit_chunk_size(estimate, total: int, max_gas: int):
+    """
+    Pick how many items fit in one tx. estimate(k) returns the gas estimate for
+    the first k items; two probes give a base + per-item line, which is solved
+    for max_gas with GAS_MARGIN headroom.
+    """
+    small, large = (min(p, total) for p in PROBE_SIZES)
+    gas_small = estimate(small)
+    if large == small:
+        return total if gas_small * GAS_MARGIN <= max_gas else max(1, small // 2)
+    gas_large = estimate(large)
+    per_item = max((gas_large - gas_small) / (large - small), 1)
+    base = gas_small - per_item * small
+    size = int((max_gas / GAS_MARGIN - base) // per_item)
+    return max(1, min(size, total))
+
+
+class ChunkJob:
+    """Progress file for one chunked submission, so a rerun resumes where the last one stopped."""
+
+    def __init__(self, path: str, data: dict):
+        self.path = path
+        self.data = data
+
+    @classmethod
+    def load(cls, path: str):
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return cls(path, json.load(f))
+
+    @classmethod
+    def create(cls, path: str, action: str, netuid: int, total: int, chunk_size: int):
+        chunks = [
+            {"start": start, "end": min(start + chunk_size, total), "tx_hash": None, "nonce": None, "status": "new"}
+            for start in range(0, total, chunk_size)
+        ]
+        return cls(path, {"action": action, "netuid": netuid, "chunk_size": chunk_size, "chunks": chunks})
+
+    @property
+    def chunks(self):
+        return self.data["chunks"]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def apply_receipts(self, receipts, confirmed_nonce: int, known=()):
+        """
+        Update sent chunks from (receipt, lookup error) pairs. A chunk stays sent
+        while its lookup errored or its nonce is unused (at or above
+        confirmed_nonce). Without a receipt and with its nonce used, it goes back
+        to "new" only if the node no longer knows the hash either (not in known):
+        it was dropped or replaced. Returns the chunks put back to "new".
+        """
+        dropped = []
+        for chunk, (receipt, error) in zip(self.sent(), receipts):
+            if receipt is not None:
+                chunk["status"] = "confirmed" if int(receipt["status"], 16) == 1 else "failed"
+            elif error is None and chunk["nonce"] < confirmed_nonce and chunk["tx_hash"] not in known:
+                dropped.append(chunk)
+        for chunk in dropped:
+            chunk["status"] = "new"
+        return dropped
+
+    def sent(self):
+        return [c for c in self.chunks if c["status"] == "sent"]
+
+    def todo(self):
+        return [c for c in self.chunks if c["status"] in ("new", "failed")]
+
+
+def refresh_sent_chunks(job: ChunkJob, web3, sender: str, batch_size: int = 100):
+    """
+    Look up the receipts of a job's sent chunks and apply them. The sender's
+    confirmed nonce is read before the receipts, so a chunk mined in between
+    shows up with its receipt rather than as a used nonce without one. Hashes
+    that look dropped are checked once more with eth_getTransactionByHash.
+    Returns (chunks put back to "new", chunks whose lookup failed).
+    """
+    sent = job.sent()
+    confirmed_nonce = web3.eth.get_transaction_count(sender)
+    receipts = batch_rpc(
+        web3, [("eth_getTransactionReceipt", [c["tx_hash"]]) for c in sent], batch_size, with_errors=True
+    )
+    suspects = [
+        c["tx_hash"]
+        for c, (receipt, error) in zip(sent, receipts)
+        if receipt is None and error is None and c["nonce"] < confirmed_nonce
+    ]
+    known = set()
+    if suspects:
+        found = batch_rpc(
+            web3, [("eth_getTransactionByHash", [h]) for h in suspects], batch_size, with_errors=True
+        )
+        known = {h for h, (tx, error) in zip(suspects, found) if tx is not None or error is not None}
+    errored = [c for c, (_, error) in zip(sent, receipts) if error is not None]
+    return job.apply_receipts(receipts, confirmed_nonce, known), errored
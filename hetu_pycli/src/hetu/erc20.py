@@ -6,6 +6,7 @@ import os
 from hetu_pycli.src.hetu.wrapper.erc20 import Erc20
 from eth_account import Account
 from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path
+from hetu_pycli.src.hetu.token_cache import token_metadata
 import getpass
 
 ERC20_ABI_PATH = os.path.join(
@@ -39,7 +40,7 @@ def balance_of(
         raise typer.Exit(1)
     erc20 = load_erc20(contract, rpc)
     balance = erc20.balanceOf(account)
-    decimals = erc20.decimals()
+    decimals = token_metadata(ctx.obj, erc20.web3, contract)["decimals"]
     value = balance / (10 ** decimals)
     value_str = f"{value:,.{decimals}f}".rstrip('0').rstrip('.')
     print(f"[green]Balance: {value_str} (raw: {balance}, decimals: {decimals})")
@@ -75,7 +76,7 @@ def transfer(
         print(f"[red]Failed to decrypt keystore: {e}")
         raise typer.Exit(1)
     erc20 = load_erc20(contract, rpc)
-    decimals = erc20.decimals()
+    decimals = token_metadata(config, erc20.web3, contract)["decimals"]
     value_raw = int(value * (10 ** decimals))
     nonce = erc20.web3.eth.get_transaction_count(keystore["address"])
     tx = erc20.contract.functions.transfer(to, value_raw).build_transaction(
@@ -121,7 +122,7 @@ def approve(
         print(f"[red]Failed to decrypt keystore: {e}")
         raise typer.Exit(1)
     erc20 = load_erc20(contract, rpc)
-    decimals = erc20.decimals()
+    decimals = token_metadata(config, erc20.web3, contract)["decimals"]
     value_raw = int(value * (10 ** decimals))
     nonce = erc20.web3.eth.get_transaction_count(keystore["address"])
     tx = erc20.contract.functions.approve(spender, value_raw).build_transaction(
@@ -0,0 +1,145 @@
+from eth_abi.grammar import parse
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from hexbytes import HexBytes
+
+from hetu_pycli.src.hetu.batch import batch_rpc, checksum_addresses
+
+DEFAULT_LOG_CHUNK = 5000
+
+ERC20_TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+def uint_topic(value: int):
+    return "0x" + int(value).to_bytes(32, "big").hex()
+
+
+def address_topic(address: str):
+    return "0x" + "0" * 24 + address.lower().removeprefix("0x")
+
+
+def received_amount(receipt, token: str, account: str):
+    """Sum of ERC20 Transfer(_, account, value) logs emitted by token in a raw receipt."""
+    total = 0
+    for log in receipt.get("logs") or []:
+        topics = log["topics"]
+        if (
+            len(topics) == 3
+            and topics[0] == ERC20_TRANSFER_TOPIC
+            and log["address"].lower() == token.lower()
+            and topics[2] == address_topic(account)
+        ):
+            total += int(log["data"], 16)
+    return total
+
+
+def _event_input_type(inp):
+    if inp["type"].startswith("tuple"):
+        inner = ",".join(_event_input_type(c) for c in inp["components"])
+        return f"({inner}){inp['type'][len('tuple'):]}"
+    return inp["type"]
+
+
+class EventCodec:
+    """Decoder for one event ABI; turns raw eth_getLogs entries into plain dicts."""
+
+    def __init__(self, web3, event_abi):
+        self.web3 = web3
+        self.name = event_abi["name"]
+        self.topic = HexBytes(event_abi_to_log_topic(event_abi)).to_0x_hex()
+        self.indexed = [i for i in event_abi["inputs"] if i["indexed"]]
+        self.data_inputs = [i for i in event_abi["inputs"] if not i["indexed"]]
+        self.data_types = [_event_input_type(i) for i in self.data_inputs]
+        self.parsed_data_types = [parse(t) for t in self.data_types]
+
+    def decode(self, log):
+        args = {}
+        for inp, topic in zip(self.indexed, log["topics"][1:]):
+            value = self.web3.codec.decode([inp["type"]], HexBytes(topic))[0]
+            args[inp["name"]] = to_checksum_address(value) if inp["type"] == "address" else value
+        values = self.web3.codec.decode(self.data_types, HexBytes(log["data"]))
+        for inp, abi_type, value in zip(self.data_inputs, self.parsed_data_types, values):
+            args[inp["name"]] = checksum_addresses(abi_type, value)
+        return {
+            "event": self.name,
+            "args": args,
+            "address": to_checksum_address(log["address"]),
+            "blockNumber": int(log["blockNumber"], 16),
+            "logIndex": int(log["logIndex"], 16),
+            "transactionHash": log.get("transactionHash"),
+        }
+
+
+def event_codecs(contract, event_names):
+    """Map topic0 -> EventCodec for the named events of a contract."""
+    codecs = {}
+    for name in event_names:
+        codec = EventCodec(contract.w3, getattr(contract.events, name).abi)
+        codecs[codec.topic] = codec
+    return codecs
+
+
+def fetch_logs(
+    web3,
+    address,
+    topics,
+    from_block: int,
+    to_block: int,
+    chunk_size: int = DEFAULT_LOG_CHUNK,
+    max_workers: int = 4,
+):
+    """
+    eth_getLogs over [from_block, to_block] split into chunk_size block ranges.
+    The ranges go out as JSON-RPC batches; any range the node rejects (too many
+    results, range too wide) is halved and retried. Logs come back in chain order.
+    """
+    ranges = [
+        (start, min(start + chunk_size - 1, to_block))
+        for start in range(from_block, to_block + 1, chunk_size)
+    ]
+    logs = []
+    while ranges:
+        requests = [
+            (
+                "eth_getLogs",
+                [{"address": address, "topics": topics, "fromBlock": hex(a), "toBlock": hex(b)}],
+            )
+            for a, b in ranges
+        ]
+        results = batch_rpc(web3, requests, batch_size=20, max_workers=max_workers)
+        retry = []
+        for (a, b), result in zip(ranges, results):
+            if result is not None:
+                logs.extend(result)
+            elif a == b:
+                raise RuntimeError(f"eth_getLogs failed for block {a}")
+            else:
+                mid = (a + b) // 2
+                retry.extend([(a, mid), (mid + 1, b)])
+        ranges = retry
+    logs.sort(key=lambda log: (int(log["blockNumber"], 16), int(log["logIndex"], 16)))
+    return logs
+
+
+def fetch_events(
+    contract,
+    event_names,
+    from_block: int,
+    to_block: int,
+    extra_topics=None,
+    address=None,
+    chunk_size: int = DEFAULT_LOG_CHUNK,
+    max_workers: int = 4,
+):
+    """Fetch and decode the named events of a contract (or of several same-ABI contracts via address)."""
+    codecs = event_codecs(contract, event_names)
+    topics = [list(codecs)] + list(extra_topics or [])
+    raw = fetch_logs(
+        contract.w3,
+        address or contract.address,
+        topics,
+        from_block,
+        to_block,
+        chunk_size,
+        max_workers,
+    )
+    return [codecs[log["topics"][0]].decode(log) for log in raw if log["topics"][0] in codecs]
@@ -0,0 +1,360 @@
+import os
+
+import numpy as np
+
+from hetu_pycli.src.hetu.batch import batch_call, iter_chunks
+from hetu_pycli.src.hetu.logs import fetch_events, uint_topic
+
+# NeuronInfo struct fields in ABI order, with the dtype each column is stored as.
+# Stake is kept in HETU (float64) so it can be summed and diffed as a vector.
+NEURON_FIELDS = [
+    ("account", str),
+    ("uid", np.uint16),
+    ("netuid", np.uint16),
+    ("active", np.bool_),
+    ("validator", np.bool_),
+    ("stake", np.float64),
+    ("registration_block", np.uint64),
+    ("last_update", np.uint64),
+    ("axon_endpoint", str),
+    ("axon_port", np.uint32),
+    ("prometheus_endpoint", str),
+    ("prometheus_port", np.uint32),
+]
+
+WEI_PER_HETU = 10**18
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+NEURON_EVENTS = [
+    "NeuronRegistered",
+    "NeuronDeregistered",
+    "ServiceUpdated",
+    "StakeAllocationChanged",
+]
+
+# Columns from the metagraph_cols config that NeuronManager can fill, in display
+# order. Columns without an on-chain source (RANK, TRUST, ...) are skipped.
+METAGRAPH_COLUMNS = {
+    "UID": lambda mg: mg.uid.astype(str),
+    "HOTKEY": lambda mg: mg.account,
+    "STAKE": lambda mg: np.char.mod("%.4f", mg.stake),
+    "ACTIVE": lambda mg: mg.active.astype(str),
+    "VAL": lambda mg: mg.validator.astype(str),
+    "UPDATED": lambda mg: mg.last_update.astype(str),
+    "AXON": lambda mg: np.char.add(
+        np.char.add(mg.axon_endpoint.astype(str), ":"), mg.axon_port.astype(str)
+    ),
+}
+
+
+class Metagraph:
+    """Columnar snapshot of a subnet's neurons, one NumPy array per NeuronInfo field."""
+
+    def __init__(self, netuid: int, block: int, columns: dict):
+        self.netuid = netuid
+        self.block = block
+        self.columns = columns
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def __len__(self):
+        return len(self.columns["uid"])
+
+    @classmethod
+    def empty(cls, netuid: int, block: int):
+        return cls.from_neuron_infos(netuid, block, [])
+
+    @classmethod
+    def from_neuron_infos(cls, netuid: int, block: int, infos):
+        """Build from getNeuronInfo tuples, transposing rows into typed columns sorted by uid."""
+        rows = list(zip(*infos)) if infos else [()] * len(NEURON_FIELDS)
+        columns = {}
+        for (name, dtype), values in zip(NEURON_FIELDS, rows):
+            if name == "stake":
+                columns[name] = np.array([v / WEI_PER_HETU for v in values], dtype=np.float64)
+            elif dtype is str:
+                columns[name] = np.array(values, dtype=str)
+            else:
+                columns[name] = np.array(values, dtype=dtype)
+        order = np.argsort(columns["uid"], kind="stable")
+        return cls(netuid, block, {name: col[order] for name, col in columns.items()})
+
+    @classmethod
+    def concat(cls, netuid: int, block: int, parts):
+        columns = {name: np.concatenate([p.columns[name] for p in parts]) for name, _ in NEURON_FIELDS}
+        order = np.argsort(columns["uid"], kind="stable")
+        return cls(netuid, block, {name: col[order] for name, col in columns.items()})
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, snapshot_netuid=self.netuid, snapshot_block=self.block, **self.columns)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name, _ in NEURON_FIELDS}
+            return cls(int(data["snapshot_netuid"]), int(data["snapshot_block"]), columns)
+
+    def select(self, mask):
+        return Metagraph(self.netuid, self.block, {k: v[mask] for k, v in self.columns.items()})
+
+    def table_columns(self, metagraph_cols: dict):
+        """Return (header, values) for every enabled column that has an on-chain source."""
+        enabled = {k for k, v in (metagraph_cols or {}).items() if str(v).lower() in ("true", "1")}
+        return [(name, fn(self)) for name, fn in METAGRAPH_COLUMNS.items() if name in enabled]
+
+
+def fetch_metagraph(mgr, netuid: int, block=None, batch_size: int = 200, max_workers: int = 4):
+    """
+    Read getSubnetNeurons once, then every getNeuronInfo through batched eth_calls,
+    all pinned to the same block so the snapshot is consistent.
+    """
+    web3 = mgr.web3
+    if block is None:
+        block = web3.eth.block_number
+    accounts = mgr.contract.functions.getSubnetNeurons(netuid).call(block_identifier=block)
+    calls = [mgr.contract.functions.getNeuronInfo(netuid, account) for account in accounts]
+    infos = batch_call(web3, calls, block, batch_size, max_workers)
+    return Metagraph.from_neuron_infos(netuid, block, [info for info in infos if info is not None])
+
+
+def iter_neuron_list(
+    mgr,
+    netuid: int,
+    block=None,
+    batch_size: int = 200,
+    max_workers: int = 4,
+    with_info: bool = False,
+):
+    """
+    Walk neuronList(netuid, i) for i in [0, getSubnetNeuronCount) pinned to one
+    block, yielding (i, account) - or (i, account, neurons(netuid, account)) with
+    with_info - in index order while later batches are still in flight.
+    """
+    web3 = mgr.web3
+    fns = mgr.contract.functions
+    if block is None:
+        block = web3.eth.block_number
+    count = fns.getSubnetNeuronCount(netuid).call(block_identifier=block)
+
+    def fetch(indices):
+        accounts = batch_call(web3, [fns.neuronList(netuid, i) for i in indices], block, batch_size)
+        if not with_info:
+            return list(zip(indices, accounts))
+        known = [a for a in accounts if a is not None]
+        infos = dict(zip(known, batch_call(web3, [fns.neurons(netuid, a) for a in known], block, batch_size)))
+        return [(i, a, infos.get(a)) for i, a in zip(indices, accounts)]
+
+    yield from iter_chunks(range(count), fetch, batch_size, max_workers)
+
+
+# Bulk membership checks: CLI name -> bound call for (functions, account, netuid, validator role).
+MEMBERSHIP_CHECKS = {
+    "is-neuron": lambda fns, account, netuid, role: fns.isNeuron(netuid, account),
+    "is-validator": lambda fns, account, netuid, role: fns.isValidator(netuid, account),
+    "can-register": lambda fns, account, netuid, role: fns.canRegisterNeuron(account, netuid, role),
+}
+
+
+def membership_matrix(
+    mgr,
+    check: str,
+    accounts,
+    netuids,
+    is_validator_role: bool = False,
+    block=None,
+    batch_size: int = 200,
+    max_workers: int = 4,
+):
+    """
+    Run one MEMBERSHIP_CHECKS entry for every account x netuid through batched
+    eth_calls pinned to one block. Returns an int8 matrix of shape
+    (len(accounts), len(netuids)): 1 true, 0 false, -1 call failed.
+    """
+    fns = mgr.contract.functions
+    make_call = MEMBERSHIP_CHECKS[check]
+    if block is None:
+        block = mgr.web3.eth.block_number
+    calls = [make_call(fns, a, n, is_validator_role) for a in accounts for n in netuids]
+    results = batch_call(mgr.web3, calls, block, batch_size, max_workers)
+    flat = np.fromiter((-1 if r is None else int(r) for r in results), dtype=np.int8, count=len(results))
+    return flat.reshape(len(accounts), len(netuids))
+
+
+def apply_neuron_events(mg, events, fetch_infos, block: int):
+    """
+    Apply decoded NeuronManager events (chain order) to a snapshot and return
+    the snapshot at `block`. Service and stake changes are written straight into
+    the columns; fetch_infos(accounts) is only called for newly registered
+    neurons, whose uid the events do not carry.
+    """
+    index = {account: i for i, account in enumerate(mg.account.tolist())}
+    removed = set()
+    registered = set()
+    services = {}
+    stakes = {}
+    for event in events:
+        args = event["args"]
+        if args["netuid"] != mg.netuid:
+            continue
+        account = args["account"]
+        if event["event"] == "NeuronRegistered":
+            registered.add(account)
+            removed.discard(account)
+        elif event["event"] == "NeuronDeregistered":
+            removed.add(account)
+            registered.discard(account)
+            services.pop(account, None)
+            stakes.pop(account, None)
+        elif event["event"] == "ServiceUpdated":
+            services[account] = args
+        elif event["event"] == "StakeAllocationChanged":
+            stakes[account] = args
+
+    columns = {name: col.copy() for name, col in mg.columns.items()}
+    for account, args in services.items():
+        i = index.get(account)
+        if i is None or account in registered:
+            continue
+        columns["axon_endpoint"] = _set_str(columns["axon_endpoint"], i, args["axonEndpoint"])
+        columns["axon_port"][i] = args["axonPort"]
+        columns["prometheus_endpoint"] = _set_str(columns["prometheus_endpoint"], i, args["prometheusEndpoint"])
+        columns["prometheus_port"][i] = args["prometheusPort"]
+    stake_rows = [(index[a], args) for a, args in stakes.items() if a in index and a not in registered]
+    if stake_rows:
+        rows = np.fromiter((i for i, _ in stake_rows), dtype=np.int64, count=len(stake_rows))
+        columns["stake"][rows] = [args["newStake"] / WEI_PER_HETU for _, args in stake_rows]
+        columns["validator"][rows] = [args["isValidator"] for _, args in stake_rows]
+
+    # Re-registered accounts are replaced by fresh info below, so drop their old row too.
+    dropped = removed | registered
+    keep = np.array([a not in dropped for a in mg.account.tolist()], dtype=bool)
+    kept = Metagraph(mg.netuid, block, {name: col[keep] for name, col in columns.items()})
+    if not registered:
+        return kept
+    infos = [info for info in fetch_infos(sorted(registered)) if info is not None]
+    added = Metagraph.from_neuron_infos(mg.netuid, block, infos)
+    return Metagraph.concat(mg.netuid, block, [kept, added])
+
+
+def _set_str(column, i, value):
+    # NumPy fixed-width strings would silently truncate a longer endpoint.
+    if len(value) > column.dtype.itemsize // 4:
+        column = column.astype(f"U{len(value)}")
+    column[i] = value
+    return column
+
+
+def sync_metagraph(mgr, netuid: int, path: str, chunk_size: int = 5000, batch_size: int = 200):
+    """
+    Bring the snapshot at `path` up to the latest block by applying the
+    NeuronManager events emitted since its block, then write it back. Without a
+    snapshot, a full fetch_metagraph is done instead. Returns (metagraph, events applied).
+    """
+    head = mgr.web3.eth.block_number
+    if not os.path.exists(path):
+        mg = fetch_metagraph(mgr, netuid, block=head, batch_size=batch_size)
+        mg.save(path)
+        return mg, None
+    mg = Metagraph.load(path)
+    if mg.block >= head:
+        return mg, 0
+    events = fetch_events(
+        mgr.contract,
+        NEURON_EVENTS,
+        mg.block + 1,
+        head,
+        extra_topics=[uint_topic(netuid)],
+        chunk_size=chunk_size,
+    )
+
+    def fetch_infos(accounts):
+        calls = [mgr.contract.functions.getNeuronInfo(netuid, a) for a in accounts]
+        return batch_call(mgr.web3, calls, head, batch_size)
+
+    mg = apply_neuron_events(mg, events, fetch_infos, head)
+    mg.save(path)
+    return mg, len(events)
+
+
+class MetagraphDiff:
+    """Change set between two snapshots of the same subnet."""
+
+    def __init__(self, before, after):
+        self.from_block = before.block
+        self.to_block = after.block
+        _, ia, ib = np.intersect1d(before.account, after.account, return_indices=True)
+        # A uid change means the account was deregistered and registered again.
+        same = before.uid[ia] == after.uid[ib]
+        ia, ib = ia[same], ib[same]
+        self.registered = after.select(~np.isin(after.account, after.account[ib]))
+        self.deregistered = before.select(~np.isin(before.account, before.account[ia]))
+
+        old, new = before.select(ia), after.select(ib)
+        delta = new.stake - old.stake
+        stake_changed = (delta != 0) | (old.validator != new.validator)
+        self.stake_changes = {
+            "uid": new.uid[stake_changed],
+            "account": new.account[stake_changed],
+            "before": old.stake[stake_changed],
+            "after": new.stake[stake_changed],
+            "delta": delta[stake_changed],
+            "validator": new.validator[stake_changed],
+        }
+        endpoint_changed = np.zeros(len(new), dtype=bool)
+        for name in ("axon_endpoint", "axon_port", "prometheus_endpoint", "prometheus_port"):
+            endpoint_changed |= old.columns[name] != new.columns[name]
+        self.endpoint_before = old.select(endpoint_changed)
+        self.endpoint_after = new.select(endpoint_changed)
+
+    @property
+    def net_stake_delta(self):
+        return float(
+            self.stake_changes["delta"].sum() + self.registered.stake.sum() - self.deregistered.stake.sum()
+        )
+
+    def __len__(self):
+        return (
+            len(self.registered)
+            + len(self.deregistered)
+            + len(self.stake_changes["uid"])
+            + len(self.endpoint_after)
+        )
+
+
+def diff_metagraph(
+    mgr,
+    netuid: int,
+    from_block: int,
+    to_block: int,
+    chunk_size: int = 5000,
+    batch_size: int = 200,
+):
+    """
+    Diff a subnet between two blocks without reading every neuron twice: the
+    NeuronManager events in (from_block, to_block] name the accounts that
+    changed, and only those are read with batched getNeuronInfo at both blocks.
+    Reading state at an older block needs an archive node.
+    """
+    events = fetch_events(
+        mgr.contract,
+        NEURON_EVENTS,
+        from_block + 1,
+        to_block,
+        extra_topics=[uint_topic(netuid)],
+        chunk_size=chunk_size,
+    )
+    accounts = sorted({e["args"]["account"] for e in events if e["args"]["netuid"] == netuid})
+    snapshots = []
+    for block in (from_block, to_block):
+        calls = [mgr.contract.functions.getNeuronInfo(netuid, a) for a in accounts]
+        infos = batch_call(mgr.web3, calls, block, batch_size)
+        present = [info for info in infos if info is not None and info[0] != ZERO_ADDRESS]
+        snapshots.append(Metagraph.from_neuron_infos(netuid, block, present))
+    return MetagraphDiff(*snapshots), len(events)
@@ -1,11 +1,45 @@
 import typer
 from rich import print
+from typing import Annotated
 from web3 import Web3
 import json
+import numpy as np
 import os
 from hetu_pycli.src.hetu.wrapper.neuron_mgr import NeuronMgr
+from hetu_pycli.src.hetu.metagraph import (
+    WEI_PER_HETU,
+    MetagraphDiff,
+    diff_metagraph,
+    fetch_metagraph,
+    MEMBERSHIP_CHECKS,
+    iter_neuron_list,
+    membership_matrix,
+    sync_metagraph,
+)
+from hetu_pycli.config import get_data_path
+from rich.console import Console
+from rich.table import Table
 from eth_account import Account
-from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path
+from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path, unlock_keystores
+from hetu_pycli.src.commands.tx import (
+    broadcast_signed_txs,
+    record_pending_tx,
+    record_pending_txs,
+    wait_for_receipts,
+)
+from hetu_pycli.src.hetu.batch import batch_call, batch_estimate_gas, batch_rpc
+from hetu_pycli.src.hetu.probe import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, probe_metagraph
+from hetu_pycli.src.hetu.chunked import (
+    GAS_MARGIN,
+    ChunkJob,
+    fit_chunk_size,
+    input_digest,
+    load_account_amounts,
+    read_accounts_file,
+    refresh_sent_chunks,
+)
+from hetu_pycli.src.hetu.state_index import open_local_index
+import csv
 import getpass
 
 NEURON_ABI_PATH = os.path.join(
@@ -39,8 +73,19 @@ def get_neuron_info(
     contract: str = typer.Option(None, help="Neuron manager contract address"),
     netuid: int = typer.Option(..., help="Subnet netuid"),
     account: str = typer.Option(..., help="Neuron account address"),
+    local: bool = typer.Option(False, help="Read from the local index (see `hetucli index sync`)"),
 ):
     """Query neuron info by netuid and account"""
+    if local:
+        index = open_local_index(ctx)
+        info, block = index.neuron_info(netuid, Web3.to_checksum_address(account)), index.block
+        index.close()
+        if info is None:
+            print(f"[red]Neuron {account} not found in subnet {netuid} in local index (block {block})")
+            raise typer.Exit(1)
+        print(f"[green]Neuron Info: {info}")
+        print(f"[yellow]From local index, current to block {block}")
+        return
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
     contract = get_contract_address(ctx, "neuron_address", contract)
     if not rpc:
@@ -141,6 +186,115 @@ def is_validator(
     mgr = load_neuron_mgr(contract, rpc)
     print(f"[green]Is Validator: {mgr.isValidator(netuid, account)}")
 
+@neuron_app.command()
+def check_bulk(
+    ctx: typer.Context,
+    check: Annotated[list[str], typer.Option(help=f"Check to run, repeatable: {', '.join(MEMBERSHIP_CHECKS)}")],
+    contract: str = typer.Option(None, help="Neuron manager contract address"),
+    netuids: str = typer.Option(..., help="Comma separated netuids, e.g. 1,2,3"),
+    accounts_file: str = typer.Option(None, help="File with one account per line (or CSV, first column)"),
+    accounts: str = typer.Option(None, help="Comma separated account addresses"),
+    is_validator_role: bool = typer.Option(False, help="Validator role for can-register"),
+    output_format: str = typer.Option("csv", "--format", help="csv or bitmap"),
+    output: str = typer.Option(None, help="Write the matrix to this file instead of stdout"),
+    block: int = typer.Option(None, help="Block number to read at (default latest)"),
+    batch_size: int = typer.Option(200, help="eth_call requests per JSON-RPC batch"),
+):
+    """Run is-neuron / is-validator / can-register for many accounts x netuids in batched calls"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    contract = get_contract_address(ctx, "neuron_address", contract)
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    unknown = [c for c in check if c not in MEMBERSHIP_CHECKS]
+    if unknown or output_format not in ("csv", "bitmap"):
+        print(f"[red]Unknown check or format: {unknown or output_format}")
+        raise typer.Exit(1)
+    raw_accounts = read_accounts_file(accounts_file) if accounts_file else []
+    raw_accounts += [a.strip() for a in (accounts or "").split(",") if a.strip()]
+    if not raw_accounts:
+        print("[red]No accounts given, use --accounts-file or --accounts.")
+        raise typer.Exit(1)
+    try:
+        account_list = [Web3.to_checksum_address(a) for a in raw_accounts]
+        netuid_list = [int(n) for n in netuids.split(",") if n.strip()]
+    except ValueError as e:
+        print(f"[red]Invalid input: {e}")
+        raise typer.Exit(1)
+    mgr = load_neuron_mgr(contract, rpc)
+    if block is None:
+        block = mgr.web3.eth.block_number
+    matrix = np.concatenate(
+        [
+            membership_matrix(mgr, c, account_list, netuid_list, is_validator_role, block, batch_size)
+            for c in check
+        ],
+        axis=1,
+    )
+    headers = [f"{c}:{n}" for c in check for n in netuid_list]
+    if output_format == "csv":
+        symbols = np.array(["", "0", "1"])
+        lines = [",".join(["account"] + headers)]
+        lines += [",".join([a, *symbols[row + 1]]) for a, row in zip(account_list, matrix)]
+    else:
+        symbols = np.array(["?", "0", "1"])
+        lines = ["# " + " ".join(headers)]
+        lines += [f"{a} {''.join(symbols[row + 1])}" for a, row in zip(account_list, matrix)]
+    text = "\n".join(lines) + "\n"
+    if output:
+        with open(output, "w") as f:
+            f.write(text)
+    else:
+        typer.echo(text, nl=False)
+    failed = int((matrix < 0).sum())
+    Console(stderr=True).print(
+        f"[green]{matrix.size} checks for {len(account_list)} accounts at block {block}, "
+        f"{int((matrix > 0).sum())} true, {failed} failed"
+    )
+
+def _format_probe(result):
+    if result is None:
+        return "-", ""
+    alive, latency, detail = result
+    if alive:
+        return f"[green]up[/green] {detail}", f"{latency:.1f}"
+    return f"[red]down[/red] {detail}", "" if latency is None else f"{latency:.1f}"
+
+
+@neuron_app.command()
+def probe(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Neuron manager contract address"),
+    netuid: int = typer.Option(..., help="Subnet netuid"),
+    timeout: float = typer.Option(DEFAULT_TIMEOUT, help="Seconds allowed per endpoint"),
+    concurrency: int = typer.Option(DEFAULT_CONCURRENCY, help="Connections open at once"),
+    metrics_path: str = typer.Option("/metrics", help="HTTP path probed on prometheus endpoints"),
+    only_down: bool = typer.Option(False, help="Only list neurons with an unreachable endpoint"),
+    batch_size: int = typer.Option(200, help="getNeuronInfo calls per JSON-RPC batch"),
+):
+    """Probe every neuron's axon and prometheus endpoint and report liveness and latency"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    contract = get_contract_address(ctx, "neuron_address", contract)
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    mgr = load_neuron_mgr(contract, rpc)
+    mg = fetch_metagraph(mgr, netuid, batch_size=batch_size)
+    print(f"[yellow]Probing {len(mg)} neurons in subnet {netuid} at block {mg.block}...")
+    results = probe_metagraph(mg, timeout, concurrency, metrics_path)
+    table = Table(title=f"Endpoint probe netuid {netuid}")
+    for header in ("UID", "HOTKEY", "AXON", "AXON MS", "PROMETHEUS", "PROM MS"):
+        table.add_column(header)
+    counts = {"axon": 0, "prometheus": 0}
+    for i, (axon, prom) in enumerate(results):
+        counts["axon"] += bool(axon and axon[0])
+        counts["prometheus"] += bool(prom and prom[0])
+        if only_down and (axon is None or axon[0]) and (prom is None or prom[0]):
+            continue
+        table.add_row(str(mg.uid[i]), str(mg.account[i]), *_format_probe(axon), *_format_probe(prom))
+    Console().print(table)
+    print(f"[green]Axon up: {counts['axon']}/{len(mg)}, prometheus up: {counts['prometheus']}/{len(mg)}")
+
 @neuron_app.command()
 def neuron_list(
     ctx: typer.Context,
@@ -157,6 +311,39 @@ def neuron_list(
     mgr = load_neuron_mgr(contract, rpc)
     print(f"[green]neuronList: {mgr.neuronList(netuid, idx)}")
 
+@neuron_app.command()
+def neuron_list_all(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Neuron manager contract address"),
+    netuid: int = typer.Option(..., help="Subnet netuid"),
+    block: int = typer.Option(None, help="Block number to read at (default latest)"),
+    info: bool = typer.Option(False, help="Also read neurons(netuid, account) for every entry"),
+    batch_size: int = typer.Option(200, help="Calls per JSON-RPC batch"),
+    workers: int = typer.Option(4, help="Batches in flight at once"),
+):
+    """Stream neuronList(netuid, i) for every index up to getSubnetNeuronCount"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    contract = get_contract_address(ctx, "neuron_address", contract)
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    mgr = load_neuron_mgr(contract, rpc)
+    total = 0
+    for entry in iter_neuron_list(mgr, netuid, block, batch_size, workers, with_info=info):
+        total += 1
+        if not info:
+            typer.echo(f"{entry[0]}\t{entry[1]}")
+            continue
+        i, account, neuron = entry
+        if neuron is None:
+            typer.echo(f"{i}\t{account}\tneurons() call failed")
+            continue
+        typer.echo(
+            f"{i}\t{account}\tuid={neuron[1]}\tstake={neuron[5] / WEI_PER_HETU:.4f}"
+            f"\tactive={neuron[3]}\tvalidator={neuron[4]}\taxon={neuron[8]}:{neuron[9]}"
+        )
+    print(f"[green]{total} neurons in subnet {netuid}")
+
 @neuron_app.command()
 def neurons(
     ctx: typer.Context,
@@ -190,6 +377,119 @@ def can_register_neuron(
     mgr = load_neuron_mgr(contract, rpc)
     print(f"[green]Can Register Neuron: {mgr.canRegisterNeuron(user, netuid, is_validator_role)}")
 
+@neuron_app.command()
+def metagraph(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Neuron manager contract address"),
+    netuid: int = typer.Option(..., help="Subnet netuid"),
+    block: int = typer.Option(None, help="Block number to read at (default latest)"),
+    batch_size: int = typer.Option(200, help="getNeuronInfo calls per JSON-RPC batch"),
+    sync: bool = typer.Option(False, help="Update the local snapshot from NeuronManager events instead of refetching every neuron"),
+    log_chunk_size: int = typer.Option(5000, help="Blocks per eth_getLogs request when syncing"),
+):
+    """Show the subnet metagraph using the metagraph_cols config"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    contract = get_contract_address(ctx, "neuron_address", contract)
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    if sync and (block is not None or ctx.obj.get("no_cache")):
+        print("[red]--sync updates the cached snapshot at the latest block; drop --block or --no-cache.")
+        raise typer.Exit(1)
+    mgr = load_neuron_mgr(contract, rpc)
+    if sync:
+        path = get_data_path(ctx.obj, "metagraph", f"{contract.lower()}_{netuid}.npz")
+        mg, applied = sync_metagraph(mgr, netuid, path, chunk_size=log_chunk_size, batch_size=batch_size)
+        if applied is None:
+            print(f"[yellow]No snapshot found, fetched full metagraph into {path}")
+        else:
+            print(f"[yellow]Applied {applied} events to snapshot {path}")
+    else:
+        mg = fetch_metagraph(mgr, netuid, block=block, batch_size=batch_size)
+    columns = mg.table_columns(ctx.obj.get("metagraph_cols"))
+    table = Table(title=f"Metagraph netuid {netuid} @ block {mg.block} ({len(mg)} neurons)")
+    for header, _ in columns:
+        table.add_column(header)
+    for row in zip(*(values for _, values in columns)):
+        table.add_row(*row)
+    Console().print(table)
+    print(f"[green]Total stake: {mg.stake.sum():,.4f}, validators: {int(mg.validator.sum())}, active: {int(mg.active.sum())}")
+
+@neuron_app.command()
+def metagraph_diff(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Neuron manager contract address"),
+    netuid: int = typer.Option(..., help="Subnet netuid"),
+    from_block: int = typer.Option(..., help="Block to diff from"),
+    to_block: int = typer.Option(None, help="Block to diff to (default latest)"),
+    full: bool = typer.Option(False, help="Read every neuron at both blocks instead of only those named in events"),
+    batch_size: int = typer.Option(200, help="getNeuronInfo calls per JSON-RPC batch"),
+    log_chunk_size: int = typer.Option(5000, help="Blocks per eth_getLogs request"),
+):
+    """Show registrations, deregistrations, stake and endpoint changes between two blocks"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    contract = get_contract_address(ctx, "neuron_address", contract)
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    mgr = load_neuron_mgr(contract, rpc)
+    if to_block is None:
+        to_block = mgr.web3.eth.block_number
+    if from_block >= to_block:
+        print("[red]--from-block must be lower than --to-block.")
+        raise typer.Exit(1)
+    if full:
+        diff = MetagraphDiff(
+            fetch_metagraph(mgr, netuid, block=from_block, batch_size=batch_size),
+            fetch_metagraph(mgr, netuid, block=to_block, batch_size=batch_size),
+        )
+    else:
+        diff, events = diff_metagraph(
+            mgr, netuid, from_block, to_block, chunk_size=log_chunk_size, batch_size=batch_size
+        )
+        print(f"[yellow]{events} NeuronManager events between blocks {from_block} and {to_block}")
+    console = Console()
+    for title, mg in (("Registered", diff.registered), ("Deregistered", diff.deregistered)):
+        if len(mg):
+            table = Table(title=f"{title} ({len(mg)})")
+            for header in ("UID", "HOTKEY", "STAKE", "VAL"):
+                table.add_column(header)
+            for row in zip(mg.uid.astype(str), mg.account, np.char.mod("%.4f", mg.stake), mg.validator.astype(str)):
+                table.add_row(*row)
+            console.print(table)
+    changes = diff.stake_changes
+    if len(changes["uid"]):
+        table = Table(title=f"Stake changes ({len(changes['uid'])})")
+        for header in ("UID", "HOTKEY", "BEFORE", "AFTER", "DELTA", "VAL"):
+            table.add_column(header)
+        for row in zip(
+            changes["uid"].astype(str),
+            changes["account"],
+            np.char.mod("%.4f", changes["before"]),
+            np.char.mod("%.4f", changes["after"]),
+            np.char.mod("%+.4f", changes["delta"]),
+            changes["validator"].astype(str),
+        ):
+            table.add_row(*row)
+        console.print(table)
+    if len(diff.endpoint_after):
+        old, new = diff.endpoint_before, diff.endpoint_after
+        table = Table(title=f"Endpoint changes ({len(new)})")
+        for header in ("UID", "HOTKEY", "AXON", "PROMETHEUS"):
+            table.add_column(header)
+        for i in range(len(new)):
+            table.add_row(
+                str(new.uid[i]),
+                new.account[i],
+                f"{old.axon_endpoint[i]}:{old.axon_port[i]} -> {new.axon_endpoint[i]}:{new.axon_port[i]}",
+                f"{old.prometheus_endpoint[i]}:{old.prometheus_port[i]} -> {new.prometheus_endpoint[i]}:{new.prometheus_port[i]}",
+            )
+        console.print(table)
+    if not len(diff):
+        print(f"[green]No changes in subnet {netuid} between blocks {from_block} and {to_block}")
+        return
+    print(f"[green]Net stake change: {diff.net_stake_delta:+,.4f} HETU")
+
 @neuron_app.command(
     name="regist"
 )
@@ -205,6 +505,7 @@ def register_neuron(
     axon_port: int = typer.Option(..., help="Axon port (uint32)"),
     prometheus_endpoint: str = typer.Option(..., help="Prometheus endpoint"),
     prometheus_port: int = typer.Option(..., help="Prometheus port (uint32)"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Register a neuron (write tx)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -238,6 +539,9 @@ def register_neuron(
     signed = mgr.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = mgr.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted register neuron tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "register neuron", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = mgr.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -245,6 +549,379 @@ def register_neuron(
     else:
         print(f"[red]Register neuron failed in block {receipt.blockNumber}, receipt {receipt}")
 
+def _parse_bool(value):
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def read_registration_rows(path: str, defaults: dict):
+    """
+    Rows of a regist-batch CSV. Each row needs a hotkey column (wallet name or
+    address); netuid, is_validator, axon_endpoint, axon_port, prometheus_endpoint
+    and prometheus_port columns override the CLI defaults. Keystore passwords
+    are never read from the file.
+    """
+    rows = []
+    with open(path, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        if "password" in (name.strip() for name in reader.fieldnames or []):
+            raise ValueError("remove the password column; keystore passwords are prompted for")
+        for line, record in enumerate(reader, start=2):
+            record = {k.strip(): (v or "").strip() for k, v in record.items() if k}
+            merged = {**defaults, **{k: v for k, v in record.items() if v != ""}}
+            missing = [k for k in ("hotkey", "netuid", "axon_endpoint", "axon_port", "prometheus_endpoint", "prometheus_port") if merged.get(k) in (None, "")]
+            if missing:
+                raise ValueError(f"line {line}: missing {', '.join(missing)}")
+            rows.append(
+                {
+                    "hotkey": merged["hotkey"],
+                    "netuid": int(merged["netuid"]),
+                    "is_validator": _parse_bool(merged.get("is_validator", False)),
+                    "axon_endpoint": merged["axon_endpoint"],
+                    "axon_port": int(merged["axon_port"]),
+                    "prometheus_endpoint": merged["prometheus_endpoint"],
+                    "prometheus_port": int(merged["prometheus_port"]),
+                }
+            )
+    return rows
+
+
+@neuron_app.command(
+    name="regist-batch"
+)
+def register_neuron_batch(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Neuron manager contract address"),
+    file: str = typer.Option(..., help="CSV with a hotkey column and optional per-row registration fields"),
+    wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
+    password: str = typer.Option(None, hide_input=True, help="Keystore password shared by the hotkeys (prompt if not set)"),
+    netuid: int = typer.Option(None, help="Default subnet netuid"),
+    is_validator_role: bool = typer.Option(False, help="Default validator role"),
+    axon_endpoint: str = typer.Option(None, help="Default axon endpoint"),
+    axon_port: int = typer.Option(None, help="Default axon port"),
+    prometheus_endpoint: str = typer.Option(None, help="Default prometheus endpoint"),
+    prometheus_port: int = typer.Option(None, help="Default prometheus port"),
+    workers: int = typer.Option(None, help="Processes used to unlock keystores (default CPU count)"),
+    batch_size: int = typer.Option(100, help="Requests per JSON-RPC batch"),
+    dry_run: bool = typer.Option(False, help="Only run the eligibility check"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipts later with `hetucli tx status`"),
+):
+    """Register many neurons: batched eligibility check, parallel unlock, per-account nonces"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    contract = get_contract_address(ctx, "neuron_address", contract)
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    config = ctx.obj
+    wallet_path = wallet_path or get_wallet_path(config)
+    defaults = {
+        "netuid": netuid,
+        "is_validator": is_validator_role,
+        "axon_endpoint": axon_endpoint,
+        "axon_port": axon_port,
+        "prometheus_endpoint": prometheus_endpoint,
+        "prometheus_port": prometheus_port,
+    }
+    try:
+        rows = read_registration_rows(file, {k: v for k, v in defaults.items() if v is not None})
+    except (OSError, ValueError) as e:
+        print(f"[red]Failed to read {file}: {e}")
+        raise typer.Exit(1)
+    if not rows:
+        print(f"[yellow]No rows in {file}.")
+        return
+    keystores = {row["hotkey"]: load_keystore(row["hotkey"], wallet_path) for row in rows}
+    for row in rows:
+        row["address"] = Web3.to_checksum_address(keystores[row["hotkey"]]["address"])
+
+    mgr = load_neuron_mgr(contract, rpc)
+    fns = mgr.contract.functions
+    eligible = batch_call(
+        mgr.web3,
+        [fns.canRegisterNeuron(r["address"], r["netuid"], r["is_validator"]) for r in rows],
+        "latest",
+        batch_size,
+    )
+    for row, ok in zip(rows, eligible):
+        if not ok:
+            print(f"[red]Skipping {row['hotkey']} ({row['address']}) on netuid {row['netuid']}: cannot register")
+    rows = [row for row, ok in zip(rows, eligible) if ok]
+    print(f"[green]{len(rows)} registrations eligible")
+    if dry_run or not rows:
+        return
+
+    hotkeys = list(dict.fromkeys(row["hotkey"] for row in rows))
+    if not password:
+        password = getpass.getpass("Keystore password: ")
+    print(f"[yellow]Unlocking {len(hotkeys)} keystores...")
+    unlocked = unlock_keystores([keystores[h] for h in hotkeys], [password] * len(hotkeys), workers)
+    private_keys = {hotkey: key for hotkey, (key, error) in zip(hotkeys, unlocked) if not error}
+    # Keystores with a password of their own get one prompt each.
+    locked = [h for h in hotkeys if h not in private_keys]
+    if locked:
+        passwords = [getpass.getpass(f"Keystore password for {h}: ") for h in locked]
+        for hotkey, (key, error) in zip(locked, unlock_keystores([keystores[h] for h in locked], passwords, workers)):
+            if error:
+                print(f"[red]Failed to decrypt keystore {hotkey}: {error}")
+            else:
+                private_keys[hotkey] = key
+    rows = [row for row in rows if row["hotkey"] in private_keys]
+    if not rows:
+        raise typer.Exit(1)
+
+    addresses = list(dict.fromkeys(row["address"] for row in rows))
+    nonces = batch_rpc(
+        mgr.web3, [("eth_getTransactionCount", [a, "pending"]) for a in addresses], batch_size
+    )
+    if None in nonces:
+        print("[red]Failed to fetch account nonces.")
+        raise typer.Exit(1)
+    next_nonce = {a: int(n, 16) for a, n in zip(addresses, nonces)}
+    gas_price = mgr.web3.eth.gas_price
+    chain_id = mgr.web3.eth.chain_id
+    signed = []
+    for row in rows:
+        tx = fns.registerNeuron(
+            row["netuid"],
+            row["is_validator"],
+            row["axon_endpoint"],
+            row["axon_port"],
+            row["prometheus_endpoint"],
+            row["prometheus_port"],
+        ).build_transaction(
+            {
+                "from": row["address"],
+                "nonce": next_nonce[row["address"]],
+                "gas": 500000,
+                "gasPrice": gas_price,
+                "chainId": chain_id,
+            }
+        )
+        next_nonce[row["address"]] += 1
+        raw = mgr.web3.eth.account.sign_transaction(tx, private_keys[row["hotkey"]]).raw_transaction
+        signed.append((row["address"], raw))
+
+    results = broadcast_signed_txs(mgr.web3, signed, batch_size)
+    sent = []
+    for row, (tx_hash, error) in zip(rows, results):
+        if error:
+            print(f"[red]{row['hotkey']} netuid {row['netuid']}: {error}")
+            continue
+        print(f"[green]Broadcasted register neuron {row['hotkey']} netuid {row['netuid']} tx hash: {tx_hash}")
+        sent.append((row, tx_hash))
+    if not sent:
+        raise typer.Exit(1)
+    if no_wait:
+        record_pending_txs(
+            config, [(h, f"register neuron netuid {r['netuid']}", r["address"]) for r, h in sent]
+        )
+        return
+    print(f"[yellow]Waiting for {len(sent)} transaction receipts...")
+    receipts = wait_for_receipts(mgr.web3, [tx_hash for _, tx_hash in sent], batch_size=batch_size, with_errors=True)
+    succeeded = 0
+    unmined = []
+    for (row, tx_hash), (receipt, error) in zip(sent, receipts):
+        if receipt is None:
+            if error:
+                print(f"[red]{row['hotkey']} netuid {row['netuid']}: receipt lookup failed ({tx_hash}): {error}")
+            else:
+                print(f"[yellow]{row['hotkey']} netuid {row['netuid']}: still pending ({tx_hash})")
+            unmined.append((tx_hash, f"register neuron netuid {row['netuid']}", row["address"]))
+        elif int(receipt["status"], 16) == 1:
+            succeeded += 1
+        else:
+            print(f"[red]{row['hotkey']} netuid {row['netuid']}: failed in block {int(receipt['blockNumber'], 16)}")
+    if unmined:
+        record_pending_txs(config, unmined)
+    print(f"[green]{succeeded}/{len(rows)} registrations succeeded")
+
+
+def report_refreshed_chunks(dropped, errored):
+    """Print what refresh_sent_chunks found: chunks to resend and chunks that could not be looked up."""
+    for chunk in dropped:
+        print(
+            f"[yellow]Warning: chunk {chunk['start']}-{chunk['end'] - 1} ({chunk['tx_hash']}) is unknown to the node "
+            "although its nonce is used; treating it as dropped and sending it again."
+        )
+    for chunk in errored:
+        print(f"[red]Receipt lookup failed for chunk {chunk['start']}-{chunk['end'] - 1} ({chunk['tx_hash']}); kept as sent.")
+
+
+def submit_account_amounts(
+    ctx,
+    contract,
+    fn_name: str,
+    label: str,
+    netuid: int,
+    file: str,
+    wei: bool,
+    sender: str,
+    wallet_path,
+    password,
+    chunk_size,
+    max_gas,
+    batch_size: int,
+    no_wait: bool,
+):
+    """
+    Send fn_name(netuid, accounts, amounts) for a large input in chunks sized
+    from gas estimates, pipelined with consecutive nonces. Progress is kept in
+    a job file under data_path, so running the same command again resumes after
+    the last confirmed chunk and a completed job is never sent twice.
+    """
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    contract = get_contract_address(ctx, "neuron_address", contract)
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    try:
+        accounts, amounts = load_account_amounts(file, wei)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"[red]Failed to read {file}: {e}")
+        raise typer.Exit(1)
+    if not accounts:
+        print(f"[yellow]No entries in {file}.")
+        return
+    config = ctx.obj
+    wallet_path = wallet_path or get_wallet_path(config)
+    keystore = load_keystore(sender, wallet_path)
+    from_address = Web3.to_checksum_address(keystore["address"])
+    mgr = load_neuron_mgr(contract, rpc)
+    web3 = mgr.web3
+    fn = getattr(mgr.contract.functions, fn_name)
+
+    digest = input_digest(fn_name, netuid, accounts, amounts)
+    path = get_data_path(config, "jobs", f"{fn_name}_{netuid}_{digest[:16]}.json")
+    job = ChunkJob.load(path)
+    if job is None:
+        if not chunk_size:
+            max_gas = max_gas or web3.eth.get_block("latest")["gasLimit"] // 2
+            try:
+                chunk_size = fit_chunk_size(
+                    lambda k: fn(netuid, accounts[:k], amounts[:k]).estimate_gas({"from": from_address}),
+                    len(accounts),
+                    max_gas,
+                )
+            except Exception as e:
+                print(f"[red]Gas estimation failed: {e}")
+                raise typer.Exit(1)
+        job = ChunkJob.create(path, fn_name, netuid, len(accounts), chunk_size)
+        job.save()
+        print(f"[yellow]{len(accounts)} entries in {len(job.chunks)} chunks of up to {chunk_size}, progress in {path}")
+    else:
+        print(f"[yellow]Resuming {label} from {path}")
+
+    if job.sent():
+        report_refreshed_chunks(*refresh_sent_chunks(job, web3, from_address, batch_size))
+        job.save()
+    if job.sent():
+        print(f"[yellow]{len(job.sent())} chunks are still pending. Run the command again once they are mined.")
+        return
+    todo = job.todo()
+    if not todo:
+        print(f"[green]All {len(job.chunks)} {label} chunks are confirmed.")
+        return
+
+    calls = [fn(netuid, accounts[c["start"] : c["end"]], amounts[c["start"] : c["end"]]) for c in todo]
+    estimates = batch_estimate_gas(web3, calls, from_address, batch_size)
+    if None in estimates:
+        bad = estimates.index(None)
+        print(
+            f"[red]Chunk with entries {todo[bad]['start']}-{todo[bad]['end'] - 1} would revert; "
+            "it and later chunks are not sent this run."
+        )
+        todo, calls, estimates = todo[:bad], calls[:bad], estimates[:bad]
+        if not todo:
+            raise typer.Exit(1)
+
+    if not password:
+        password = getpass.getpass("Keystore password: ")
+    try:
+        private_key = Account.decrypt(keystore, password)
+    except Exception as e:
+        print(f"[red]Failed to decrypt keystore: {e}")
+        raise typer.Exit(1)
+    nonce = web3.eth.get_transaction_count(from_address, "pending")
+    gas_price = web3.eth.gas_price
+    chain_id = web3.eth.chain_id
+    signed = []
+    for i, (chunk, call, gas) in enumerate(zip(todo, calls, estimates)):
+        chunk["nonce"] = nonce + i
+        tx = call.build_transaction(
+            {
+                "from": from_address,
+                "nonce": chunk["nonce"],
+                "gas": int(gas * GAS_MARGIN),
+                "gasPrice": gas_price,
+                "chainId": chain_id,
+            }
+        )
+        signed.append((from_address, web3.eth.account.sign_transaction(tx, private_key).raw_transaction))
+    for chunk, (tx_hash, error) in zip(todo, broadcast_signed_txs(web3, signed, batch_size)):
+        if error:
+            chunk["nonce"] = None
+            print(f"[red]Chunk {chunk['start']}-{chunk['end'] - 1} not sent: {error}")
+            continue
+        chunk["tx_hash"] = tx_hash
+        chunk["status"] = "sent"
+        print(f"[green]Broadcasted {label} entries {chunk['start']}-{chunk['end'] - 1} tx hash: {tx_hash}")
+    job.save()
+    if no_wait:
+        print("[yellow]Not waiting for receipts. Run the same command again to check and resume.")
+        return
+
+    print(f"[yellow]Waiting for {len(job.sent())} transaction receipts...")
+    wait_for_receipts(web3, [c["tx_hash"] for c in job.sent()], batch_size=batch_size)
+    report_refreshed_chunks(*refresh_sent_chunks(job, web3, from_address, batch_size))
+    job.save()
+    confirmed = sum(c["status"] == "confirmed" for c in job.chunks)
+    print(f"[green]{confirmed}/{len(job.chunks)} {label} chunks confirmed")
+    if confirmed < len(job.chunks):
+        print("[yellow]Run the same command again to resume from the unconfirmed chunks.")
+
+
+@neuron_app.command()
+def batch_update_stake_allocations(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Neuron manager contract address"),
+    sender: str = typer.Option(..., help="Sender address (must match keystore address or wallet name)"),
+    wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
+    password: str = typer.Option(None, hide_input=True, help="Keystore password"),
+    netuid: int = typer.Option(..., help="Subnet netuid"),
+    file: str = typer.Option(..., help="CSV (account,stake), .npz (accounts, amounts) or structured .npy (account, amount)"),
+    wei: bool = typer.Option(False, help="Amounts in the file are wei instead of HETU"),
+    chunk_size: int = typer.Option(None, help="Accounts per tx (default: fitted from gas estimates)"),
+    max_gas: int = typer.Option(None, help="Gas budget per tx (default: half the block gas limit)"),
+    batch_size: int = typer.Option(100, help="Requests per JSON-RPC batch"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; run again to check and resume"),
+):
+    """Set stake allocations for many neurons via chunked batchUpdateStakeAllocations (write tx)"""
+    submit_account_amounts(
+        ctx, contract, "batchUpdateStakeAllocations", "stake allocation", netuid, file, wei,
+        sender, wallet_path, password, chunk_size, max_gas, batch_size, no_wait,
+    )
+
+
+@neuron_app.command()
+def distribute_rewards(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Neuron manager contract address"),
+    sender: str = typer.Option(..., help="Sender address (must match keystore address or wallet name)"),
+    wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
+    password: str = typer.Option(None, hide_input=True, help="Keystore password"),
+    netuid: int = typer.Option(..., help="Subnet netuid"),
+    file: str = typer.Option(..., help="CSV (account,amount), .npz (accounts, amounts) or structured .npy (account, amount)"),
+    wei: bool = typer.Option(False, help="Amounts in the file are wei instead of HETU"),
+    chunk_size: int = typer.Option(None, help="Accounts per tx (default: fitted from gas estimates)"),
+    max_gas: int = typer.Option(None, help="Gas budget per tx (default: half the block gas limit)"),
+    batch_size: int = typer.Option(100, help="Requests per JSON-RPC batch"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; run again to check and resume"),
+):
+    """Distribute rewards to many neurons via chunked distributeRewards (write tx)"""
+    submit_account_amounts(
+        ctx, contract, "distributeRewards", "reward distribution", netuid, file, wei,
+        sender, wallet_path, password, chunk_size, max_gas, batch_size, no_wait,
+    )
+
 @neuron_app.command()
 def deregister_neuron(
     ctx: typer.Context,
@@ -253,6 +930,7 @@ def deregister_neuron(
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     netuid: int = typer.Option(..., help="Subnet netuid to deregister from"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Deregister a neuron (write tx)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -284,6 +962,9 @@ def deregister_neuron(
     signed = mgr.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = mgr.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted deregister neuron tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "deregister neuron", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = mgr.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
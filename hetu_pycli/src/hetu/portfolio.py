@@ -0,0 +1,50 @@
+from hetu_pycli.src.hetu.batch import batch_call
+
+# Per-subnet figures in the order their calls are queued for each netuid.
+SUBNET_FIELDS = ("available", "effective", "locked", "allocation")
+
+
+def list_netuids(subnet_mgr, block="latest"):
+    """Every netuid handed out so far (0 .. getNextNetuid - 1)."""
+    return list(range(subnet_mgr.contract.functions.getNextNetuid().call(block_identifier=block)))
+
+
+def fetch_portfolio(staking, user: str, netuids, block=None, batch_size: int = 1000):
+    """
+    Read getStakeInfo, getUserStakeInfo and, for every netuid, the available,
+    effective and locked stake plus getSubnetAllocation in one JSON-RPC batch
+    pinned to one block. Amounts stay in wei.
+    """
+    web3 = staking.web3
+    fns = staking.contract.functions
+    if block is None:
+        block = web3.eth.block_number
+    calls = [fns.getStakeInfo(user), fns.getUserStakeInfo(user)]
+    for netuid in netuids:
+        calls += [
+            fns.getAvailableStake(user, netuid),
+            fns.getEffectiveStake(user, netuid),
+            fns.getLockedStake(user, netuid),
+            fns.getSubnetAllocation(user, netuid),
+        ]
+    results = batch_call(web3, calls, block, batch_size)
+    subnets = []
+    for i, netuid in enumerate(netuids):
+        values = dict(zip(SUBNET_FIELDS, results[2 + i * 4 : 6 + i * 4]))
+        allocation = values.pop("allocation") or (0, 0, 0, False)
+        subnets.append(
+            {
+                "netuid": netuid,
+                **{k: v or 0 for k, v in values.items()},
+                "allocated": allocation[0],
+                "allocation_locked": allocation[1],
+                "last_update": allocation[2],
+                "active": allocation[3],
+            }
+        )
+    return {
+        "block": block,
+        "stake_info": results[0],
+        "user_stake_info": results[1],
+        "subnets": subnets,
+    }
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_CONCURRENCY = 256
+
+
+def parse_endpoint(endpoint: str, port: int):
+    """
+    Turn an on-chain endpoint/port pair into (host, port, use_http). Endpoints
+    may be bare hosts ("1.2.3.4", "::1", "[::1]:8091") or URLs
+    ("http://host:8080"); an explicit non-zero port wins over the URL's.
+    A malformed or out-of-range port in the endpoint counts as missing, so
+    None is returned when there is nothing to probe.
+    """
+    endpoint = (endpoint or "").strip()
+    if not endpoint:
+        return None
+    use_http = "://" in endpoint
+    if not use_http and endpoint.count(":") > 1 and not endpoint.startswith("["):
+        # Bare IPv6 address: every colon belongs to the host.
+        host, url_port = endpoint, None
+    else:
+        try:
+            url = urlsplit(endpoint if use_http else f"//{endpoint}")
+        except ValueError:
+            return None
+        host, use_http = url.hostname, url.scheme in ("http", "https")
+        try:
+            url_port = url.port
+        except ValueError:
+            url_port = None
+    port = int(port) or url_port
+    if not host or not port or not 0 < port < 65536:
+        return None
+    return host, port, use_http
+
+
+async def probe_one(host: str, port: int, timeout: float, http_path=None):
+    """
+    Open a TCP connection (and with http_path, send a GET and read the status
+    line) within timeout. Returns (alive, latency_ms, detail).
+    """
+    start = time.perf_counter()
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        if http_path is None:
+            return True, (time.perf_counter() - start) * 1000, "tcp ok"
+        request = f"GET {http_path} HTTP/1.0\r\nHost: {host}\r\nConnection: close\r\n\r\n"
+        writer.write(request.encode())
+        remaining = timeout - (time.perf_counter() - start)
+        await asyncio.wait_for(writer.drain(), remaining)
+        status_line = await asyncio.wait_for(reader.readline(), timeout - (time.perf_counter() - start))
+        latency = (time.perf_counter() - start) * 1000
+        parts = status_line.decode(errors="replace").split()
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            return False, latency, "no http response"
+        return parts[1].startswith(("2", "3")), latency, f"http {parts[1]}"
+    except TimeoutError:
+        return False, None, "timeout"
+    except ConnectionRefusedError:
+        return False, None, "refused"
+    except OSError as e:
+        return False, None, type(e).__name__
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def probe_targets(targets, timeout: float = DEFAULT_TIMEOUT, concurrency: int = DEFAULT_CONCURRENCY):
+    """
+    Probe many (host, port, http_path) targets with at most `concurrency`
+    connections open at once. Duplicate targets are probed once. Returns a
+    dict target -> (alive, latency_ms, detail).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    unique = list(dict.fromkeys(targets))
+
+    async def run(target):
+        async with semaphore:
+            return target, await probe_one(target[0], target[1], timeout, target[2])
+
+    return dict(await asyncio.gather(*(run(t) for t in unique)))
+
+
+def probe_metagraph(mg, timeout: float = DEFAULT_TIMEOUT, concurrency: int = DEFAULT_CONCURRENCY, metrics_path: str = "/metrics"):
+    """
+    Probe every neuron's axon (TCP, or HTTP GET / for http:// endpoints) and
+    prometheus (HTTP GET metrics_path) endpoint. Returns one
+    (axon_result, prometheus_result) pair per row of the metagraph; a result is
+    None when the neuron has no usable endpoint.
+    """
+    rows = []
+    targets = []
+    for i in range(len(mg)):
+        axon = parse_endpoint(str(mg.axon_endpoint[i]), int(mg.axon_port[i]))
+        prom = parse_endpoint(str(mg.prometheus_endpoint[i]), int(mg.prometheus_port[i]))
+        axon_target = (axon[0], axon[1], "/" if axon[2] else None) if axon else None
+        prom_target = (prom[0], prom[1], metrics_path) if prom else None
+        rows.append((axon_target, prom_target))
+        targets += [t for t in (axon_target, prom_target) if t]
+    results = asyncio.run(probe_targets(targets, timeout, concurrency))
+    return [(results.get(a) if a else None, results.get(p) if p else None) for a, p in rows]
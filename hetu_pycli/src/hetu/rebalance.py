@@ -0,0 +1,65 @@
+from decimal import Decimal, InvalidOperation
+
+import yaml
+
+from hetu_pycli.src.hetu.metagraph import WEI_PER_HETU
+
+
+def _hetu_to_wei(value, what: str):
+    try:
+        amount = int(Decimal(str(value)) * WEI_PER_HETU)
+    except InvalidOperation:
+        raise ValueError(f"invalid amount for {what}: {value!r}")
+    if amount < 0:
+        raise ValueError(f"negative amount for {what}: {value!r}")
+    return amount
+
+
+def load_plan(path: str):
+    """
+    Read a rebalance plan:
+
+        allocations:            # netuid: target allocation in HETU
+          1: 120
+          3: 0
+        release_unlisted: true  # optional, set every other allocated subnet to 0
+        min_change: 0.01        # optional, skip moves smaller than this (HETU)
+
+    Returns (targets {netuid: wei}, release_unlisted, min_change_wei).
+    """
+    with open(path, "r") as f:
+        plan = yaml.safe_load(f) or {}
+    allocations = plan.get("allocations")
+    if not isinstance(allocations, dict) or not allocations:
+        raise ValueError("plan needs a non-empty `allocations` mapping of netuid to HETU")
+    targets = {int(netuid): _hetu_to_wei(amount, f"netuid {netuid}") for netuid, amount in allocations.items()}
+    min_change = _hetu_to_wei(plan.get("min_change", 0), "min_change")
+    return targets, bool(plan.get("release_unlisted", False)), min_change
+
+
+def plan_moves(current, locked, targets, available: int, min_change: int = 0):
+    """
+    The allocateToSubnet calls that take current {netuid: wei} to targets, as
+    (netuid, current, target) tuples. Reductions come first so the stake they
+    free is available to the increases that follow. Raises ValueError when a
+    target is below the subnet's locked stake or the increases need more than
+    is available for allocation.
+    """
+    moves = []
+    for netuid, target in sorted(targets.items()):
+        now = current.get(netuid, 0)
+        if target < locked.get(netuid, 0):
+            raise ValueError(
+                f"netuid {netuid}: target {target / WEI_PER_HETU:,.4f} is below the "
+                f"{locked[netuid] / WEI_PER_HETU:,.4f} HETU locked there"
+            )
+        if target != now and abs(target - now) >= min_change:
+            moves.append((netuid, now, target))
+    net_increase = sum(target - now for _, now, target in moves)
+    if net_increase > available:
+        raise ValueError(
+            f"plan needs {net_increase / WEI_PER_HETU:,.4f} more HETU allocated but only "
+            f"{available / WEI_PER_HETU:,.4f} is available for allocation"
+        )
+    moves.sort(key=lambda m: (m[2] > m[1], m[0]))
+    return moves
@@ -0,0 +1,261 @@
+import sqlite3
+
+import typer
+from rich import print
+
+from hetu_pycli.config import get_data_path
+from hetu_pycli.src.hetu.logs import DEFAULT_LOG_CHUNK, fetch_events
+
+STAKE_EVENTS = [
+    "GlobalStakeAdded",
+    "GlobalStakeRemoved",
+    "StakeLocked",
+    "StakeUnlocked",
+    "SubnetAllocationChanged",
+]
+
+# Blocks fetched and committed per step, so an interrupted sync loses at most one window.
+DEFAULT_WINDOW = 100_000
+
+# Blocks the default sync end stays behind the head, so a shallow reorg cannot
+# rewrite events that are already reduced into the checkpointed totals.
+DEFAULT_CONFIRMATIONS = 6
+
+# Amounts are wei stored as decimal TEXT. value_after is the running figure the
+# event moved: the user's global stake, their locked stake in the subnet, or
+# their allocation to the subnet.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stake_events (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT,
+    event TEXT NOT NULL,
+    user TEXT NOT NULL,
+    netuid INTEGER,
+    amount TEXT NOT NULL,
+    old_amount TEXT,
+    value_after TEXT NOT NULL,
+    PRIMARY KEY (block, log_index)
+);
+CREATE INDEX IF NOT EXISTS idx_stake_events_user ON stake_events (user, block);
+CREATE TABLE IF NOT EXISTS subnet_stake_series (
+    netuid INTEGER NOT NULL,
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    total_allocated TEXT NOT NULL,
+    PRIMARY KEY (netuid, block, log_index)
+);
+CREATE TABLE IF NOT EXISTS user_stakes (
+    user TEXT PRIMARY KEY,
+    staked TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subnet_allocations (
+    user TEXT NOT NULL,
+    netuid INTEGER NOT NULL,
+    allocated TEXT NOT NULL,
+    locked TEXT NOT NULL,
+    PRIMARY KEY (user, netuid)
+);
+CREATE INDEX IF NOT EXISTS idx_subnet_allocations_netuid ON subnet_allocations (netuid);
+"""
+
+
+def get_stake_history_path(config):
+    return get_data_path(config, "stake_history.sqlite")
+
+
+class StakeHistory:
+    """Local index of GlobalStaking events reduced into per-user and per-subnet stake series."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def block(self):
+        value = self._meta("block")
+        return int(value) if value is not None else None
+
+    @property
+    def contract(self):
+        return self._meta("contract")
+
+    def apply(self, events, to_block: int, contract: str):
+        """
+        Reduce decoded events (chain order) into the running totals and series and
+        move the checkpoint to to_block, all in one transaction.
+        """
+        stakes = {}
+        allocations = {}
+        subnet_totals = {}
+        event_rows = []
+        series_rows = []
+
+        def stake_of(user):
+            if user not in stakes:
+                row = self.conn.execute("SELECT staked FROM user_stakes WHERE user = ?", (user,)).fetchone()
+                stakes[user] = int(row[0]) if row else 0
+            return stakes[user]
+
+        def allocation_of(user, netuid):
+            key = (user, netuid)
+            if key not in allocations:
+                row = self.conn.execute(
+                    "SELECT allocated, locked FROM subnet_allocations WHERE user = ? AND netuid = ?", key
+                ).fetchone()
+                allocations[key] = [int(row[0]), int(row[1])] if row else [0, 0]
+            return allocations[key]
+
+        def subnet_total_of(netuid):
+            if netuid not in subnet_totals:
+                row = self.conn.execute(
+                    "SELECT total_allocated FROM subnet_stake_series WHERE netuid = ? "
+                    "ORDER BY block DESC, log_index DESC LIMIT 1",
+                    (netuid,),
+                ).fetchone()
+                subnet_totals[netuid] = int(row[0]) if row else 0
+            return subnet_totals[netuid]
+
+        for event in events:
+            args = event["args"]
+            name = event["event"]
+            user = args["user"]
+            netuid = args.get("netuid")
+            old_amount = None
+            if name in ("GlobalStakeAdded", "GlobalStakeRemoved"):
+                amount = args["amount"]
+                stakes[user] = stake_of(user) + (amount if name == "GlobalStakeAdded" else -amount)
+                value_after = stakes[user]
+            elif name in ("StakeLocked", "StakeUnlocked"):
+                amount = args["amount"]
+                allocation = allocation_of(user, netuid)
+                allocation[1] += amount if name == "StakeLocked" else -amount
+                value_after = allocation[1]
+            else:
+                amount, old_amount = args["newAmount"], args["oldAmount"]
+                allocation = allocation_of(user, netuid)
+                subnet_totals[netuid] = subnet_total_of(netuid) + amount - allocation[0]
+                allocation[0] = amount
+                value_after = amount
+                series_rows.append((netuid, event["blockNumber"], event["logIndex"], str(subnet_totals[netuid])))
+            event_rows.append(
+                (
+                    event["blockNumber"],
+                    event["logIndex"],
+                    event["transactionHash"],
+                    name,
+                    user,
+                    netuid,
+                    str(amount),
+                    None if old_amount is None else str(old_amount),
+                    str(value_after),
+                )
+            )
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO stake_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", event_rows
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO subnet_stake_series VALUES (?, ?, ?, ?)", series_rows
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO user_stakes VALUES (?, ?)",
+                [(user, str(value)) for user, value in stakes.items()],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO subnet_allocations VALUES (?, ?, ?, ?)",
+                [(user, netuid, str(a), str(lk)) for (user, netuid), (a, lk) in allocations.items()],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [("block", str(to_block)), ("contract", contract)],
+            )
+        return len(event_rows)
+
+    def leaderboard(self, netuid=None, top: int = 20):
+        """[(user, amount)] by global stake, or by allocation to netuid, largest first."""
+        if netuid is None:
+            rows = self.conn.execute("SELECT user, staked FROM user_stakes").fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT user, allocated FROM subnet_allocations WHERE netuid = ?", (netuid,)
+            ).fetchall()
+        ranked = sorted(((user, int(value)) for user, value in rows), key=lambda r: r[1], reverse=True)
+        return [r for r in ranked if r[1] > 0][:top]
+
+    def history(self, user: str, netuid=None, limit: int = 50):
+        """A user's most recent events, oldest first, with amounts as ints."""
+        query = (
+            "SELECT block, log_index, event, netuid, amount, old_amount, value_after, tx_hash "
+            "FROM stake_events WHERE user = ?"
+        )
+        params = [user]
+        if netuid is not None:
+            query += " AND netuid = ?"
+            params.append(netuid)
+        query += " ORDER BY block DESC, log_index DESC LIMIT ?"
+        params.append(limit)
+        rows = self.conn.execute(query, params).fetchall()
+        return [
+            (b, li, ev, n, int(a), None if old is None else int(old), int(after), tx)
+            for b, li, ev, n, a, old, after, tx in reversed(rows)
+        ]
+
+    def subnet_series(self, netuid: int):
+        rows = self.conn.execute(
+            "SELECT block, total_allocated FROM subnet_stake_series WHERE netuid = ? ORDER BY block, log_index",
+            (netuid,),
+        ).fetchall()
+        return [(b, int(v)) for b, v in rows]
+
+
+def sync_stake_history(
+    history: StakeHistory,
+    staking,
+    from_block: int = 0,
+    to_block=None,
+    window: int = DEFAULT_WINDOW,
+    chunk_size: int = DEFAULT_LOG_CHUNK,
+    max_workers: int = 4,
+    confirmations: int = DEFAULT_CONFIRMATIONS,
+):
+    """
+    Index GlobalStaking events from the checkpoint (or from_block on the first
+    run) up to to_block, or confirmations blocks behind the latest one, one
+    window at a time. Yields (window end, event count) after each committed window.
+    """
+    contract = staking.contract.address
+    if history.contract and history.contract != contract:
+        raise ValueError(f"{history.path} indexes {history.contract}, not {contract}")
+    start = history.block + 1 if history.block is not None else from_block
+    end = to_block if to_block is not None else staking.web3.eth.block_number - confirmations
+    while start <= end:
+        stop = min(start + window - 1, end)
+        events = fetch_events(
+            staking.contract, STAKE_EVENTS, start, stop, chunk_size=chunk_size, max_workers=max_workers
+        )
+        yield stop, history.apply(events, stop, contract)
+        start = stop + 1
+
+
+def open_stake_history(ctx):
+    """Open the stake history index for a read, failing if it was never synced."""
+    history = StakeHistory(get_stake_history_path(ctx.obj))
+    if history.block is None:
+        history.close()
+        print("[red]Stake history index is empty. Run `hetucli index stake-history` first.")
+        raise typer.Exit(1)
+    return history
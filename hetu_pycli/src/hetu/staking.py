@@ -3,11 +3,30 @@ from rich import print
 from web3 import Web3
 import json
 import os
-from hetu_pycli.src.hetu.erc20 import load_erc20
 from hetu_pycli.src.hetu.wrapper.global_staking import GlobalStaking
 from eth_account import Account
-from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path
+from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path, unlock_keystores
+from hetu_pycli.src.commands.tx import (
+    broadcast_signed_txs,
+    record_pending_tx,
+    record_pending_txs,
+    wait_for_receipts,
+)
+from hetu_pycli.src.hetu.state_index import open_local_index
+from hetu_pycli.src.hetu.subnet import load_subnet_mgr
+from hetu_pycli.src.hetu.portfolio import fetch_portfolio, list_netuids
+from hetu_pycli.src.hetu.stake_history import open_stake_history
+from hetu_pycli.src.hetu.rebalance import load_plan, plan_moves
+from hetu_pycli.src.hetu.token_cache import hetu_token_metadata, linked_token
+from hetu_pycli.src.hetu.allowance import approve_if_short
+from hetu_pycli.src.hetu.batch import batch_call, batch_rpc
+from hetu_pycli.src.hetu.logs import received_amount
+from hetu_pycli.src.hetu.metagraph import WEI_PER_HETU
+from rich.console import Console
+from rich.table import Table
 import getpass
+import glob
+import yaml
 
 STAKING_ABI_PATH = os.path.join(
     os.path.dirname(__file__), "../../../contracts/GlobalStaking.abi"
@@ -47,9 +66,8 @@ def total_staked(
         raise typer.Exit(1)
     staking = load_staking(contract, rpc)
     all_staking = staking.getTotalStaked()
-    whetu = staking.hetuToken()
-    erc20 = load_erc20(whetu, rpc)
-    decimals = erc20.decimals()
+    _, token = hetu_token_metadata(ctx.obj, staking)
+    decimals = token["decimals"]
     value = all_staking / (10 ** decimals)
     value_str = f"{value:,.{decimals}f}".rstrip('0').rstrip('.')
     print(f"[green]Total Staked: {value_str} (raw: {all_staking}, decimals: {decimals})")
@@ -59,8 +77,19 @@ def stake_info(
     ctx: typer.Context,
     contract: str = typer.Option(None, help="Staking contract address"),
     user: str = typer.Option(..., help="User address to query"),
+    local: bool = typer.Option(False, help="Read from the local index (see `hetucli index sync`)"),
 ):
     """Query stake info for a user"""
+    if local:
+        index = open_local_index(ctx)
+        info, block = index.stake_info(Web3.to_checksum_address(user)), index.block
+        index.close()
+        if info is None:
+            print(f"[red]No stake info for {user} in local index (block {block})")
+            raise typer.Exit(1)
+        print(f"[green]Stake Info: {info}")
+        print(f"[yellow]From local index, current to block {block}")
+        return
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
     if not rpc:
         print("[red]No RPC URL found in config or CLI.")
@@ -69,6 +98,115 @@ def stake_info(
     staking = load_staking(contract, rpc)
     print(f"[green]Stake Info: {staking.getStakeInfo(user)}")
 
+@staking_app.command()
+def portfolio(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Staking contract address"),
+    subnet_contract: str = typer.Option(None, help="Subnet manager contract address, used to list netuids"),
+    user: str = typer.Option(..., help="User address to query"),
+    netuids: str = typer.Option(None, help="Comma separated netuids (default: every subnet)"),
+    show_empty: bool = typer.Option(False, help="Also list subnets where every figure is zero"),
+):
+    """Show a user's stake across all subnets from one batched read"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    contract = get_contract_address(ctx, "staking_address", contract)
+    staking = load_staking(contract, rpc)
+    user = Web3.to_checksum_address(user)
+    block = staking.web3.eth.block_number
+    if netuids:
+        netuid_list = [int(n) for n in netuids.split(",") if n.strip()]
+    else:
+        subnet_contract = get_contract_address(ctx, "subnet_address", subnet_contract)
+        netuid_list = list_netuids(load_subnet_mgr(subnet_contract, rpc), block)
+    result = fetch_portfolio(staking, user, netuid_list, block)
+
+    columns = ("available", "effective", "locked", "allocated", "allocation_locked")
+    table = Table(title=f"Stake portfolio {user} @ block {block}")
+    for header in ("NETUID", "AVAILABLE", "EFFECTIVE", "LOCKED", "ALLOCATED", "ALLOC LOCKED", "ACTIVE", "LAST UPDATE"):
+        table.add_column(header, justify="right")
+    totals = dict.fromkeys(columns, 0)
+    for row in result["subnets"]:
+        for key in columns:
+            totals[key] += row[key]
+        if not show_empty and not any(row[key] for key in columns):
+            continue
+        table.add_row(
+            str(row["netuid"]),
+            *(f"{row[key] / WEI_PER_HETU:,.4f}" for key in columns),
+            str(row["active"]),
+            str(row["last_update"]),
+        )
+    table.add_section()
+    table.add_row("TOTAL", *(f"{totals[key] / WEI_PER_HETU:,.4f}" for key in columns), "", "")
+    Console().print(table)
+    stake_info = result["stake_info"]
+    if stake_info:
+        print(
+            f"[green]Total staked: {stake_info[0] / WEI_PER_HETU:,.4f}, allocated: {stake_info[1] / WEI_PER_HETU:,.4f}, "
+            f"available for allocation: {stake_info[2] / WEI_PER_HETU:,.4f}, pending rewards: {stake_info[4] / WEI_PER_HETU:,.4f}"
+        )
+    user_info = result["user_stake_info"]
+    if user_info:
+        print(f"[green]Allocated subnets: {list(user_info[2])}")
+
+@staking_app.command()
+def leaderboard(
+    ctx: typer.Context,
+    netuid: int = typer.Option(None, help="Rank by allocation to this subnet instead of global stake"),
+    top: int = typer.Option(20, help="Number of users to show"),
+):
+    """Rank users by stake from the local stake history index"""
+    history = open_stake_history(ctx)
+    try:
+        block = history.block
+        rows = history.leaderboard(netuid, top)
+    finally:
+        history.close()
+    print(f"[yellow]From local stake history, current to block {block}")
+    title = "Global stake" if netuid is None else f"Allocation to subnet {netuid}"
+    table = Table(title=f"{title} leaderboard")
+    table.add_column("RANK", justify="right")
+    table.add_column("USER")
+    table.add_column("HETU", justify="right")
+    for rank, (user, amount) in enumerate(rows, 1):
+        table.add_row(str(rank), user, f"{amount / WEI_PER_HETU:,.4f}")
+    Console().print(table)
+
+@staking_app.command()
+def history(
+    ctx: typer.Context,
+    user: str = typer.Option(..., help="User address to query"),
+    netuid: int = typer.Option(None, help="Only events for this subnet"),
+    limit: int = typer.Option(50, help="Number of most recent events to show"),
+):
+    """Show a user's stake events and running totals from the local stake history index"""
+    user = Web3.to_checksum_address(user)
+    stake_history = open_stake_history(ctx)
+    try:
+        block = stake_history.block
+        rows = stake_history.history(user, netuid, limit)
+    finally:
+        stake_history.close()
+    print(f"[yellow]From local stake history, current to block {block}")
+    table = Table(title=f"Stake history {user}")
+    for header in ("BLOCK", "EVENT", "NETUID", "AMOUNT", "AFTER", "TX"):
+        table.add_column(header, justify="right" if header in ("BLOCK", "NETUID", "AMOUNT", "AFTER") else "left")
+    for blk, _, event, event_netuid, amount, old_amount, after, tx_hash in rows:
+        if old_amount is not None:
+            amount -= old_amount
+        table.add_row(
+            str(blk),
+            event,
+            "" if event_netuid is None else str(event_netuid),
+            f"{amount / WEI_PER_HETU:+,.4f}" if old_amount is not None else f"{amount / WEI_PER_HETU:,.4f}",
+            f"{after / WEI_PER_HETU:,.4f}",
+            tx_hash or "",
+        )
+    Console().print(table)
+
 @staking_app.command()
 def add_stake(
     ctx: typer.Context,
@@ -77,6 +215,8 @@ def add_stake(
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     amount: float = typer.Option(..., help="Amount to stake (in HETU)"),
+    approve_amount: float = typer.Option(None, help="When the allowance is short, approve this standing amount instead of exactly what is needed"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Add global stake (stake HETU)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -98,6 +238,15 @@ def add_stake(
     from_address = keystore["address"]
     nonce = staking.web3.eth.get_transaction_count(from_address)
     amount_wei = staking.web3.to_wei(amount, "ether")
+    nonce, approvals = approve_if_short(
+        staking.web3,
+        private_key,
+        from_address,
+        staking.contract.address,
+        [(linked_token(ctx.obj, staking), amount_wei)],
+        nonce,
+        staking.web3.to_wei(approve_amount or 0, "ether"),
+    )
     tx = staking.contract.functions.addGlobalStake(amount_wei).build_transaction(
         {
             "from": from_address,
@@ -109,6 +258,11 @@ def add_stake(
     signed = staking.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = staking.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted add stake tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_txs(
+            config, [(h, "approve", from_address) for h in approvals] + [(tx_hash, "add stake", from_address)]
+        )
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = staking.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -124,6 +278,7 @@ def remove_stake(
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     amount: float = typer.Option(..., help="Amount to unstake (in HETU)"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Remove global stake (unstake HETU)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -156,6 +311,9 @@ def remove_stake(
     signed = staking.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = staking.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted remove stake tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "remove stake", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = staking.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -170,6 +328,7 @@ def claim_rewards(
     sender: str = typer.Option(..., help="Sender address (must match keystore address or wallet name)"),
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Claim staking rewards"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -201,6 +360,9 @@ def claim_rewards(
     signed = staking.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = staking.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted claim rewards tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "claim rewards", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = staking.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -208,6 +370,140 @@ def claim_rewards(
     else:
         print(f"[red]Claim rewards failed in block {receipt.blockNumber}")
 
+@staking_app.command()
+def claim_rewards_all(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Staking contract address"),
+    wallets: str = typer.Option("*", help="Glob over wallet names in the wallet path, e.g. 'coldkey-*'"),
+    wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
+    password: str = typer.Option(None, hide_input=True, help="Keystore password shared by the matched wallets"),
+    min_rewards: float = typer.Option(0.0, help="Skip accounts with at most this much pending (HETU)"),
+    workers: int = typer.Option(None, help="Processes used to unlock keystores (default CPU count)"),
+    batch_size: int = typer.Option(100, help="Requests per JSON-RPC batch"),
+    dry_run: bool = typer.Option(False, help="Only show pending rewards per wallet"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipts later with `hetucli tx status`"),
+):
+    """Claim staking rewards for every wallet matching a glob, skipping those with nothing pending"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    contract = get_contract_address(ctx, "staking_address", contract)
+    config = ctx.obj
+    wallet_path = wallet_path or get_wallet_path(config)
+    names = sorted(
+        os.path.basename(path)[: -len(".json")] for path in glob.glob(os.path.join(wallet_path, f"{wallets}.json"))
+    )
+    if not names:
+        print(f"[red]No wallets match {wallets!r} in {wallet_path}")
+        raise typer.Exit(1)
+    keystores = {name: load_keystore(name, wallet_path) for name in names}
+    addresses = {name: Web3.to_checksum_address(keystores[name]["address"]) for name in names}
+    staking = load_staking(contract, rpc)
+    web3 = staking.web3
+
+    fns = staking.contract.functions
+    infos = batch_call(web3, [fns.getStakeInfo(addresses[name]) for name in names], "latest", batch_size)
+    pending = {}
+    for name, info in zip(names, infos):
+        if info is None:
+            print(f"[red]{name}: failed to read stake info")
+        elif info[4] > int(min_rewards * WEI_PER_HETU):
+            pending[name] = info[4]
+    print(
+        f"[green]{len(pending)}/{len(names)} wallets have rewards to claim, "
+        f"{sum(pending.values()) / WEI_PER_HETU:,.4f} HETU pending"
+    )
+    if dry_run or not pending:
+        for name, amount in pending.items():
+            print(f"  {name} {addresses[name]} {amount / WEI_PER_HETU:,.4f}")
+        return
+
+    names = list(pending)
+    if not password:
+        password = getpass.getpass("Keystore password: ")
+    print(f"[yellow]Unlocking {len(names)} keystores...")
+    unlocked = unlock_keystores([keystores[n] for n in names], [password] * len(names), workers)
+    private_keys = {}
+    for name, (key, error) in zip(names, unlocked):
+        if error:
+            print(f"[red]Failed to decrypt keystore {name}: {error}")
+        else:
+            private_keys[name] = key
+    names = [n for n in names if n in private_keys]
+    if not names:
+        raise typer.Exit(1)
+
+    nonces = batch_rpc(web3, [("eth_getTransactionCount", [addresses[n], "pending"]) for n in names], batch_size)
+    if None in nonces:
+        print("[red]Failed to fetch account nonces.")
+        raise typer.Exit(1)
+    gas_price = web3.eth.gas_price
+    chain_id = web3.eth.chain_id
+    signed = []
+    for name, nonce in zip(names, nonces):
+        tx = fns.claimRewards().build_transaction(
+            {
+                "from": addresses[name],
+                "nonce": int(nonce, 16),
+                "gas": 150000,
+                "gasPrice": gas_price,
+                "chainId": chain_id,
+            }
+        )
+        signed.append((addresses[name], web3.eth.account.sign_transaction(tx, private_keys[name]).raw_transaction))
+    sent = []
+    for name, (tx_hash, error) in zip(names, broadcast_signed_txs(web3, signed, batch_size)):
+        if error:
+            print(f"[red]{name}: {error}")
+            continue
+        print(f"[green]Broadcasted claim rewards {name} tx hash: {tx_hash}")
+        sent.append((name, tx_hash))
+    if not sent:
+        raise typer.Exit(1)
+    if no_wait:
+        record_pending_txs(config, [(tx_hash, "claim rewards", addresses[name]) for name, tx_hash in sent])
+        return
+
+    print(f"[yellow]Waiting for {len(sent)} transaction receipts...")
+    receipts = wait_for_receipts(web3, [tx_hash for _, tx_hash in sent], batch_size=batch_size, with_errors=True)
+    token, _ = hetu_token_metadata(config, staking)
+    table = Table(title="Claim rewards")
+    for header in ("WALLET", "ADDRESS", "PENDING", "CLAIMED", "GAS USED", "FEE", "STATUS"):
+        table.add_column(header, justify="left" if header in ("WALLET", "ADDRESS", "STATUS") else "right")
+    total_claimed = total_gas = total_fee = 0
+    unmined = []
+    for (name, tx_hash), (receipt, error) in zip(sent, receipts):
+        if receipt is None:
+            unmined.append((tx_hash, "claim rewards", addresses[name]))
+            state = "lookup failed" if error else "pending"
+            table.add_row(name, addresses[name], f"{pending[name] / WEI_PER_HETU:,.4f}", "", "", "", state)
+            continue
+        gas_used = int(receipt["gasUsed"], 16)
+        fee = gas_used * int(receipt.get("effectiveGasPrice") or hex(gas_price), 16)
+        ok = int(receipt["status"], 16) == 1
+        claimed = received_amount(receipt, token, addresses[name]) if ok else 0
+        total_claimed += claimed
+        total_gas += gas_used
+        total_fee += fee
+        table.add_row(
+            name,
+            addresses[name],
+            f"{pending[name] / WEI_PER_HETU:,.4f}",
+            f"{claimed / WEI_PER_HETU:,.4f}",
+            str(gas_used),
+            f"{fee / WEI_PER_HETU:,.6f}",
+            "ok" if ok else "failed",
+        )
+    table.add_section()
+    table.add_row(
+        "TOTAL", "", f"{sum(pending[n] for n, _ in sent) / WEI_PER_HETU:,.4f}",
+        f"{total_claimed / WEI_PER_HETU:,.4f}", str(total_gas), f"{total_fee / WEI_PER_HETU:,.6f}", "",
+    )
+    Console().print(table)
+    if unmined:
+        record_pending_txs(config, unmined)
+
 @staking_app.command()
 def available_stake(
     ctx: typer.Context,
@@ -265,6 +561,7 @@ def allocate_to_subnet(
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     netuid: int = typer.Option(..., help="Subnet netuid"),
     amount: float = typer.Option(..., help="Amount to allocate (in HETU)"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Allocate stake to a subnet"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -297,6 +594,9 @@ def allocate_to_subnet(
     signed = staking.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = staking.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted allocate to subnet tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "allocate to subnet", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = staking.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -304,6 +604,128 @@ def allocate_to_subnet(
     else:
         print(f"[red]Allocate to subnet failed in block {receipt.blockNumber}")
 
+@staking_app.command()
+def rebalance(
+    ctx: typer.Context,
+    contract: str = typer.Option(None, help="Staking contract address"),
+    plan: str = typer.Option(..., help="YAML plan with target allocations per netuid (HETU)"),
+    sender: str = typer.Option(..., help="Sender address (must match keystore address or wallet name)"),
+    wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
+    password: str = typer.Option(None, hide_input=True, help="Keystore password"),
+    dry_run: bool = typer.Option(False, help="Only show the allocateToSubnet calls the plan needs"),
+    batch_size: int = typer.Option(100, help="Requests per JSON-RPC batch"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipts later with `hetucli tx status`"),
+):
+    """Move subnet allocations to the targets in a plan with the fewest allocateToSubnet calls"""
+    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+    if not rpc:
+        print("[red]No RPC URL found in config or CLI.")
+        raise typer.Exit(1)
+    contract = get_contract_address(ctx, "staking_address", contract)
+    try:
+        targets, release_unlisted, min_change = load_plan(plan)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"[red]Failed to read plan {plan}: {e}")
+        raise typer.Exit(1)
+    config = ctx.obj
+    wallet_path = wallet_path or get_wallet_path(config)
+    keystore = load_keystore(sender, wallet_path)
+    from_address = Web3.to_checksum_address(keystore["address"])
+    staking = load_staking(contract, rpc)
+    web3 = staking.web3
+
+    block = web3.eth.block_number
+    result = fetch_portfolio(staking, from_address, sorted(targets), block)
+    if not result["stake_info"]:
+        print(f"[red]Failed to read stake info for {from_address}")
+        raise typer.Exit(1)
+    subnets = result["subnets"]
+    if release_unlisted and result["user_stake_info"]:
+        unlisted = sorted(set(result["user_stake_info"][2]) - set(targets))
+        if unlisted:
+            subnets += fetch_portfolio(staking, from_address, unlisted, block)["subnets"]
+            targets = {**targets, **dict.fromkeys(unlisted, 0)}
+    current = {row["netuid"]: row["allocated"] for row in subnets}
+    locked = {row["netuid"]: row["locked"] for row in subnets}
+    try:
+        moves = plan_moves(current, locked, targets, result["stake_info"][2], min_change)
+    except ValueError as e:
+        print(f"[red]{e}")
+        raise typer.Exit(1)
+    if not moves:
+        print(f"[green]Allocations already match the plan at block {block}")
+        return
+
+    table = Table(title=f"Rebalance {from_address} @ block {block}")
+    for header in ("NETUID", "CURRENT", "TARGET", "CHANGE"):
+        table.add_column(header, justify="right")
+    for netuid, now, target in moves:
+        table.add_row(
+            str(netuid),
+            f"{now / WEI_PER_HETU:,.4f}",
+            f"{target / WEI_PER_HETU:,.4f}",
+            f"{(target - now) / WEI_PER_HETU:+,.4f}",
+        )
+    Console().print(table)
+    print(f"[yellow]{len(moves)} allocateToSubnet calls, {len(targets) - len(moves)} subnets unchanged")
+    if dry_run:
+        return
+
+    if not password:
+        password = getpass.getpass("Keystore password: ")
+    try:
+        private_key = Account.decrypt(keystore, password)
+    except Exception as e:
+        print(f"[red]Failed to decrypt keystore: {e}")
+        raise typer.Exit(1)
+    nonce = web3.eth.get_transaction_count(from_address, "pending")
+    gas_price = web3.eth.gas_price
+    chain_id = web3.eth.chain_id
+    signed = []
+    for i, (netuid, _, target) in enumerate(moves):
+        tx = staking.contract.functions.allocateToSubnet(netuid, target).build_transaction(
+            {
+                "from": from_address,
+                "nonce": nonce + i,
+                "gas": 500000,
+                "gasPrice": gas_price,
+                "chainId": chain_id,
+            }
+        )
+        signed.append((from_address, web3.eth.account.sign_transaction(tx, private_key).raw_transaction))
+    sent = []
+    for (netuid, _, _), (tx_hash, error) in zip(moves, broadcast_signed_txs(web3, signed, batch_size)):
+        if error:
+            print(f"[red]Allocate to subnet {netuid} not sent: {error}")
+            continue
+        sent.append((netuid, tx_hash))
+        print(f"[green]Broadcasted allocate to subnet {netuid} tx hash: {tx_hash}")
+    if not sent:
+        raise typer.Exit(1)
+    if no_wait:
+        record_pending_txs(config, [(tx_hash, f"allocate to subnet {netuid}", from_address) for netuid, tx_hash in sent])
+        return
+    print(f"[yellow]Waiting for {len(sent)} transaction receipts...")
+    receipts = wait_for_receipts(web3, [tx_hash for _, tx_hash in sent], batch_size=batch_size, with_errors=True)
+    succeeded = 0
+    unmined = []
+    for (netuid, tx_hash), (receipt, error) in zip(sent, receipts):
+        if receipt is None:
+            if error:
+                print(f"[red]Allocate to subnet {netuid} receipt lookup failed: {tx_hash}: {error}")
+            else:
+                print(f"[yellow]Allocate to subnet {netuid} still pending: {tx_hash}")
+            unmined.append((tx_hash, f"allocate to subnet {netuid}", from_address))
+        elif int(receipt["status"], 16) == 1:
+            succeeded += 1
+        else:
+            print(f"[red]Allocate to subnet {netuid} failed in block {int(receipt['blockNumber'], 16)}")
+    if unmined:
+        record_pending_txs(config, unmined)
+    print(f"[green]{succeeded}/{len(sent)} allocation changes succeeded")
+    if len(sent) < len(moves):
+        print(f"[red]{len(moves) - len(sent)} allocation changes were not sent")
+
 @staking_app.command()
 def subnet_allocation(
     ctx: typer.Context,
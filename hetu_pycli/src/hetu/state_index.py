@@ -0,0 +1,196 @@
+import sqlite3
+
+import typer
+from rich import print
+
+from hetu_pycli.config import get_data_path
+from hetu_pycli.src.hetu.batch import batch_call
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# uint256 amounts are stored as decimal TEXT so they round-trip exactly.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subnets (
+    netuid INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    alpha_token TEXT,
+    amm_pool TEXT,
+    locked_amount TEXT,
+    pool_initial_tao TEXT,
+    burned_amount TEXT,
+    created_at INTEGER,
+    is_active INTEGER,
+    name TEXT,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_subnets_owner ON subnets (owner);
+CREATE TABLE IF NOT EXISTS neurons (
+    netuid INTEGER NOT NULL,
+    account TEXT NOT NULL,
+    uid INTEGER,
+    is_active INTEGER,
+    is_validator INTEGER,
+    stake TEXT,
+    registration_block INTEGER,
+    last_update INTEGER,
+    axon_endpoint TEXT,
+    axon_port INTEGER,
+    prometheus_endpoint TEXT,
+    prometheus_port INTEGER,
+    PRIMARY KEY (netuid, account)
+);
+CREATE INDEX IF NOT EXISTS idx_neurons_account ON neurons (account);
+CREATE TABLE IF NOT EXISTS stakes (
+    account TEXT PRIMARY KEY,
+    total_staked TEXT,
+    total_allocated TEXT,
+    available_for_allocation TEXT,
+    last_update_block INTEGER,
+    pending_rewards TEXT
+);
+"""
+
+
+class StateIndex:
+    """Local SQLite copy of subnets, neurons and stakes, tagged with the block it was read at."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def block(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'block'").fetchone()
+        return int(row[0]) if row else None
+
+    def replace_all(self, block: int, chain_id: int, subnets, neurons, stakes):
+        """Swap in a full snapshot in one transaction so readers never see a partial sync."""
+        with self.conn:
+            self.conn.execute("DELETE FROM subnets")
+            self.conn.execute("DELETE FROM neurons")
+            self.conn.execute("DELETE FROM stakes")
+            self.conn.executemany(
+                "INSERT INTO subnets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_stringify_amounts(s, (4, 5, 6)) for s in subnets],
+            )
+            self.conn.executemany(
+                "INSERT INTO neurons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_stringify_amounts(n, (5,)) for n in neurons],
+            )
+            self.conn.executemany(
+                "INSERT INTO stakes VALUES (?, ?, ?, ?, ?, ?)",
+                [_stringify_amounts(s, (1, 2, 3, 5)) for s in stakes],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [("block", str(block)), ("chain_id", str(chain_id))],
+            )
+
+    def subnet_info(self, netuid: int):
+        """Row shaped like getSubnetInfo(netuid), or None."""
+        row = self.conn.execute("SELECT * FROM subnets WHERE netuid = ?", (netuid,)).fetchone()
+        if not row:
+            return None
+        row = _parse_amounts(row, (4, 5, 6))
+        return row[:8] + (bool(row[8]),) + row[9:]
+
+    def user_subnets(self, owner: str):
+        rows = self.conn.execute(
+            "SELECT netuid FROM subnets WHERE owner = ? ORDER BY netuid", (owner,)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def neuron_info(self, netuid: int, account: str):
+        """Row shaped like getNeuronInfo(netuid, account), or None."""
+        row = self.conn.execute(
+            "SELECT account, uid, netuid, is_active, is_validator, stake, registration_block, "
+            "last_update, axon_endpoint, axon_port, prometheus_endpoint, prometheus_port "
+            "FROM neurons WHERE netuid = ? AND account = ?",
+            (netuid, account),
+        ).fetchone()
+        if not row:
+            return None
+        row = _parse_amounts(row, (5,))
+        return row[:3] + (bool(row[3]), bool(row[4])) + row[5:]
+
+    def stake_info(self, account: str):
+        """Row shaped like getStakeInfo(account), or None."""
+        row = self.conn.execute(
+            "SELECT total_staked, total_allocated, available_for_allocation, last_update_block, "
+            "pending_rewards FROM stakes WHERE account = ?",
+            (account,),
+        ).fetchone()
+        return _parse_amounts(row, (0, 1, 2, 4)) if row else None
+
+
+def get_state_index_path(config):
+    return get_data_path(config, "state_index.sqlite")
+
+
+def open_local_index(ctx):
+    """Open the local index for a --local read, failing if `hetucli index sync` never ran."""
+    index = StateIndex(get_state_index_path(ctx.obj))
+    if index.block is None:
+        index.close()
+        print("[red]Local index is empty. Run `hetucli index sync` first.")
+        raise typer.Exit(1)
+    return index
+
+
+def _stringify_amounts(values, positions):
+    return tuple(str(v) if i in positions else v for i, v in enumerate(values))
+
+
+def _parse_amounts(values, positions):
+    return tuple(int(v) if i in positions and v is not None else v for i, v in enumerate(values))
+
+
+def sync_state_index(index: StateIndex, subnet_mgr, neuron_mgr, staking, batch_size: int = 200):
+    """
+    Read every subnet, its neurons and the stake info of every neuron and subnet
+    owner, all through batched eth_calls pinned to one block, and store them.
+    Returns (block, subnet count, neuron count, stake count).
+    """
+    web3 = subnet_mgr.web3
+    block = web3.eth.block_number
+    next_netuid = subnet_mgr.contract.functions.getNextNetuid().call(block_identifier=block)
+    netuids = list(range(next_netuid))
+    infos = batch_call(
+        web3, [subnet_mgr.contract.functions.getSubnetInfo(n) for n in netuids], block, batch_size
+    )
+    subnets = [info for info in infos if info is not None and info[1] != ZERO_ADDRESS]
+
+    subnet_ids = [s[0] for s in subnets]
+    members = batch_call(
+        web3, [neuron_mgr.contract.functions.getSubnetNeurons(n) for n in subnet_ids], block, batch_size
+    )
+    pairs = [(n, a) for n, accounts in zip(subnet_ids, members) for a in (accounts or [])]
+    neuron_infos = batch_call(
+        web3,
+        [neuron_mgr.contract.functions.getNeuronInfo(n, a) for n, a in pairs],
+        block,
+        batch_size,
+        max_workers=4,
+    )
+    neurons = [
+        (n, info[0]) + tuple(info[1:2]) + tuple(info[3:])
+        for (n, _), info in zip(pairs, neuron_infos)
+        if info is not None
+    ]
+
+    accounts = sorted({a for _, a in pairs} | {s[1] for s in subnets})
+    stake_infos = batch_call(
+        web3, [staking.contract.functions.getStakeInfo(a) for a in accounts], block, batch_size, max_workers=4
+    )
+    stakes = [(a,) + tuple(info) for a, info in zip(accounts, stake_infos) if info is not None]
+
+    index.replace_all(block, web3.eth.chain_id, subnets, neurons, stakes)
+    return block, len(subnets), len(neurons), len(stakes)
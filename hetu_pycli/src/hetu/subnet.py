@@ -3,10 +3,13 @@ from rich import print
 from web3 import Web3
 import json
 import os
-from hetu_pycli.src.hetu.erc20 import load_erc20
+from hetu_pycli.src.hetu.token_cache import hetu_token_metadata, linked_token
+from hetu_pycli.src.hetu.allowance import approve_if_short
 from hetu_pycli.src.hetu.wrapper.subnet_mgr import SubnetMgr
 from eth_account import Account
 from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path
+from hetu_pycli.src.commands.tx import record_pending_tx, record_pending_txs
+from hetu_pycli.src.hetu.state_index import open_local_index
 import getpass
 
 SUBNET_ABI_PATH = os.path.join(
@@ -68,15 +71,25 @@ def subnet_info(
     ctx: typer.Context,
     contract: str = typer.Option(None, help="Subnet manager contract address"),
     netuid: int = typer.Option(..., help="Subnet netuid"),
+    local: bool = typer.Option(False, help="Read from the local index (see `hetucli index sync`)"),
 ):
     """Query subnet info by netuid"""
-    rpc = ctx.obj.get("json_rpc") if ctx.obj else None
-    contract = get_contract_address(ctx, "subnet_address", contract)
-    if not rpc:
-        print("[red]No RPC URL found in config or CLI.")
-        raise typer.Exit(1)
-    subnet_mgr = load_subnet_mgr(contract, rpc)
-    subnet_info = subnet_mgr.getSubnetInfo(netuid)
+    if local:
+        index = open_local_index(ctx)
+        subnet_info, block = index.subnet_info(netuid), index.block
+        index.close()
+        if subnet_info is None:
+            print(f"[red]Subnet {netuid} not found in local index (block {block})")
+            raise typer.Exit(1)
+        print(f"[yellow]From local index, current to block {block}")
+    else:
+        rpc = ctx.obj.get("json_rpc") if ctx.obj else None
+        contract = get_contract_address(ctx, "subnet_address", contract)
+        if not rpc:
+            print("[red]No RPC URL found in config or CLI.")
+            raise typer.Exit(1)
+        subnet_mgr = load_subnet_mgr(contract, rpc)
+        subnet_info = subnet_mgr.getSubnetInfo(netuid)
     print(f"[green]Subnet Info\n- Netuid: {subnet_info[0]}\n- Owner: {subnet_info[1]}\n- Alpha Token: {subnet_info[2]}\n- AMM Pool: {subnet_info[3]}\n- Locked Amount: {subnet_info[4]}\n- Pool Initial Tao: {subnet_info[5]}\n- Burned Amount: {subnet_info[6]}\n- Created At: {subnet_info[7]}\n- Is Active: {subnet_info[8]}\n- Name: {subnet_info[9]}\n- Description: {subnet_info[10]}")
 
 @subnet_app.command()
@@ -99,8 +112,16 @@ def user_subnets(
     ctx: typer.Context,
     contract: str = typer.Option(None, help="Subnet manager contract address"),
     user: str = typer.Option(..., help="User address to query"),
+    local: bool = typer.Option(False, help="Read from the local index (see `hetucli index sync`)"),
 ):
     """Query all subnets for a user"""
+    if local:
+        index = open_local_index(ctx)
+        netuids, block = index.user_subnets(Web3.to_checksum_address(user)), index.block
+        index.close()
+        print(f"[green]User Subnets: {netuids}")
+        print(f"[yellow]From local index, current to block {block}")
+        return
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
     contract = get_contract_address(ctx, "subnet_address", contract)
     if not rpc:
@@ -136,6 +157,8 @@ def register_network(
     description: str = typer.Option(..., help="Network description"),
     token_name: str = typer.Option(..., help="Token name"),
     token_symbol: str = typer.Option(..., help="Token symbol"),
+    approve_amount: float = typer.Option(None, help="When the allowance is short, approve this standing amount instead of exactly what is needed"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Register a new network"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -156,6 +179,15 @@ def register_network(
     subnet_mgr = load_subnet_mgr(contract, rpc)
     from_address = keystore["address"]
     nonce = subnet_mgr.web3.eth.get_transaction_count(from_address)
+    nonce, approvals = approve_if_short(
+        subnet_mgr.web3,
+        private_key,
+        from_address,
+        subnet_mgr.contract.address,
+        [(linked_token(ctx.obj, subnet_mgr), subnet_mgr.getNetworkLockCost())],
+        nonce,
+        subnet_mgr.web3.to_wei(approve_amount or 0, "ether"),
+    )
     tx = subnet_mgr.contract.functions.registerNetwork(name, description, token_name, token_symbol).build_transaction(
         {
             "from": from_address,
@@ -167,6 +199,11 @@ def register_network(
     signed = subnet_mgr.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = subnet_mgr.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted register network tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_txs(
+            config, [(h, "approve", from_address) for h in approvals] + [(tx_hash, "register network", from_address)]
+        )
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = subnet_mgr.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -184,6 +221,7 @@ def update_subnet_info(
     netuid: int = typer.Option(..., help="Subnet netuid"),
     new_name: str = typer.Option(..., help="New subnet name"),
     new_description: str = typer.Option(..., help="New subnet description"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Update subnet info (name/description)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -215,6 +253,9 @@ def update_subnet_info(
     signed = subnet_mgr.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = subnet_mgr.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted update subnet info tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "update subnet info", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = subnet_mgr.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -230,6 +271,7 @@ def activate_subnet(
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     netuid: int = typer.Option(..., help="Subnet netuid to activate"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Activate a subnet (write tx)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -261,6 +303,9 @@ def activate_subnet(
     signed = subnet_mgr.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = subnet_mgr.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted activate subnet tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "activate subnet", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = subnet_mgr.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -279,6 +324,7 @@ def update_network_params(
     network_min_lock: int = typer.Option(..., help="New networkMinLock (uint256)"),
     network_rate_limit: int = typer.Option(..., help="New networkRateLimit (uint256)"),
     lock_reduction_interval: int = typer.Option(..., help="New lockReductionInterval (uint256)"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Update network-level parameters (write tx)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -312,6 +358,9 @@ def update_network_params(
     signed = subnet_mgr.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = subnet_mgr.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted update network params tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "update network params", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = subnet_mgr.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -328,6 +377,7 @@ def update_subnet_params(
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     netuid: int = typer.Option(..., help="Subnet netuid to update"),
     new_hyperparams: str = typer.Option(..., help="New hyperparams as JSON string or file path"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Update subnet hyperparams (write tx)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -371,6 +421,9 @@ def update_subnet_params(
     signed = subnet_mgr.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = subnet_mgr.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted update subnet hyperparams tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "update subnet hyperparams", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = subnet_mgr.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -391,9 +444,8 @@ def get_network_lock_cost(
         raise typer.Exit(1)
     subnet_mgr = load_subnet_mgr(contract, rpc)
     balance = subnet_mgr.getNetworkLockCost()
-    whetu = subnet_mgr.hetuToken()
-    erc20 = load_erc20(whetu, rpc)
-    decimals = erc20.decimals()
+    _, token = hetu_token_metadata(ctx.obj, subnet_mgr)
+    decimals = token["decimals"]
     value = balance / (10 ** decimals)
     value_str = f"{value:,.{decimals}f}".rstrip('0').rstrip('.')
     print(f"[green]Network lock cost: {value_str} (raw: {balance}, decimals: {decimals})")
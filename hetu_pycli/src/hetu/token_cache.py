@@ -0,0 +1,126 @@
+import json
+import os
+
+from web3 import Web3
+
+from hetu_pycli.config import get_data_path
+from hetu_pycli.src.hetu.batch import batch_call
+
+ERC20_ABI_PATH = os.path.join(
+    os.path.dirname(__file__), "../../../contracts/ERC20MinterBurnerDecimals.abi"
+)
+
+TOKEN_FIELDS = ("decimals", "symbol", "name")
+
+
+def get_token_cache_path(config):
+    return get_data_path(config, "token_metadata.json")
+
+
+class TokenCache:
+    """
+    Token metadata (decimals, symbol, name) keyed by (chain_id, token address),
+    contract -> token links such as hetuToken() keyed by (chain_id, contract,
+    getter), and the chain id behind each RPC URL, all fixed once deployed.
+    A warm cache answers without a single request. The chain id of a URL is
+    checked again whenever a miss has to reach the node anyway, so a devnet
+    reset under a new chain id is picked up by the next miss. With path None
+    nothing is written.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.data = {"chains": {}, "tokens": {}, "links": {}}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    stored = json.load(f)
+                for section in self.data:
+                    self.data[section].update(stored.get(section, {}))
+            except (OSError, ValueError, AttributeError):
+                pass  # a corrupt cache is rebuilt on the next save
+        self.verified = set()
+        self.dirty = False
+
+    def save(self):
+        if not self.dirty or not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def chain_id(self, web3, verify: bool = False):
+        """
+        Chain id behind web3's RPC URL. With verify it is read from the node
+        (once per cache), for callers about to send a request regardless.
+        """
+        url = getattr(web3.provider, "endpoint_uri", None) or ""
+        if url not in self.data["chains"] or (verify and url not in self.verified):
+            chain = web3.eth.chain_id
+            self.verified.add(url)
+            if self.data["chains"].get(url) != chain:
+                self.data["chains"][url] = chain
+                self.dirty = True
+        return self.data["chains"][url]
+
+    def token(self, web3, address: str):
+        address = Web3.to_checksum_address(address)
+        key = f"{self.chain_id(web3)}:{address.lower()}"
+        if key not in self.data["tokens"]:
+            key = f"{self.chain_id(web3, verify=True)}:{address.lower()}"
+        if key not in self.data["tokens"]:
+            with open(os.path.abspath(ERC20_ABI_PATH), "r") as f:
+                fns = web3.eth.contract(address=address, abi=json.load(f)).functions
+            values = batch_call(web3, [getattr(fns, field)() for field in TOKEN_FIELDS])
+            if values[0] is None:
+                raise ValueError(f"{address} does not answer decimals(); is it an ERC20 token?")
+            self.data["tokens"][key] = dict(zip(TOKEN_FIELDS, values))
+            self.dirty = True
+        return self.data["tokens"][key]
+
+    def link(self, web3, contract, getter: str):
+        """Address returned by a zero-argument getter such as hetuToken(), read once per contract."""
+        key = f"{self.chain_id(web3)}:{contract.address.lower()}:{getter}"
+        if key not in self.data["links"]:
+            key = f"{self.chain_id(web3, verify=True)}:{contract.address.lower()}:{getter}"
+        if key not in self.data["links"]:
+            (token,) = batch_call(web3, [getattr(contract.functions, getter)()])
+            if token is None:
+                raise ValueError(f"{contract.address} does not answer {getter}()")
+            self.data["links"][key] = token
+            self.dirty = True
+        return self.data["links"][key]
+
+
+def open_token_cache(config):
+    """The shared cache, or a throwaway in-memory one when caching is disabled (--no-cache)."""
+    if (config or {}).get("no_cache"):
+        return TokenCache()
+    return TokenCache(get_token_cache_path(config))
+
+
+def token_metadata(config, web3, address: str):
+    """{decimals, symbol, name} for a token, read in one batch the first time it is seen."""
+    cache = open_token_cache(config)
+    meta = cache.token(web3, address)
+    cache.save()
+    return meta
+
+
+def linked_token(config, wrapper, getter: str = "hetuToken"):
+    """Token address behind a zero-argument getter such as hetuToken() or alphaToken(), read once per contract."""
+    cache = open_token_cache(config)
+    token = cache.link(wrapper.web3, wrapper.contract, getter)
+    cache.save()
+    return token
+
+
+def hetu_token_metadata(config, wrapper):
+    """(hetuToken address, metadata) for a contract wrapper exposing hetuToken()."""
+    cache = open_token_cache(config)
+    token = cache.link(wrapper.web3, wrapper.contract, "hetuToken")
+    meta = cache.token(wrapper.web3, token)
+    cache.save()
+    return token, meta
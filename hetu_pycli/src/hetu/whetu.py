@@ -6,6 +6,8 @@ import os
 from hetu_pycli.src.hetu.wrapper.whetu import Whetu
 from eth_account import Account
 from hetu_pycli.src.commands.wallet import load_keystore, get_wallet_path
+from hetu_pycli.src.commands.tx import record_pending_tx
+from hetu_pycli.src.hetu.token_cache import token_metadata
 import getpass
 
 WHETU_ABI_PATH = os.path.join(
@@ -83,6 +85,7 @@ def deposit(
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     value: float = typer.Option(..., help="HETU amount to deposit (in ahetu)"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Deposit HETU into the contract (sign and broadcast using local keystore)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -116,6 +119,9 @@ def deposit(
     signed = whetu.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = whetu.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted deposit tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "deposit", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = whetu.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -131,6 +137,7 @@ def withdraw(
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
     amount: float = typer.Option(..., help="Amount to withdraw (in ether)"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Withdraw HETU from the contract (sign and broadcast using local keystore)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -163,6 +170,9 @@ def withdraw(
     signed = whetu.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = whetu.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted withdraw tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "withdraw", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = whetu.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -223,7 +233,7 @@ def balance_of(
             raise typer.Exit(1)
     whetu = load_whetu(contract, rpc)
     balance = whetu.balanceOf(address)
-    decimals = whetu.decimals()
+    decimals = token_metadata(config, whetu.web3, contract)["decimals"]
     value = balance / (10 ** decimals)
     value_str = f"{value:,.{decimals}f}".rstrip('0').rstrip('.')
     print(f"[green]Balance: {value_str} (raw: {balance}, decimals: {decimals})")
@@ -237,6 +247,7 @@ def transfer(
     sender: str = typer.Option(..., help="Sender address (must match keystore address or wallet name)"),
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Transfer WHETU tokens, sign and broadcast using local keystore (by wallet name or address)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -255,7 +266,7 @@ def transfer(
         print(f"[red]Failed to decrypt keystore: {e}")
         raise typer.Exit(1)
     whetu = load_whetu(contract, rpc)
-    decimals = whetu.decimals()
+    decimals = token_metadata(config, whetu.web3, contract)["decimals"]
     value_raw = int(value * (10 ** decimals))
     nonce = whetu.web3.eth.get_transaction_count(keystore["address"])
     tx = whetu.contract.functions.transfer(to, value_raw).build_transaction(
@@ -269,6 +280,9 @@ def transfer(
     signed = whetu.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = whetu.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted transfer tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "transfer", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = whetu.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
@@ -285,6 +299,7 @@ def approve(
     sender: str = typer.Option(..., help="Sender address (must match keystore address or wallet name)"),
     wallet_path: str = typer.Option(None, help="Wallet path (default from config)"),
     password: str = typer.Option(None, hide_input=True, help="Keystore password"),
+    no_wait: bool = typer.Option(False, help="Return after broadcasting; check the receipt later with `hetucli tx status`"),
 ):
     """Approve WHETU allowance, sign and broadcast using local keystore (by wallet name or address)"""
     rpc = ctx.obj.get("json_rpc") if ctx.obj else None
@@ -303,7 +318,7 @@ def approve(
         print(f"[red]Failed to decrypt keystore: {e}")
         raise typer.Exit(1)
     whetu = load_whetu(contract, rpc)
-    decimals = whetu.decimals()
+    decimals = token_metadata(config, whetu.web3, contract)["decimals"]
     value_raw = int(value * (10 ** decimals))
     print(f"value_raw: {value_raw}")
     nonce = whetu.web3.eth.get_transaction_count(keystore["address"])
@@ -318,6 +333,9 @@ def approve(
     signed = whetu.web3.eth.account.sign_transaction(tx, private_key)
     tx_hash = whetu.web3.eth.send_raw_transaction(signed.raw_transaction)
     print(f"[green]Broadcasted approve tx hash: {tx_hash.hex()}")
+    if no_wait:
+        record_pending_tx(config, tx_hash, "approve", keystore["address"])
+        return
     print("[yellow]Waiting for transaction receipt...")
     receipt = whetu.web3.eth.wait_for_transaction_receipt(tx_hash)
     if receipt.status == 1:
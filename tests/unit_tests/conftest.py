@@ -0,0 +1,66 @@
+import pytest
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import get_abi_output_types
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+
+
+class FakeRPC(JSONBaseProvider):
+    """
+    JSON-RPC provider answering every request, single or batched, with the
+    result of handler(method, params); a handler that raises ValueError answers
+    with a JSON-RPC error carrying its message. Requests are kept in
+    requests as (method, params) and batches in batches.
+    """
+
+    endpoint_uri = "http://node.example:8545"
+
+    def __init__(self, w3, handler, abi=()):
+        super().__init__()
+        self.w3 = w3
+        self.handler = handler
+        self.requests = []
+        self.batches = []
+        self.functions = {
+            "0x" + function_abi_to_4byte_selector(e).hex(): e for e in abi if e.get("type") == "function"
+        }
+
+    def function(self, params):
+        """The ABI of the function an eth_call's params call, looked up by selector."""
+        return self.functions[params[0]["data"][:10]]
+
+    def encode(self, fn_abi, value):
+        """value as fn_abi's eth_call result; tuples are the outputs of multi-output functions."""
+        types = get_abi_output_types(fn_abi)
+        return "0x" + self.w3.codec.encode(types, list(value) if len(types) > 1 else [value]).hex()
+
+    def _respond(self, method, params):
+        self.requests.append((method, params))
+        try:
+            result = self.handler(method, params)
+        except ValueError as e:
+            return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": str(e)}}
+        return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+    def make_request(self, method, params):
+        return self._respond(method, params)
+
+    def make_batch_request(self, requests):
+        self.batches.append(requests)
+        return [self._respond(method, params) for method, params in requests]
+
+    @property
+    def methods(self):
+        return [method for method, _ in self.requests]
+
+
+@pytest.fixture
+def fake_rpc():
+    """Factory for a Web3 whose provider is a FakeRPC: fake_rpc(handler, abi=())."""
+
+    def make(handler, abi=()):
+        w3 = Web3(Web3.HTTPProvider("http://127.0.0.1:1"))
+        w3.provider = FakeRPC(w3, handler, abi)
+        return w3
+
+    return make
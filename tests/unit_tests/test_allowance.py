@@ -0,0 +1,39 @@
+from eth_account import Account
+from web3 import Web3
+
+from hetu_pycli.src.hetu.allowance import approve_if_short
+
+E = 10**18
+SPENDER = Web3.to_checksum_address("0x00000000000000000000000000000000000000a1")
+FUNDED = Web3.to_checksum_address("0x00000000000000000000000000000000000000b1")
+SHORT = Web3.to_checksum_address("0x00000000000000000000000000000000000000b2")
+ALLOWANCE_SELECTOR = Web3.keccak(text="allowance(address,address)")[:4].to_0x_hex()
+
+
+def _handler(method, params):
+    if method == "eth_call":
+        assert params[0]["data"].startswith(ALLOWANCE_SELECTOR)
+        allowance = 5 * E if params[0]["to"] == FUNDED else E
+        return "0x" + Web3().codec.encode(["uint256"], [allowance]).hex()
+    if method == "eth_sendRawTransaction":
+        return "0x" + "11" * 32
+    return {"eth_chainId": hex(560000), "eth_gasPrice": hex(10**9)}.get(method)
+
+
+def test_approve_only_tokens_with_short_allowance(fake_rpc):
+    w3 = fake_rpc(_handler)
+    account = Account.create()
+
+    nonce, tx_hashes = approve_if_short(
+        w3, account.key, account.address, SPENDER, [(FUNDED, 3 * E), (SHORT, 3 * E)], 7, standing=100 * E
+    )
+
+    assert nonce == 8 and len(tx_hashes) == 1
+    sent = [params[0] for method, params in w3.provider.requests if method == "eth_sendRawTransaction"]
+    assert w3.provider.methods.count("eth_call") == 2
+    assert Account.recover_transaction(sent[0]) == account.address
+
+    # Nothing is sent when every allowance already covers the amount.
+    w3.provider.requests.clear()
+    assert approve_if_short(w3, account.key, account.address, SPENDER, [(FUNDED, 5 * E)], 8) == (8, [])
+    assert "eth_sendRawTransaction" not in w3.provider.methods
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from hetu_pycli.src.hetu.amm_history import (
+    AmmHistory,
+    PriceIndex,
+    build_candles,
+    parse_interval,
+)
+
+E = 10**18
+POOL = "0x00000000000000000000000000000000000000A1"
+
+
+def _swap(block, log_index, hetu, alpha, price, hetu_to_alpha=True):
+    if hetu_to_alpha:
+        name, args = "SwapHETUForAlpha", {"hetuAmountIn": hetu, "alphaAmountOut": alpha}
+    else:
+        name, args = "SwapAlphaForHETU", {"alphaAmountIn": alpha, "hetuAmountOut": hetu}
+    args.update(user="0x0000000000000000000000000000000000000002", newPrice=price)
+    return {"event": name, "args": args, "blockNumber": block, "logIndex": log_index, "transactionHash": "0x01"}
+
+
+def _event(block, log_index, name, **args):
+    return {"event": name, "args": args, "blockNumber": block, "logIndex": log_index, "transactionHash": "0x01"}
+
+
+def test_parse_interval():
+    assert parse_interval("90") == 90
+    assert parse_interval("5m") == 300
+    assert parse_interval("1h") == 3600
+    assert parse_interval("2d") == 172800
+    with pytest.raises(ValueError):
+        parse_interval("0h")
+    with pytest.raises(ValueError):
+        parse_interval("1y")
+
+
+def test_candles_from_stored_events(tmp_path):
+    history = AmmHistory(str(tmp_path / "amm.sqlite"))
+    events = [
+        _event(1, 0, "PriceUpdated", currentPrice=E, movingPrice=E),
+        _event(1, 1, "ReservesUpdated", subnetTAO=1000 * E, subnetAlphaIn=1000 * E, subnetAlphaOut=0),
+        _swap(2, 0, 10 * E, 9 * E, 2 * E),
+        _swap(3, 0, 4 * E, 5 * E, E // 2, hetu_to_alpha=False),
+        _swap(4, 0, 1 * E, 1 * E, 3 * E),
+        _event(5, 0, "ReservesUpdated", subnetTAO=900 * E, subnetAlphaIn=1100 * E, subnetAlphaOut=0),
+    ]
+    timestamps = {1: 3600, 2: 3700, 3: 7000, 4: 7300, 5: 3 * 3600 + 5}
+    assert history.apply(POOL, events[:3], timestamps, 2) == 3
+    assert history.apply(POOL, events[3:], timestamps, 5) == 3
+    assert history.block(POOL) == 5
+    series = history.series(POOL)
+    history.close()
+
+    bars = build_candles(series, 3600)
+    assert bars["time"].tolist() == [3600, 7200, 10800]
+    assert bars["open"].tolist() == [1.0, 3.0, 3.0]
+    assert bars["high"].tolist() == [2.0, 3.0, 3.0]
+    assert bars["low"].tolist() == [0.5, 3.0, 3.0]
+    assert bars["close"].tolist() == [0.5, 3.0, 3.0]
+    assert bars["volume_hetu"].tolist() == [14.0, 1.0, 0.0]
+    assert bars["volume_alpha"].tolist() == [14.0, 1.0, 0.0]
+    assert bars["trades"].tolist() == [2, 1, 0]
+    assert bars["hetu_reserve"].tolist() == [1000.0, 1000.0, 900.0]
+
+    # A bar with no price event and no earlier price has no OHLC.
+    reserves_only = build_candles({k: v[1:2] for k, v in series.items()}, 60)
+    assert np.isnan(reserves_only["close"]).all()
+
+
+def test_price_index_windows_match_brute_force():
+    rng = np.random.default_rng(7)
+    blocks = np.sort(rng.integers(5, 200, 300))
+    trade = rng.random(300) < 0.7
+    price = np.where(rng.random(300) < 0.8, rng.uniform(0.5, 2.0, 300), np.nan)
+    series = {
+        "block": blocks,
+        "price": price,
+        "trade": trade,
+        "hetu_volume": np.where(trade, rng.uniform(0, 10, 300), 0.0),
+        "alpha_volume": np.where(trade, rng.uniform(0, 10, 300), 0.0),
+    }
+    index = PriceIndex(series, last_block=210)
+
+    def opening(b):
+        before = (blocks < b) & ~np.isnan(price)
+        return price[before][-1]
+
+    starts = np.array([index.first_block, 50, 120, 199])
+    ends = np.array([210, 80, 120, 205])
+    stats = index.windows(starts, ends)
+    for i, (a, b) in enumerate(zip(starts, ends)):
+        in_window = trade & (blocks >= a) & (blocks <= b)
+        assert np.isclose(stats["twap"][i], np.mean([opening(k) for k in range(a, b + 1)]))
+        hetu, alpha = series["hetu_volume"][in_window].sum(), series["alpha_volume"][in_window].sum()
+        assert np.isclose(stats["hetu_volume"][i], hetu) and stats["trades"][i] == in_window.sum()
+        assert np.isclose(stats["vwap"][i], hetu / alpha) if alpha else np.isnan(stats["vwap"][i])
+
+
+def test_window_series_starts_at_the_opening_price(tmp_path):
+    history = AmmHistory(str(tmp_path / "amm.sqlite"))
+    events = [
+        _event(1, 0, "PriceUpdated", currentPrice=E, movingPrice=E),
+        _swap(3, 0, 10 * E, 9 * E, 2 * E),
+        _event(5, 0, "ReservesUpdated", subnetTAO=900 * E, subnetAlphaIn=1100 * E, subnetAlphaOut=0),
+        _swap(7, 0, 4 * E, 5 * E, 3 * E),
+        _swap(9, 0, 1 * E, 1 * E, 4 * E),
+    ]
+    history.apply(POOL, events, dict.fromkeys(range(1, 10), 0), 9)
+    series = history.window_series(POOL, 6, 9)
+    full = history.series(POOL)
+    history.close()
+
+    # Block 3 carries the last price before the window; nothing earlier is read.
+    assert series["block"].tolist() == [3, 5, 7, 9]
+    bounded, whole = PriceIndex(series, 6, 9), PriceIndex(full, 6, 9)
+    assert bounded.first_block == whole.first_block == 6
+    for key, value in bounded.windows(np.array([6, 8]), np.array([9, 9])).items():
+        assert np.allclose(value, whole.windows(np.array([6, 8]), np.array([9, 9]))[key], equal_nan=True)
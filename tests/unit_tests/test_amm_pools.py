@@ -0,0 +1,94 @@
+import json
+import os
+from types import SimpleNamespace
+
+from web3 import Web3
+
+from hetu_pycli.src.hetu.amm_pools import (
+    ZERO_ADDRESS,
+    fetch_pools,
+    fetch_user_stats,
+    sort_pools,
+)
+
+CONTRACTS = os.path.join(os.path.dirname(__file__), "../../contracts")
+E = 10**18
+MGR = "0x0000000000000000000000000000000000000001"
+POOLS = {
+    1: "0x00000000000000000000000000000000000000A1",
+    2: ZERO_ADDRESS,
+    3: "0x00000000000000000000000000000000000000A3",
+    4: "0x00000000000000000000000000000000000000A4",
+}
+
+
+def _abi(name):
+    with open(os.path.join(CONTRACTS, name)) as f:
+        return json.load(f)
+
+
+def test_fetch_pools_two_batches_and_sorting(fake_rpc):
+    mgr_abi, amm_abi = _abi("SubnetManager.abi"), _abi("SubnetAMM.abi")
+
+    def answer(to, fn_abi, data):
+        if fn_abi["name"] == "getSubnetInfo":
+            netuid = int(data[-64:], 16)
+            return (netuid, MGR, MGR, POOLS[netuid], 0, 0, 0, 0, True, f"net{netuid}", "")
+        netuid = int(to[-1], 16)
+        if netuid == 4:
+            raise ValueError("execution reverted")
+        return {
+            "getPoolInfo": (1, netuid * 100 * E, 1000 * E, 0, netuid * E // 10, E, netuid * E, E),
+            "getStatistics": (netuid * E, netuid * E // 10, E, 7, netuid * 100 * E + 1000 * E),
+            "getPoolHealth": (netuid == 1, "Healthy" if netuid == 1 else "Low liquidity", 5000),
+        }[fn_abi["name"]]
+
+    def handler(method, params):
+        fn_abi = w3.provider.function(params)
+        return w3.provider.encode(fn_abi, answer(params[0]["to"], fn_abi, params[0]["data"]))
+
+    w3 = fake_rpc(handler, mgr_abi + amm_abi)
+    subnet_mgr = SimpleNamespace(web3=w3, contract=w3.eth.contract(address=MGR, abi=mgr_abi))
+    result = fetch_pools(subnet_mgr, amm_abi, [1, 2, 3, 4], block=10)
+
+    assert [len(b) for b in w3.provider.batches] == [4, 9]
+    assert [p["netuid"] for p in result["pools"]] == [1, 3, 4]
+    pool = result["pools"][1]
+    assert (pool["price"], pool["liquidity"], pool["healthy"], pool["ok"]) == (3 * E // 10, 1300 * E, False, True)
+    assert result["pools"][2]["ok"] is False
+    assert [p["netuid"] for p in sort_pools(result["pools"], "price")] == [3, 1, 4]
+    assert [p["netuid"] for p in sort_pools(result["pools"], "netuid", ascending=True)] == [1, 3, 4]
+
+
+def test_user_stats_matrix_in_one_batch(fake_rpc):
+    amm_abi = _abi("SubnetAMM.abi")
+    users = [Web3.to_checksum_address(f"0x00000000000000000000000000000000000000b{i}") for i in (1, 2)]
+    pools = [POOLS[1], POOLS[3]]
+
+    def handler(method, params):
+        pool, user = int(params[0]["to"][-1], 16), int(params[0]["data"][-1], 16)
+        if (pool, user) == (3, 2):
+            raise ValueError("execution reverted")
+        return w3.provider.encode(w3.provider.function(params), (pool * user * E, pool * 1000 + user))
+
+    w3 = fake_rpc(handler, amm_abi)
+    stats = fetch_user_stats(w3, amm_abi, pools, users, block=10)
+
+    assert [len(b) for b in w3.provider.batches] == [4]
+    assert stats["volume"] == [[E, 3 * E], [2 * E, None]]
+    assert stats["share"] == [[1001, 3001], [1002, None]]
+
+
+def test_user_share_is_bps_of_pool_volume(fake_rpc):
+    amm_abi = _abi("SubnetAMM.abi")
+    volumes = {"b1": E, "b2": 3 * E}
+    users = [Web3.to_checksum_address(f"0x00000000000000000000000000000000000000{u}") for u in volumes]
+
+    def handler(method, params):
+        # SubnetAMM.getUserStats: (userVolume[user], userVolume[user] * 10_000 / totalVolume)
+        volume = volumes[params[0]["data"][-2:]]
+        return w3.provider.encode(w3.provider.function(params), (volume, volume * 10_000 // sum(volumes.values())))
+
+    w3 = fake_rpc(handler, amm_abi)
+    stats = fetch_user_stats(w3, amm_abi, [POOLS[1]], users, block=10)
+    assert stats["share"] == [[2500], [7500]]
@@ -0,0 +1,43 @@
+from hetu_pycli.src.hetu.amm_positions import LiquidityIndex, value_position
+
+E = 10**18
+POOL_A = "0x00000000000000000000000000000000000000A1"
+POOL_B = "0x00000000000000000000000000000000000000A2"
+USER = "0x00000000000000000000000000000000000000B1"
+OTHER = "0x00000000000000000000000000000000000000B2"
+
+
+def _event(pool, block, name, user, hetu, alpha, tx):
+    role = "injector" if name == "LiquidityInjected" else "withdrawer"
+    return {
+        "event": name,
+        "args": {role: user, "hetuAmount": hetu, "alphaAmount": alpha},
+        "address": pool,
+        "blockNumber": block,
+        "logIndex": 1,
+        "transactionHash": tx,
+    }
+
+
+def test_positions_net_flows_cost_and_value(tmp_path):
+    index = LiquidityIndex(str(tmp_path / "liquidity.sqlite"))
+    events = [
+        _event(POOL_A, 1, "LiquidityInjected", USER, 100 * E, 50 * E, "0x01"),
+        _event(POOL_A, 2, "LiquidityInjected", OTHER, 10 * E, 10 * E, "0x02"),
+        _event(POOL_B, 2, "LiquidityInjected", USER, 10 * E, 10 * E, "0x03"),
+    ]
+    prices = {("0x01", POOL_A): 2 * E, ("0x02", POOL_A): 2 * E}
+    assert index.apply([POOL_A, POOL_B], events, prices, 5) == 3
+    withdraw = _event(POOL_A, 6, "LiquidityWithdrawn", USER, 20 * E, 10 * E, "0x04")
+    assert index.apply([POOL_A], [withdraw], {("0x04", POOL_A): 3 * E}, 9) == 1
+    assert (index.block(POOL_A), index.block(POOL_B)) == (9, 5)
+    held = index.positions(USER)
+    index.close()
+
+    a = held[POOL_A]
+    assert (a["net_hetu"], a["net_alpha"], a["events"]) == (80 * E, 40 * E, 2)
+    # 100 + 50 * 2 in, 20 + 10 * 3 out.
+    assert a["cost"] == 150 * E
+    assert value_position(a, 4 * E, 400 * E, 100 * E) == {"value": 240 * E, "pnl": 90 * E, "share": 0.3}
+    # No price recorded for the pool B injection, so it has no cost basis.
+    assert held[POOL_B]["cost"] is None and value_position(held[POOL_B], E, E, E)["pnl"] is None
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from hetu_pycli.src.hetu.amm_quote import (
+    MECHANISM_DYNAMIC,
+    MECHANISM_STABLE,
+    PoolState,
+    checked_quote,
+    min_out_for_slippage,
+    quote_curve,
+    quote_exact,
+)
+
+E = 10**18
+
+
+def _pool(mechanism=MECHANISM_DYNAMIC, hetu=1000 * E, alpha=1000 * E, min_liquidity=E, alpha_out=0, k=None):
+    # (mechanism, subnetTAO, subnetAlphaIn, subnetAlphaOut, currentPrice, movingPrice, totalVolume, minimumLiquidity)
+    info = (mechanism, hetu, alpha, alpha_out, hetu * E // alpha, hetu * E // alpha, 0, min_liquidity)
+    return PoolState.from_pool_info(info, hetu * alpha if k is None else k)
+
+
+def test_quote_exact_matches_get_swap_preview():
+    # Expected tuples are getSwapPreview results from a deployed SubnetAMM.
+    state = _pool()
+    assert quote_exact(state, E, True) == (999000999000999001, 20, 1002001000000000000, True)
+    assert quote_exact(state, 100 * E, False) == (
+        90909090909090909091,
+        1735,
+        826446280991735537,
+        True,
+    )
+
+
+def test_quote_exact_insufficient_liquidity_and_stable_pool():
+    out, _, _, sufficient = quote_exact(_pool(min_liquidity=500 * E), 1001 * E, True)
+    assert (out, sufficient) == (0, False)
+    assert quote_exact(_pool(MECHANISM_STABLE, 2000 * E), 10 * E, True) == (10 * E, 0, 2 * E, True)
+
+
+@pytest.mark.parametrize("k_ratio", [None, 0.97, 1.03])
+def test_quote_curve_agrees_with_exact(k_ratio):
+    hetu, alpha = 12345 * E + 7, 987 * E + 3
+    # getK() drifts from the reserve product (e.g. after reserve updates), so both paths must use k.
+    k = None if k_ratio is None else int(hetu * alpha * k_ratio)
+    state = _pool(hetu=hetu, alpha=alpha, min_liquidity=10 * E, k=k)
+    amounts = np.geomspace(1e15, 5e22, 200)
+    for hetu_to_alpha in (True, False):
+        curve = quote_curve(state, amounts, hetu_to_alpha)
+        for i, amount in enumerate(amounts):
+            out, impact, price, sufficient = quote_exact(state, int(amount), hetu_to_alpha)
+            assert bool(curve["sufficient"][i]) == sufficient
+            assert abs(curve["amount_out"][i] - out) <= max(abs(out) * 1e-9, 1e6)
+            if sufficient:
+                assert abs(curve["new_price"][i] - price) <= price * 1e-9
+                assert abs(curve["price_impact"][i] - impact) <= 1
+
+
+def test_checked_quote_and_slippage_min_out():
+    state = _pool(alpha_out=50 * E)
+    assert checked_quote(state, 50 * E, False) == quote_exact(state, 50 * E, False)
+    with pytest.raises(ValueError, match="subnetAlphaOut"):
+        checked_quote(state, 51 * E, False)
+    with pytest.raises(ValueError, match="minimum liquidity"):
+        checked_quote(_pool(min_liquidity=500 * E), 1001 * E, True)
+
+    assert min_out_for_slippage(999000999000999001, 0.5) == 994005994005994005
+    assert min_out_for_slippage(10**18, 0) == 10**18
+    with pytest.raises(ValueError):
+        min_out_for_slippage(10**18, 100)
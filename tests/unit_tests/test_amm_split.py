@@ -0,0 +1,50 @@
+import numpy as np
+
+from hetu_pycli.src.hetu.amm_quote import MECHANISM_DYNAMIC, PoolState, quote_exact
+from hetu_pycli.src.hetu.amm_split import plan_split, simulate_splits
+
+E = 10**18
+
+
+def _pool(hetu=1000 * E, alpha=1000 * E, min_liquidity=E, k=None):
+    info = (MECHANISM_DYNAMIC, hetu, alpha, alpha, hetu * E // alpha, hetu * E // alpha, 0, min_liquidity)
+    return PoolState.from_pool_info(info, hetu * alpha if k is None else k)
+
+
+def test_splits_without_recovery_pay_the_same_and_cap_impact():
+    state = _pool()
+    plan = plan_split([state], [True], 50 * E, max_chunks=20, max_impact_bps=100)
+    # A chunk of 50/n HETU moves the price by (1 + x/1000)^2 - 1; n = 11 is the first under 1%.
+    assert plan.chunks == 11 and plan.feasible
+    assert (plan.impact <= 100).all()
+    assert np.allclose(plan.outputs, quote_exact(state, 50 * E, True)[0], rtol=1e-12)
+    assert np.isclose(plan.total_out, plan.single_trade_out, rtol=1e-12)
+
+
+def test_recovery_rewards_more_chunks_and_routes_chain_legs():
+    state = _pool()
+    sim = simulate_splits([state], [True], 50 * E, 10, resilience=0.5)
+    totals = sim["out"].sum(axis=1)
+    assert (np.diff(totals) > 0).all()
+    assert plan_split([state], [True], 50 * E, 10, 10_000, resilience=0.5).chunks == 10
+
+    # ALPHA -> HETU on one pool, then HETU -> ALPHA on another: one chunk is two plain quotes.
+    other = _pool(500 * E, 2000 * E)
+    hetu = quote_exact(state, 40 * E, False)[0]
+    sim = simulate_splits([state, other], [False, True], 40 * E, 1)
+    assert np.isclose(sim["out"][0, 0], quote_exact(other, hetu, True)[0], rtol=1e-12)
+    assert sim["impact"].shape == (1, 1, 2)
+
+
+def test_quotes_against_the_stored_k():
+    # k drifts from reserve_hetu * reserve_alpha, e.g. after rounding in earlier swaps.
+    state = _pool(k=1000 * E * 990 * E)
+    sim = simulate_splits([state], [True], 50 * E, 2)
+    assert np.isclose(sim["out"][0, 0], quote_exact(state, 50 * E, True)[0], rtol=1e-12)
+    # Two chunks walk down the same k curve and end where one trade does.
+    assert np.isclose(sim["out"][1].sum(), 1000 * E - state.k // (1050 * E), rtol=1e-12)
+
+
+def test_infeasible_when_no_split_fits():
+    plan = plan_split([_pool(min_liquidity=990 * E)], [True], 50 * E, max_chunks=4)
+    assert not plan.feasible and plan.chunks == 4
@@ -0,0 +1,76 @@
+import json
+import os
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from hetu_pycli.src.hetu.amm_watch import PoolMonitor, raw_log
+
+CONTRACTS = os.path.join(os.path.dirname(__file__), "../../contracts")
+E = 10**18
+POOL = Web3.to_checksum_address("0x00000000000000000000000000000000000000a1")
+
+
+def _monitor():
+    with open(os.path.join(CONTRACTS, "SubnetAMM.abi")) as f:
+        abi = json.load(f)
+    w3 = Web3(Web3.HTTPProvider("http://127.0.0.1:1"))
+    row = {"netuid": 1, "pool": POOL, "price": E, "hetu_reserve": 1000 * E, "alpha_reserve": 1000 * E}
+    return w3, PoolMonitor(w3.eth.contract(address=POOL, abi=abi), [row], 200, 500, 2000)
+
+
+def _log(w3, name, values, block, log_index):
+    types = {"PriceUpdated": ["uint256"] * 2, "ReservesUpdated": ["uint256"] * 3}[name]
+    topic = Web3.keccak(text=f"{name}({','.join(types)})").to_0x_hex()
+    return {
+        "address": POOL,
+        "topics": [topic],
+        "data": "0x" + w3.codec.encode(types, values).hex(),
+        "blockNumber": hex(block),
+        "logIndex": hex(log_index),
+        "transactionHash": "0x" + "01" * 32,
+    }
+
+
+def _types(alerts):
+    return [a["type"] for a in alerts]
+
+
+def test_monitor_alerts_on_thresholds_and_skips_replays():
+    w3, monitor = _monitor()
+    # A 100 HETU buy: price +21% and a reserves change of 10% of the HETU reserve.
+    state, alerts = monitor.apply(_log(w3, "PriceUpdated", [121 * E // 100, E], 5, 0))
+    assert _types(alerts) == ["price_move"] and state["price"] == 1.21
+    state, alerts = monitor.apply(_log(w3, "ReservesUpdated", [1100 * E, 909 * E, 91 * E], 5, 1))
+    assert _types(alerts) == ["large_trade"] and alerts[0]["pool_pct"] == 10.0
+    assert (state["hetu_reserve"], state["alpha_reserve"]) == (1100.0, 909.0)
+
+    # The same logs again (e.g. a websocket catch-up overlap) change nothing.
+    assert monitor.apply(_log(w3, "ReservesUpdated", [1100 * E, 909 * E, 91 * E], 5, 1)) == (None, [])
+
+    # A small move stays quiet; the reference price is the last alerted one.
+    assert monitor.apply(_log(w3, "PriceUpdated", [122 * E // 100, E], 6, 0))[1] == []
+
+    # Withdrawing liquidity moves both reserves the same way and can leave the pool low.
+    _, alerts = monitor.apply(_log(w3, "ReservesUpdated", [700 * E, 580 * E, 91 * E], 7, 0))
+    assert _types(alerts) == ["liquidity_change", "low_liquidity"]
+    _, alerts = monitor.apply(_log(w3, "ReservesUpdated", [810 * E, 670 * E, 91 * E], 8, 0))
+    assert _types(alerts) == ["liquidity_change", "liquidity_recovered"]
+    assert monitor.block == 8
+
+
+def test_raw_log_undoes_web3_formatting():
+    w3, monitor = _monitor()
+    raw = _log(w3, "PriceUpdated", [2 * E, E], 9, 3)
+    formatted = {
+        **raw,
+        "topics": [HexBytes(t) for t in raw["topics"]],
+        "data": HexBytes(raw["data"]),
+        "blockNumber": 9,
+        "logIndex": 3,
+        "transactionHash": HexBytes(raw["transactionHash"]),
+    }
+    assert raw_log(formatted) == raw
+    # The round-tripped log decodes like one from eth_getLogs.
+    state, _ = monitor.apply(raw_log(formatted))
+    assert (state["block"], state["price"]) == (9, 2.0)
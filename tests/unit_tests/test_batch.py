@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+import time
+
+from hetu_pycli.src.hetu.batch import batch_call, batch_rpc, iter_chunks
+
+NEURON_ABI_PATH = os.path.join(
+    os.path.dirname(__file__), "../../contracts/NeuronManager.abi"
+)
+
+
+def test_batch_rpc_chunks_and_maps_errors(fake_rpc):
+    def handler(method, params):
+        if params[0] == "0x02":
+            raise ValueError("boom")
+        return params[0]
+
+    w3 = fake_rpc(handler)
+    requests = [("eth_getTransactionReceipt", [f"0x0{i}"]) for i in range(5)]
+    results = batch_rpc(w3, requests, batch_size=2)
+    assert results == ["0x00", "0x01", None, "0x03", "0x04"]
+    assert [len(b) for b in w3.provider.batches] == [2, 2, 1]
+
+
+def test_batch_call_decodes_like_call(fake_rpc):
+    with open(NEURON_ABI_PATH) as f:
+        abi = json.load(f)
+
+    def handler(method, params):
+        assert method == "eth_call"
+        assert params[1] == hex(42)
+        return w3.provider.encode(w3.provider.function(params), True)
+
+    w3 = fake_rpc(handler, abi)
+    contract = w3.eth.contract(
+        address="0x0000000000000000000000000000000000000001", abi=abi
+    )
+    account = "0x0000000000000000000000000000000000000002"
+    calls = [contract.functions.isNeuron(1, account), contract.functions.isValidator(1, account)]
+    assert batch_call(w3, calls, block_identifier=42) == [True, True]
+
+
+def test_iter_chunks_is_ordered_and_bounded():
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def fetch(chunk):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.01 * (chunk[0] % 3))
+        with lock:
+            state["in_flight"] -= 1
+        return [i * 2 for i in chunk]
+
+    results = list(iter_chunks(iter(range(95)), fetch, batch_size=10, max_workers=3))
+    assert results == [i * 2 for i in range(95)]
+    assert state["peak"] <= 3
+
+
+def test_membership_matrix_shape_and_failures(fake_rpc):
+    from types import SimpleNamespace
+
+    from hetu_pycli.src.hetu.metagraph import membership_matrix
+
+    with open(NEURON_ABI_PATH) as f:
+        abi = json.load(f)
+    answers = iter([True, False, None, False, True, True])
+
+    def handler(method, params):
+        value = next(answers)
+        if value is None:
+            raise ValueError("execution reverted")
+        return w3.provider.encode(w3.provider.function(params), value)
+
+    w3 = fake_rpc(handler, abi)
+    contract = w3.eth.contract(address="0x0000000000000000000000000000000000000001", abi=abi)
+    accounts = ["0x0000000000000000000000000000000000000002", "0x0000000000000000000000000000000000000003"]
+    mgr = SimpleNamespace(web3=w3, contract=contract)
+    matrix = membership_matrix(mgr, "is-neuron", accounts, [1, 2, 3], block=7)
+    assert matrix.tolist() == [[1, 0, -1], [0, 1, 1]]
+    assert len(w3.provider.batches) == 1
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from hetu_pycli.src.hetu.chunked import (
+    ChunkJob,
+    fit_chunk_size,
+    load_account_amounts,
+    read_accounts_file,
+    refresh_sent_chunks,
+)
+
+ACCOUNT = "0x0000000000000000000000000000000000000a0b"
+SENDER = "0x000000000000000000000000000000000000dEaD"
+
+
+def test_fit_chunk_size_from_linear_gas():
+    sizes = fit_chunk_size(lambda k: 30000 + 25000 * k, 1000, 3_000_000)
+    assert sizes == 98
+    assert fit_chunk_size(lambda k: 30000 + 25000 * k, 5, 3_000_000) == 5
+
+
+def test_read_accounts_file_skips_headers_and_comments(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(f"user,label\n# treasury\n\n{ACCOUNT},ops\n0x01\n")
+    assert read_accounts_file(str(path)) == [ACCOUNT, "0x01"]
+
+
+def test_load_account_amounts_csv_and_npz(tmp_path):
+    csv_path = tmp_path / "rewards.csv"
+    csv_path.write_text(f"account,amount\n{ACCOUNT},1.5\n")
+    accounts, amounts = load_account_amounts(str(csv_path))
+    assert accounts == ["0x0000000000000000000000000000000000000A0b"]
+    assert amounts == [1_500_000_000_000_000_000]
+
+    npz_path = tmp_path / "rewards.npz"
+    np.savez(npz_path, accounts=np.array([ACCOUNT]), amounts=np.array([7]))
+    assert load_account_amounts(str(npz_path), wei=True)[1] == [7]
+
+    csv_path.write_text(f"{ACCOUNT},-1\n")
+    with pytest.raises(ValueError):
+        load_account_amounts(str(csv_path))
+
+
+def test_chunk_job_resume_states(tmp_path):
+    job = ChunkJob.create(str(tmp_path / "job.json"), "distributeRewards", 1, 10, 4)
+    assert [(c["start"], c["end"]) for c in job.chunks] == [(0, 4), (4, 8), (8, 10)]
+    for nonce, chunk in enumerate(job.chunks):
+        chunk.update(status="sent", nonce=nonce, tx_hash=f"0x{nonce}")
+    job.save()
+
+    job = ChunkJob.load(job.path)
+    receipts = [({"status": "0x1"}, None), ({"status": "0x0"}, None), (None, None)]
+    assert job.apply_receipts(receipts, confirmed_nonce=2) == []
+    assert [c["status"] for c in job.chunks] == ["confirmed", "failed", "sent"]
+    assert [c["start"] for c in job.todo()] == [4]
+
+
+def _sent_job(tmp_path, count):
+    job = ChunkJob.create(str(tmp_path / "job.json"), "distributeRewards", 1, 4 * count, 4)
+    for nonce, chunk in enumerate(job.chunks):
+        chunk.update(status="sent", nonce=nonce, tx_hash=f"0x{nonce}")
+    return job
+
+
+def test_refresh_sent_chunks_sees_chunk_mined_between_calls(fake_rpc, tmp_path):
+    job = _sent_job(tmp_path, 1)
+    chain = {"mined": False}
+
+    def handler(method, params):
+        if method == "eth_getTransactionCount":
+            # The chunk is mined right after its nonce is read.
+            count = 1 if chain["mined"] else 0
+            chain["mined"] = True
+            return hex(count)
+        if method == "eth_getTransactionReceipt":
+            return {"status": "0x1"} if chain["mined"] else None
+        return None
+
+    dropped, errored = refresh_sent_chunks(job, fake_rpc(handler), SENDER)
+    assert (dropped, errored) == ([], [])
+    assert job.chunks[0]["status"] == "confirmed"
+
+
+def test_refresh_sent_chunks_only_resends_hashes_the_node_forgot(fake_rpc, tmp_path):
+    job = _sent_job(tmp_path, 3)
+
+    def handler(method, params):
+        if method == "eth_getTransactionCount":
+            return hex(3)
+        if method == "eth_getTransactionReceipt" and params[0] == "0x0":
+            raise ValueError("header not found")
+        if method == "eth_getTransactionByHash":
+            return {"hash": params[0]} if params[0] == "0x1" else None
+        return None
+
+    w3 = fake_rpc(handler)
+    dropped, errored = refresh_sent_chunks(job, w3, SENDER)
+    # 0x0's lookup errored and 0x1 is still known, so only 0x2 goes back to new.
+    assert [c["tx_hash"] for c in dropped] == ["0x2"]
+    assert [c["tx_hash"] for c in errored] == ["0x0"]
+    assert [c["status"] for c in job.chunks] == ["sent", "sent", "new"]
+    assert w3.provider.methods[0] == "eth_getTransactionCount"
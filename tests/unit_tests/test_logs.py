@@ -0,0 +1,44 @@
+from hetu_pycli.src.hetu.logs import (
+    ERC20_TRANSFER_TOPIC,
+    address_topic,
+    fetch_logs,
+    received_amount,
+    uint_topic,
+)
+
+
+def test_fetch_logs_splits_rejected_ranges_and_orders(fake_rpc):
+    def handler(method, params):
+        a, b = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+        if b - a + 1 > 3:
+            raise ValueError("range too wide")
+        return [{"blockNumber": hex(n), "logIndex": "0x0"} for n in range(b, a - 1, -1)]
+
+    w3 = fake_rpc(handler)
+    logs = fetch_logs(w3, "0x0", [], 10, 29, chunk_size=10, max_workers=1)
+    assert [int(log["blockNumber"], 16) for log in logs] == list(range(10, 30))
+    assert ("eth_getLogs", [{"address": "0x0", "topics": [], "fromBlock": hex(10), "toBlock": hex(19)}]) in w3.provider.requests
+
+
+def test_uint_topic():
+    assert uint_topic(1) == "0x" + "00" * 31 + "01"
+
+
+def test_received_amount_sums_matching_transfers():
+    token = "0x00000000000000000000000000000000000000Dd"
+    user = "0x0000000000000000000000000000000000000001"
+    other = "0x0000000000000000000000000000000000000002"
+
+    def transfer(address, to, value):
+        return {"address": address, "topics": [ERC20_TRANSFER_TOPIC, address_topic(other), address_topic(to)], "data": hex(value)}
+
+    receipt = {
+        "logs": [
+            transfer(token.lower(), user, 5),
+            transfer(token.lower(), other, 7),
+            transfer("0x00000000000000000000000000000000000000ee", user, 11),
+            transfer(token.lower(), user, 13),
+        ]
+    }
+    assert received_amount(receipt, token, user) == 18
+    assert received_amount({"logs": []}, token, user) == 0
@@ -0,0 +1,96 @@
+import numpy as np
+
+from hetu_pycli.src.hetu.metagraph import Metagraph
+
+
+def neuron_info(uid, stake_hetu, validator=False):
+    account = "0x" + f"{uid:040x}"
+    return (
+        account, uid, 1, True, validator, stake_hetu * 10**18, 100 + uid, 200 + uid,
+        f"http://n{uid}", 8000 + uid, f"http://p{uid}", 9000 + uid,
+    )
+
+
+def test_from_neuron_infos_is_columnar_and_sorted():
+    mg = Metagraph.from_neuron_infos(1, 10, [neuron_info(2, 5), neuron_info(0, 1, True), neuron_info(1, 3)])
+    assert len(mg) == 3
+    assert mg.uid.tolist() == [0, 1, 2]
+    assert mg.stake.dtype == np.float64
+    np.testing.assert_allclose(mg.stake, [1.0, 3.0, 5.0])
+    assert mg.validator.tolist() == [True, False, False]
+    assert mg.axon_port.dtype == np.uint32
+
+
+def test_table_columns_follow_config():
+    mg = Metagraph.from_neuron_infos(1, 10, [neuron_info(0, 2)])
+    cols = mg.table_columns({"UID": True, "STAKE": True, "RANK": True, "AXON": False})
+    assert [name for name, _ in cols] == ["UID", "STAKE"]
+    assert cols[1][1].tolist() == ["2.0000"]
+
+
+def test_empty_metagraph():
+    mg = Metagraph.empty(3, 5)
+    assert len(mg) == 0
+    assert mg.stake.sum() == 0
+
+
+def test_apply_neuron_events_updates_columns():
+    from hetu_pycli.src.hetu.metagraph import apply_neuron_events
+
+    mg = Metagraph.from_neuron_infos(1, 10, [neuron_info(i, i + 1) for i in range(4)])
+    acct = mg.account.tolist()
+    new_info = neuron_info(9, 7, True)
+    events = [
+        {"event": "NeuronRegistered", "args": {"netuid": 1, "account": new_info[0]}},
+        {"event": "NeuronDeregistered", "args": {"netuid": 1, "account": acct[1]}},
+        {"event": "ServiceUpdated", "args": {
+            "netuid": 1, "account": acct[2], "axonEndpoint": "http://a-longer-endpoint",
+            "axonPort": 1, "prometheusEndpoint": "p", "prometheusPort": 2}},
+        {"event": "StakeAllocationChanged", "args": {
+            "netuid": 1, "account": acct[3], "newStake": 10 * 10**18, "isValidator": True}},
+        {"event": "StakeAllocationChanged", "args": {
+            "netuid": 2, "account": acct[0], "newStake": 0, "isValidator": True}},
+    ]
+    fetched = []
+
+    def fetch_infos(accounts):
+        fetched.extend(accounts)
+        return [new_info]
+
+    out = apply_neuron_events(mg, events, fetch_infos, 20)
+    assert fetched == [new_info[0]]
+    assert out.block == 20
+    assert out.uid.tolist() == [0, 2, 3, 9]
+    np.testing.assert_allclose(out.stake, [1.0, 3.0, 10.0, 7.0])
+    assert out.validator.tolist() == [False, False, True, True]
+    assert out.axon_endpoint[1] == "http://a-longer-endpoint"
+
+
+def test_save_load_roundtrip(tmp_path):
+    mg = Metagraph.from_neuron_infos(1, 10, [neuron_info(0, 2), neuron_info(1, 3)])
+    path = str(tmp_path / "mg.npz")
+    mg.save(path)
+    loaded = Metagraph.load(path)
+    assert (loaded.netuid, loaded.block) == (1, 10)
+    assert loaded.account.tolist() == mg.account.tolist()
+
+
+def test_metagraph_diff_change_set():
+    from hetu_pycli.src.hetu.metagraph import MetagraphDiff
+
+    before = Metagraph.from_neuron_infos(1, 10, [neuron_info(i, 1) for i in range(4)])
+    moved = neuron_info(2, 1)
+    after = Metagraph.from_neuron_infos(
+        1,
+        20,
+        [neuron_info(0, 1), neuron_info(1, 4, True), moved[:8] + ("http://new",) + moved[9:], neuron_info(5, 2)],
+    )
+    diff = MetagraphDiff(before, after)
+    assert diff.registered.uid.tolist() == [5]
+    assert diff.deregistered.uid.tolist() == [3]
+    assert diff.stake_changes["uid"].tolist() == [1]
+    np.testing.assert_allclose(diff.stake_changes["delta"], [3.0])
+    assert diff.endpoint_after.axon_endpoint.tolist() == ["http://new"]
+    assert diff.net_stake_delta == 4.0
+    assert len(diff) == 4
+    assert len(MetagraphDiff(before, before)) == 0
@@ -0,0 +1,42 @@
+import json
+import os
+from types import SimpleNamespace
+
+from hetu_pycli.src.hetu.portfolio import fetch_portfolio
+
+STAKING_ABI_PATH = os.path.join(os.path.dirname(__file__), "../../contracts/GlobalStaking.abi")
+E = 10**18
+
+
+def test_fetch_portfolio_single_batch(fake_rpc):
+    with open(STAKING_ABI_PATH) as f:
+        abi = json.load(f)
+    answers = {
+        "getStakeInfo": (100 * E, 30 * E, 70 * E, 5, 2 * E),
+        "getUserStakeInfo": (100 * E, 70 * E, [1]),
+        "getAvailableStake": 10 * E,
+        "getEffectiveStake": 15 * E,
+        "getLockedStake": 5 * E,
+        "getSubnetAllocation": (15 * E, 5 * E, 9, True),
+    }
+
+    def handler(method, params):
+        fn_abi = w3.provider.function(params)
+        return w3.provider.encode(fn_abi, answers[fn_abi["name"]])
+
+    w3 = fake_rpc(handler, abi)
+    contract = w3.eth.contract(address="0x0000000000000000000000000000000000000001", abi=abi)
+    staking = SimpleNamespace(web3=w3, contract=contract)
+    result = fetch_portfolio(staking, "0x0000000000000000000000000000000000000002", [1, 2], block=10)
+    assert [len(b) for b in w3.provider.batches] == [10]
+    assert result["stake_info"][4] == 2 * E
+    assert result["subnets"][1] == {
+        "netuid": 2,
+        "available": 10 * E,
+        "effective": 15 * E,
+        "locked": 5 * E,
+        "allocated": 15 * E,
+        "allocation_locked": 5 * E,
+        "last_update": 9,
+        "active": True,
+    }
@@ -0,0 +1,66 @@
+import asyncio
+import socket
+
+from hetu_pycli.src.hetu.probe import parse_endpoint, probe_targets
+
+
+def test_parse_endpoint():
+    assert parse_endpoint("1.2.3.4", 8091) == ("1.2.3.4", 8091, False)
+    assert parse_endpoint("http://node.example:9000", 0) == ("node.example", 9000, True)
+    assert parse_endpoint("http://node.example:9000", 9100) == ("node.example", 9100, True)
+    assert parse_endpoint("", 8091) is None
+    assert parse_endpoint("1.2.3.4", 0) is None
+
+
+def test_parse_endpoint_malformed_ports_and_ipv6():
+    assert parse_endpoint("http://node.example:99999", 0) is None
+    assert parse_endpoint("http://node.example:abc", 0) is None
+    assert parse_endpoint("node.example:abc", 0) is None
+    assert parse_endpoint("node.example:abc", 8091) == ("node.example", 8091, False)
+    assert parse_endpoint("[2001:db8::1]:8091", 0) == ("2001:db8::1", 8091, False)
+    assert parse_endpoint("http://[2001:db8::1]:9000", 0) == ("2001:db8::1", 9000, True)
+    assert parse_endpoint("2001:db8::1", 8091) == ("2001:db8::1", 8091, False)
+    assert parse_endpoint("2001:db8::1", 0) is None
+
+
+def _closed_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_probe_targets_against_local_servers():
+    async def scenario():
+        async def http_ok(reader, writer):
+            await reader.readline()
+            writer.write(b"HTTP/1.0 200 OK\r\n\r\nok")
+            await writer.drain()
+            writer.close()
+
+        async def silent(reader, writer):
+            await asyncio.sleep(5)
+
+        http_server = await asyncio.start_server(http_ok, "127.0.0.1", 0)
+        silent_server = await asyncio.start_server(silent, "127.0.0.1", 0)
+        http_port = http_server.sockets[0].getsockname()[1]
+        silent_port = silent_server.sockets[0].getsockname()[1]
+        closed_port = _closed_port()
+        targets = [
+            ("127.0.0.1", http_port, "/metrics"),
+            ("127.0.0.1", http_port, None),
+            ("127.0.0.1", silent_port, "/metrics"),
+            ("127.0.0.1", closed_port, None),
+            ("127.0.0.1", http_port, "/metrics"),
+        ]
+        try:
+            return targets, await probe_targets(targets, timeout=0.5, concurrency=2)
+        finally:
+            http_server.close()
+            silent_server.close()
+
+    targets, results = asyncio.run(scenario())
+    assert len(results) == 4
+    assert results[targets[0]][0] and results[targets[0]][2] == "http 200"
+    assert results[targets[1]][:1] == (True,) and results[targets[1]][2] == "tcp ok"
+    assert results[targets[2]] == (False, None, "timeout")
+    assert results[targets[3]][0] is False
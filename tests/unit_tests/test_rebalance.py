@@ -0,0 +1,28 @@
+import pytest
+
+from hetu_pycli.src.hetu.rebalance import load_plan, plan_moves
+
+E = 10**18
+
+
+def test_load_plan(tmp_path):
+    path = tmp_path / "plan.yaml"
+    path.write_text("allocations:\n  1: 120\n  3: 0.5\nrelease_unlisted: true\nmin_change: 0.01\n")
+    targets, release_unlisted, min_change = load_plan(str(path))
+    assert targets == {1: 120 * E, 3: E // 2}
+    assert release_unlisted is True
+    assert min_change == E // 100
+
+
+def test_plan_moves_orders_reductions_first_and_skips_noops():
+    current = {1: 100 * E, 2: 50 * E, 3: 10 * E, 4: 7 * E}
+    targets = {1: 150 * E, 2: 20 * E, 3: 10 * E, 4: 7 * E + 1, 5: 5 * E}
+    moves = plan_moves(current, {}, targets, available=30 * E, min_change=2)
+    assert moves == [(2, 50 * E, 20 * E), (1, 100 * E, 150 * E), (5, 0, 5 * E)]
+
+
+def test_plan_moves_rejects_infeasible_plans():
+    with pytest.raises(ValueError, match="locked"):
+        plan_moves({1: 10 * E}, {1: 5 * E}, {1: 4 * E}, available=0)
+    with pytest.raises(ValueError, match="available"):
+        plan_moves({1: 10 * E}, {}, {1: 20 * E}, available=5 * E)
@@ -0,0 +1,77 @@
+import json
+from types import SimpleNamespace
+
+from hetu_pycli.src.hetu.stake_history import StakeHistory, sync_stake_history
+from hetu_pycli.src.hetu.staking import STAKING_ABI_PATH
+
+ALICE = "0x1111111111111111111111111111111111111111"
+BOB = "0x2222222222222222222222222222222222222222"
+STAKING = "0x3333333333333333333333333333333333333333"
+
+
+def event(name, block, log_index, **args):
+    return {"event": name, "args": args, "blockNumber": block, "logIndex": log_index, "transactionHash": f"0x{block:02x}{log_index:02x}"}
+
+
+def test_reduce_resume_and_queries(tmp_path):
+    path = str(tmp_path / "stake_history.sqlite")
+    history = StakeHistory(path)
+    assert history.block is None
+    history.apply(
+        [
+            event("GlobalStakeAdded", 10, 0, user=ALICE, amount=100),
+            event("GlobalStakeAdded", 10, 1, user=BOB, amount=300),
+            event("SubnetAllocationChanged", 11, 0, user=ALICE, netuid=1, oldAmount=0, newAmount=60),
+            event("StakeLocked", 12, 0, user=ALICE, netuid=1, amount=20),
+        ],
+        19,
+        STAKING,
+    )
+    history.close()
+
+    # A second window continues from the stored totals.
+    history = StakeHistory(path)
+    assert history.block == 19
+    assert history.contract == STAKING
+    history.apply(
+        [
+            event("GlobalStakeRemoved", 20, 0, user=ALICE, amount=30),
+            event("SubnetAllocationChanged", 21, 0, user=BOB, netuid=1, oldAmount=0, newAmount=200),
+            event("SubnetAllocationChanged", 22, 0, user=ALICE, netuid=1, oldAmount=60, newAmount=40),
+            event("StakeUnlocked", 23, 0, user=ALICE, netuid=1, amount=5),
+        ],
+        29,
+        STAKING,
+    )
+    assert history.block == 29
+    assert history.leaderboard() == [(BOB, 300), (ALICE, 70)]
+    assert history.leaderboard(netuid=1, top=1) == [(BOB, 200)]
+    assert history.subnet_series(1) == [(11, 60), (21, 260), (22, 240)]
+
+    rows = history.history(ALICE)
+    assert [(r[0], r[2], r[6]) for r in rows] == [
+        (10, "GlobalStakeAdded", 100),
+        (11, "SubnetAllocationChanged", 60),
+        (12, "StakeLocked", 20),
+        (20, "GlobalStakeRemoved", 70),
+        (22, "SubnetAllocationChanged", 40),
+        (23, "StakeUnlocked", 15),
+    ]
+    assert rows[4][4:6] == (40, 60)
+    assert [r[0] for r in history.history(ALICE, netuid=1, limit=2)] == [22, 23]
+    history.close()
+
+
+def test_sync_stays_confirmations_behind_the_head(fake_rpc, tmp_path):
+    def handler(method, params):
+        return hex(100) if method == "eth_blockNumber" else []
+
+    w3 = fake_rpc(handler)
+    with open(STAKING_ABI_PATH) as f:
+        staking = SimpleNamespace(web3=w3, contract=w3.eth.contract(address=STAKING, abi=json.load(f)))
+    history = StakeHistory(str(tmp_path / "stake_history.sqlite"))
+    assert list(sync_stake_history(history, staking, from_block=90, confirmations=6)) == [(94, 0)]
+    assert history.block == 94
+    # Nothing new is confirmed until the head moves past 100.
+    assert list(sync_stake_history(history, staking, confirmations=6)) == []
+    history.close()
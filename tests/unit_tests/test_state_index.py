@@ -0,0 +1,30 @@
+from hetu_pycli.src.hetu.state_index import StateIndex
+
+OWNER = "0x1111111111111111111111111111111111111111"
+NEURON = "0x2222222222222222222222222222222222222222"
+ZERO = "0x0000000000000000000000000000000000000000"
+
+
+def test_replace_all_and_queries(tmp_path):
+    index = StateIndex(str(tmp_path / "state.sqlite"))
+    assert index.block is None
+    subnets = [
+        (1, OWNER, ZERO, ZERO, 10**30, 5, 6, 7, True, "alpha", "first"),
+        (2, OWNER, ZERO, ZERO, 0, 0, 0, 8, False, "beta", "second"),
+    ]
+    neurons = [(1, NEURON, 0, True, True, 3 * 10**18, 10, 11, "1.2.3.4", 8091, "1.2.3.4", 9090)]
+    stakes = [(NEURON, 10**27, 2, 3, 4, 5)]
+    index.replace_all(42, 560000, subnets, neurons, stakes)
+
+    assert index.block == 42
+    assert index.subnet_info(1) == subnets[0]
+    assert index.subnet_info(3) is None
+    assert index.user_subnets(OWNER) == [1, 2]
+    assert index.neuron_info(1, NEURON) == (NEURON, 0, 1, True, True, 3 * 10**18, 10, 11, "1.2.3.4", 8091, "1.2.3.4", 9090)
+    assert index.stake_info(NEURON) == (10**27, 2, 3, 4, 5)
+
+    index.replace_all(43, 560000, subnets[:1], [], [])
+    assert index.block == 43
+    assert index.user_subnets(OWNER) == [1]
+    assert index.neuron_info(1, NEURON) is None
+    index.close()
@@ -0,0 +1,64 @@
+import json
+from types import SimpleNamespace
+
+from web3 import Web3
+
+from hetu_pycli.src.hetu.token_cache import linked_token, token_metadata
+
+TOKEN = "0x0000000000000000000000000000000000000007"
+WRAPPER = "0x0000000000000000000000000000000000000009"
+
+
+def _handler(method, params):
+    if method == "eth_chainId":
+        return hex(560000)
+    selector = params[0]["data"][:10]
+    values = {
+        Web3.keccak(text="hetuToken()")[:4].to_0x_hex(): (["address"], [TOKEN]),
+        Web3.keccak(text="decimals()")[:4].to_0x_hex(): (["uint8"], [18]),
+        Web3.keccak(text="symbol()")[:4].to_0x_hex(): (["string"], ["WHETU"]),
+        Web3.keccak(text="name()")[:4].to_0x_hex(): (["string"], ["Wrapped HETU"]),
+    }
+    types, value = values[selector]
+    return "0x" + Web3().codec.encode(types, value).hex()
+
+
+def test_token_metadata_is_read_once_and_persisted(fake_rpc, tmp_path):
+    w3 = fake_rpc(_handler)
+    config = {"data_path": str(tmp_path)}
+
+    meta = token_metadata(config, w3, TOKEN)
+    assert meta == {"decimals": 18, "symbol": "WHETU", "name": "Wrapped HETU"}
+    assert sorted(w3.provider.methods) == ["eth_call", "eth_call", "eth_call", "eth_chainId"]
+
+    # Later runs answer from the file without a single request.
+    w3.provider.requests.clear()
+    assert token_metadata(config, w3, TOKEN.lower()) == meta
+    assert w3.provider.requests == []
+    with open(tmp_path / "token_metadata.json") as f:
+        assert json.load(f)["chains"] == {w3.provider.endpoint_uri: 560000}
+
+    w3.provider.requests.clear()
+    token_metadata({**config, "no_cache": True}, w3, TOKEN)
+    assert len(w3.provider.requests) == 4
+
+
+def test_linked_token_warm_cache_makes_no_requests(fake_rpc, tmp_path):
+    w3 = fake_rpc(_handler)
+    abi = [{"type": "function", "name": "hetuToken", "inputs": [], "outputs": [{"name": "", "type": "address"}], "stateMutability": "view"}]
+    wrapper = SimpleNamespace(web3=w3, contract=w3.eth.contract(address=WRAPPER, abi=abi))
+    config = {"data_path": str(tmp_path)}
+
+    assert linked_token(config, wrapper) == TOKEN
+    assert sorted(w3.provider.methods) == ["eth_call", "eth_chainId"]
+
+    w3.provider.requests.clear()
+    assert linked_token(config, wrapper) == TOKEN
+    assert token_metadata(config, w3, TOKEN)["symbol"] == "WHETU"
+    # The metadata miss re-checks the chain id once; the link stays cached.
+    assert sorted(w3.provider.methods) == ["eth_call", "eth_call", "eth_call", "eth_chainId"]
+
+    w3.provider.requests.clear()
+    assert linked_token(config, wrapper) == TOKEN
+    assert token_metadata(config, w3, TOKEN)["decimals"] == 18
+    assert w3.provider.requests == []
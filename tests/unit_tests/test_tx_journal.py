@@ -0,0 +1,57 @@
+from hetu_pycli.src.commands.tx import load_pending_txs, record_pending_tx
+
+
+def test_record_pending_tx_appends(tmp_path):
+    path = tmp_path / "pending.json"
+    config = {"pending_tx_path": str(path)}
+    record_pending_tx(config, b"\x12" * 32, "add stake", "0xabc")
+    record_pending_tx(config, b"\x34" * 32, "claim rewards", "0xabc")
+    entries = load_pending_txs(str(path))
+    assert [e["action"] for e in entries] == ["add stake", "claim rewards"]
+    assert entries[0]["hash"] == "0x" + "12" * 32
+
+
+def test_load_pending_txs_missing_file(tmp_path):
+    assert load_pending_txs(str(tmp_path / "missing.json")) == []
+
+
+def test_broadcast_signed_txs_holds_back_after_rejection(fake_rpc):
+    from hetu_pycli.src.commands.tx import broadcast_signed_txs
+
+    def handler(method, params):
+        if params[0] == "0xb1":
+            raise ValueError("nonce too low")
+        return "0xhash" + params[0][2:]
+
+    web3 = fake_rpc(handler)
+    signed = [("a", b"\xa1"), ("b", b"\xb1"), ("a", b"\xa2"), ("b", b"\xb2")]
+    results = broadcast_signed_txs(web3, signed)
+    rounds = [[params[0] for _, params in batch] for batch in web3.provider.batches]
+    assert rounds == [["0xa1", "0xb1"], ["0xa2"]]
+    assert results[0] == ("0xhasha1", None)
+    assert results[1] == (None, "nonce too low")
+    assert results[2] == ("0xhasha2", None)
+    assert results[3][0] is None
+
+
+def test_wait_for_receipts_reports_failed_lookups(fake_rpc):
+    from hetu_pycli.src.commands.tx import wait_for_receipts
+
+    mined = {"blockNumber": "0x5", "status": "0x1"}
+
+    def handler(method, params):
+        if params[0] == "0xbad":
+            raise ValueError("header not found")
+        return mined if params[0] == "0xaa" else None
+
+    web3 = fake_rpc(handler)
+    results = wait_for_receipts(web3, ["0xaa", "0xbad", "0xcc"], timeout=0, with_errors=True)
+    assert results == [(mined, None), (None, "header not found"), (None, None)]
+
+    # A node failing every lookup is not polled until the timeout.
+    def unavailable(method, params):
+        raise ValueError("unavailable")
+
+    web3 = fake_rpc(unavailable)
+    assert wait_for_receipts(web3, ["0xaa"], timeout=60, poll_interval=60) == [None]
+    assert len(web3.provider.batches) == 1